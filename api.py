@@ -1,17 +1,143 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
+from functools import wraps
+from itertools import islice
+import json
+import os
+import threading
 import time
 
+from obj.ajustador_fr import AjustadorFR
+from obj.arvore_b import ArvoreBMais
+from obj.buffer_pool import BufferPool
+from obj.cache_consultas import CacheConsultas
+from obj.estado import Estado, TravaLeituraEscrita
 from obj.hash import Hash
+from obj.hash_extensivel import HashExtensivel
+from obj.hash_linear import HashLinear
+from obj.indice_chave import IndiceChave
+from obj.metricas import BUFFER_POOL, CACHE_CONSULTAS, METRICAS, OVERFLOWS_INDICE
+from obj.planejador import Planejador
 from obj.table import Table
+from obj.tarefas import GerenciadorTarefas
 from flask_cors import CORS
 
 app = Flask(__name__)
 CORS(app, resources={r"/*": {"origins": "*"}})  # libera para todas as origens
 
-# Variáveis globais para armazenar o estado (tabela e índice)
-tabela = None
-indice_hash = None
+# Snapshot atual (tabela, índices e geração), trocado inteiro a cada publicação.
+# indice_chave e arvore_b são montados na primeira busca por chave / por intervalo
+estado = Estado()
+troca_estado = threading.Lock()  # Torna atômico o "lê o estado, publica um novo"
+escritor = threading.Lock()  # Um escritor por vez (cargas, construções, alterações)
+trava_dados = TravaLeituraEscrita()  # Alterações no lugar excluem as leituras em andamento
 NOME_ARQUIVO = "words.txt"
+ARQUIVO_HEAP = "words.heap"
+ARQUIVO_INDICE = "words.idx"
+
+# Configuração do buffer pool (num_frames, política), reaplicada a cada tabela nova
+config_buffer_pool = None
+
+# Cache de resultados de /search, /search_hash e /search_scan (None desativa). As chaves
+# incluem a geração do snapshot, incrementada sempre que a tabela ou o índice mudam
+cache_consultas = CacheConsultas(capacidade=1024, ttl=300)
+
+# Escolhe scan ou índice em /search pelo custo estimado (estatísticas guardadas por geração)
+planejador = Planejador()
+
+# Construções e análises com "assincrono": true rodam aqui, acompanhadas por /jobs/<id>
+gerenciador_tarefas = GerenciadorTarefas(max_trabalhadores=1)
+
+# Tipos de índice disponíveis em /build_index
+TIPOS_INDICE = {
+    "estatico": Hash,
+    "extensivel": HashExtensivel,
+    "linear": HashLinear
+}
+
+
+def _aplicar_buffer_pool(tabela_atual):
+    if config_buffer_pool is not None:
+        tabela_atual.configurar_buffer_pool(*config_buffer_pool)
+
+
+def _faltas_buffer_pool(tabela):
+    """Faltas acumuladas no buffer pool (leituras reais), ou None se não houver pool"""
+    if tabela is None or tabela.buffer_pool is None:
+        return None
+    return tabela.buffer_pool.faltas
+
+
+def _publicar(nova_geracao: bool = True, **mudancas):
+    """Troca o snapshot atual por uma cópia com as mudanças (atribuição atômica)"""
+    global estado
+    with troca_estado:
+        estado = estado.com(nova_geracao, **mudancas)
+
+
+def _fechar_substituidos(anterior: Estado):
+    """Fecha o mmap da tabela e do índice do snapshot anterior que saíram do atual.
+    Chamada pelo escritor depois da troca; a trava de escrita espera as leituras
+    que ainda usam o snapshot anterior terminarem"""
+    atual = estado
+    with trava_dados.escrever():
+        if anterior.tabela is not None and anterior.tabela is not atual.tabela:
+            anterior.tabela.fechar()
+        if anterior.indice_hash is not None and anterior.indice_hash is not atual.indice_hash:
+            anterior.indice_hash.fechar()
+
+
+def _publicar_indice_preguicoso(base: Estado, **mudancas):
+    """Publica um índice montado durante uma leitura, se a tabela ainda for a mesma"""
+    global estado
+    with troca_estado:
+        if estado.tabela is base.tabela:
+            estado = estado.com(False, **mudancas)
+
+
+def _leitura(rota):
+    """Executa a rota com a trava de leitura: alterações no lugar esperam ela terminar"""
+    @wraps(rota)
+    def envolvida(*args, **kwargs):
+        with trava_dados.ler():
+            return rota(*args, **kwargs)
+    return envolvida
+
+
+def _escrita(rota):
+    """Serializa os escritores; as leituras continuam sobre o snapshot anterior"""
+    @wraps(rota)
+    def envolvida(*args, **kwargs):
+        with escritor:
+            return rota(*args, **kwargs)
+    return envolvida
+
+
+def _alteracao(rota):
+    """Escritor que altera tabela e índices no lugar: exclui também as leituras"""
+    @wraps(rota)
+    def envolvida(*args, **kwargs):
+        with escritor, trava_dados.escrever():
+            return rota(*args, **kwargs)
+    return envolvida
+
+
+def _resposta_em_cache(geracao, *chave):
+    """Resposta guardada para a consulta na geração dada, marcada como acerto do cache"""
+    cache = cache_consultas
+    if cache is None:
+        return None
+    inicio = time.time()
+    resposta = cache.obter((geracao,) + chave)
+    if resposta is None:
+        return None
+    return dict(resposta, tempo_busca=f"{time.time() - inicio:.6f} segundos", leituras_disco=0, cache=True)
+
+
+def _guardar_resposta(resposta, geracao, *chave):
+    cache = cache_consultas
+    if cache is not None:
+        cache.guardar((geracao,) + chave, resposta)
+    return dict(resposta, cache=False)
 
 
 @app.route("/")
@@ -21,13 +147,19 @@ def hello_world():
 
 # Rota para carregar os dados na tabela
 @app.route("/load_data", methods=["POST"])
+@_escrita
 def load_data():
-    global tabela
     data = request.json
     tamanho_pagina = data.get("tamanho_pagina", 100)  # Valor default: 100
+    limite_linhas = data.get("limite_linhas")  # Opcional: carrega só as primeiras N palavras
 
+    # A tabela nova é carregada ao lado; as buscas seguem na anterior até a troca
     tabela = Table(NOME_ARQUIVO)
-    tabela.carregar(tam_pagina=tamanho_pagina)
+    tabela.carregar(tam_pagina=tamanho_pagina, limite_linhas=limite_linhas)
+    _aplicar_buffer_pool(tabela)
+    anterior = estado
+    _publicar(tabela=tabela, indice_hash=None, indice_chave=None, arvore_b=None)
+    _fechar_substituidos(anterior)
 
     if tabela.get_total_tuplas() > 0:
         response = {
@@ -41,29 +173,411 @@ def load_data():
 
 
 # Rota para construir o índice hash
+def _responder_tarefa(tipo, funcao, parametros):
+    """Agenda a função em segundo plano e responde 202 com o id da tarefa"""
+    tarefa = gerenciador_tarefas.submeter(tipo, funcao, parametros)
+    return jsonify({
+        "mensagem": "Tarefa agendada. Acompanhe o andamento em /jobs/<id>.",
+        "tarefa_id": tarefa.id,
+        "status_url": f"/jobs/{tarefa.id}"
+    }), 202
+
+
+def _construir_e_publicar(indice_hash, processos, tarefa=None):
+    """Constrói o índice sobre a tabela atual e o publica; roda na requisição ou em uma tarefa"""
+    with escritor:
+        tabela = estado.tabela
+        if tabela is None or tabela.get_total_tuplas() == 0:
+            raise Exception("Tabela não carregada. Carregue os dados primeiro.")
+        if tarefa is not None:
+            indice_hash.progresso = tarefa.atualizar
+        try:
+            indice_hash.construir(tabela, processos=processos)
+        finally:
+            indice_hash.progresso = None
+        anterior = estado
+        _publicar(indice_hash=indice_hash)
+        _fechar_substituidos(anterior)
+
+
 @app.route("/build_index", methods=["POST"])
 def build_index():
-    global tabela, indice_hash
+    tabela = estado.tabela
     if tabela is None or tabela.get_total_tuplas() == 0:
         return jsonify({"erro": "Tabela não carregada. Carregue os dados primeiro."}), 400
 
     data = request.json
-    tamanho_bucket_fr = data.get("tamanho_bucket_fr", 5)  # OTIMIZADO: 5 ao invés de 50
-    metodo_colisao = data.get("metodo_colisao", "overflow_buckets")  # Método fixo: overflow buckets
+    tamanho_bucket_fr = data.get("tamanho_bucket_fr", 5)  # "auto": FR e NB escolhidos pelo AjustadorFR
+    metodo_colisao = data.get("metodo_colisao", "overflow")
+    funcao_hash = data.get("funcao_hash", "djb2")
+    tipo_indice = data.get("tipo_indice", "estatico")
+    processos = data.get("processos", 1)  # > 1: calcula os hashes em paralelo
+    filtro_bloom = data.get("filtro_bloom")  # Taxa de falsos positivos (ex.: 0.01); nulo desativa
+    assincrono = data.get("assincrono", False)  # true: responde na hora e constrói em segundo plano
+
+    if tipo_indice not in TIPOS_INDICE:
+        return jsonify({"erro": f"Tipo de índice desconhecido: '{tipo_indice}'. "
+                                f"Opções: {', '.join(TIPOS_INDICE)}"}), 400
+
+    ajuste = None
+    try:
+        if tamanho_bucket_fr == "auto":
+            # A amostragem lê as páginas no lugar: /records não pode alterá-las enquanto isso
+            with trava_dados.ler():
+                ajuste = AjustadorFR(funcao_hash).sugerir(tabela, data.get("cadeia_alvo", 1.2),
+                                                          data.get("memoria_maxima"),
+                                                          cadeia_maxima=data.get("cadeia_maxima", 4))
+            ajuste.pop("candidatos")
+            tamanho_bucket_fr = ajuste["fr"]
+
+        if tipo_indice == "estatico" and metodo_colisao == "overflow" and ajuste is not None:
+            indice_hash = Hash(tamanho_bucket_fr, funcao_hash, num_buckets=ajuste["nb"])
+        elif tipo_indice == "estatico":
+            indice_hash = Hash.criar(tamanho_bucket_fr, metodo_colisao, funcao_hash)
+        else:
+            indice_hash = TIPOS_INDICE[tipo_indice](fr=tamanho_bucket_fr, funcao=funcao_hash)
+        indice_hash.usar_filtro_bloom(filtro_bloom)
+    except ValueError as e:
+        return jsonify({"erro": str(e)}), 400
 
-    indice_hash = Hash(fr=tamanho_bucket_fr)
-    indice_hash.construir(tabela)
+    response = {
+        "mensagem": f"Índice hash construído com sucesso usando {metodo_colisao}!",
+        "metodo_colisao": metodo_colisao,
+        "funcao_hash": funcao_hash,
+        "tipo_indice": tipo_indice,
+        "tamanho_bucket_fr": tamanho_bucket_fr,
+        "ajuste_fr": ajuste,
+        "filtro_bloom": filtro_bloom
+    }
+
+    if assincrono:
+        def executar(tarefa):
+            _construir_e_publicar(indice_hash, processos, tarefa)
+            return response
+        return _responder_tarefa("build_index", executar, data)
+
+    _construir_e_publicar(indice_hash, processos)
+    return jsonify(response), 200
+
+
+# Rota para sugerir FR e número de buckets a partir de uma amostra das chaves
+@app.route("/fr_advisor", methods=["POST"])
+@_leitura
+def fr_advisor():
+    tabela = estado.tabela
+    if tabela is None or tabela.get_total_tuplas() == 0:
+        return jsonify({"erro": "Tabela não carregada. Carregue os dados primeiro."}), 400
+
+    data = request.json or {}
+    try:
+        ajustador = AjustadorFR(data.get("funcao_hash", "djb2"), data.get("tamanho_amostra", 20000))
+        sugestao = ajustador.sugerir(tabela, data.get("cadeia_alvo", 1.2), data.get("memoria_maxima"),
+                                     data.get("candidatos_fr"), data.get("cargas"),
+                                     data.get("cadeia_maxima", 4))
+    except ValueError as e:
+        return jsonify({"erro": str(e)}), 400
+
+    return jsonify(sugestao), 200
+
+
+# Rota para compactar as cadeias de overflow do índice (apenas_esparsas=false reescreve todas)
+@app.route("/compact", methods=["POST"])
+@_alteracao
+def compact_index():
+    indice_hash = estado.indice_hash
+    if indice_hash is None:
+        return jsonify({"erro": "Índice não construído. Construa o índice primeiro."}), 400
+
+    apenas_esparsas = (request.json or {}).get("apenas_esparsas", True)
+    lapides_antes = indice_hash.total_lapides
+    try:
+        liberados = indice_hash.compactar(apenas_esparsas=apenas_esparsas)
+    except Exception as e:
+        return jsonify({"erro": f"Erro ao compactar: {str(e)}"}), 400
+    # As respostas não mudam, então o cache da geração atual continua válido
+    _publicar(nova_geracao=False)
 
     return jsonify({
-        "mensagem": f"Índice hash construído com sucesso usando {metodo_colisao}!",
-        "metodo_colisao": metodo_colisao
+        "mensagem": "Índice compactado com sucesso!",
+        "apenas_esparsas": apenas_esparsas,
+        "buckets_liberados": liberados,
+        "lapides_descartadas": lapides_antes - indice_hash.total_lapides,
+        "total_overflows": indice_hash.total_overflows
+    }), 200
+
+
+def _localizar_tupla(tabela, indice_hash, palavra):
+    """Retorna (tupla, id_pag) usando o índice, ou um table scan se não houver índice"""
+    if indice_hash is not None:
+        tupla, _, pag_id = indice_hash.buscar(palavra, tabela)
+        return tupla, pag_id
+    tupla, custo = tabela.table_scan(palavra)
+    # O scan lê as páginas em ordem, então a última lida é a da tupla
+    return tupla, (custo - 1 if tupla else None)
+
+
+# Rota para inserir uma tupla sem recarregar a tabela nem reconstruir o índice
+@app.route("/records", methods=["POST"])
+@_alteracao
+def insert_record():
+    atual = estado
+    tabela, indice_hash, indice_chave, arvore_b = atual.tabela, atual.indice_hash, atual.indice_chave, atual.arvore_b
+    if tabela is None:
+        return jsonify({"erro": "Tabela não carregada. Carregue os dados primeiro."}), 400
+
+    valor = (request.json or {}).get("valor", "").strip()
+    if not valor:
+        return jsonify({"erro": "Informe o valor da tupla."}), 400
+
+    try:
+        tupla, pag_id = tabela.inserir(valor)
+        if indice_hash is not None:
+            indice_hash.inserir(tupla.chave, valor, pag_id)
+        if indice_chave is not None:
+            indice_chave.inserir(tupla.chave, pag_id, len(tabela.paginas[pag_id]) - 1)
+        if arvore_b is not None:
+            arvore_b.inserir(valor, tupla.chave, pag_id)
+    except Exception as e:
+        return jsonify({"erro": f"Erro ao inserir: {str(e)}"}), 400
+    _publicar()
+
+    return jsonify({
+        "mensagem": "Tupla inserida com sucesso!",
+        "resultado": {"chave": tupla.chave, "dados": tupla.valor},
+        "pagina_id": pag_id,
+        "paginas_escritas": 1
+    }), 201
+
+
+# Rota para remover uma tupla (lápide no índice)
+@app.route("/records/<palavra>", methods=["DELETE"])
+@_alteracao
+def delete_record(palavra):
+    atual = estado
+    tabela, indice_hash, indice_chave, arvore_b = atual.tabela, atual.indice_hash, atual.indice_chave, atual.arvore_b
+    if tabela is None or tabela.get_total_tuplas() == 0:
+        return jsonify({"erro": "Tabela não carregada. Carregue os dados primeiro."}), 400
+
+    try:
+        tupla, pag_id = _localizar_tupla(tabela, indice_hash, palavra)
+        if tupla is None:
+            return jsonify({"erro": f"'{palavra}' não encontrada."}), 404
+
+        tabela.remover(pag_id, tupla.chave)
+        if indice_hash is not None:
+            indice_hash.remover(tupla.chave, palavra)
+        if indice_chave is not None:
+            indice_chave.remover(tupla.chave)
+        if arvore_b is not None:
+            arvore_b.remover(palavra, tupla.chave)
+    except Exception as e:
+        return jsonify({"erro": f"Erro ao remover: {str(e)}"}), 400
+    _publicar()
+
+    return jsonify({
+        "mensagem": "Tupla removida com sucesso!",
+        "resultado": {"chave": tupla.chave, "dados": tupla.valor},
+        "pagina_id": pag_id,
+        "paginas_escritas": 1
+    }), 200
+
+
+# Rota para alterar o valor de uma tupla no mesmo slot
+@app.route("/records/<palavra>", methods=["PUT"])
+@_alteracao
+def update_record(palavra):
+    atual = estado
+    tabela, indice_hash, arvore_b = atual.tabela, atual.indice_hash, atual.arvore_b
+    if tabela is None or tabela.get_total_tuplas() == 0:
+        return jsonify({"erro": "Tabela não carregada. Carregue os dados primeiro."}), 400
+
+    novo_valor = (request.json or {}).get("novo_valor", "").strip()
+    if not novo_valor:
+        return jsonify({"erro": "Informe o novo valor da tupla."}), 400
+
+    try:
+        tupla, pag_id = _localizar_tupla(tabela, indice_hash, palavra)
+        if tupla is None:
+            return jsonify({"erro": f"'{palavra}' não encontrada."}), 404
+
+        tabela.atualizar(pag_id, tupla.chave, novo_valor)
+        if indice_hash is not None:
+            indice_hash.atualizar(tupla.chave, palavra, novo_valor, pag_id)
+        if arvore_b is not None:
+            arvore_b.remover(palavra, tupla.chave)
+            arvore_b.inserir(novo_valor, tupla.chave, pag_id)
+    except Exception as e:
+        return jsonify({"erro": f"Erro ao atualizar: {str(e)}"}), 400
+    _publicar()
+
+    return jsonify({
+        "mensagem": "Tupla atualizada com sucesso!",
+        "resultado": {"chave": tupla.chave, "dados": novo_valor},
+        "pagina_id": pag_id,
+        "paginas_escritas": 1
+    }), 200
+
+
+def _remover_indice_gravado():
+    try:
+        os.remove(ARQUIVO_INDICE)
+    except FileNotFoundError:
+        pass
+
+
+# Rota para gravar a tabela e o índice em disco (heap file + arquivo de índice)
+@app.route("/save", methods=["POST"])
+@_leitura
+def save():
+    atual = estado
+    tabela, indice_hash = atual.tabela, atual.indice_hash
+    if tabela is None or tabela.get_total_tuplas() == 0:
+        return jsonify({"erro": "Tabela não carregada. Carregue os dados primeiro."}), 400
+
+    crc_heap = tabela.salvar(ARQUIVO_HEAP)
+    arquivos = [ARQUIVO_HEAP]
+
+    # O índice anterior foi gravado para outro heap file: sem um novo, ele é apagado
+    # (e, se sobrar depois de uma falha, /open o recusa pelo CRC do heap)
+    if indice_hash is None:
+        _remover_indice_gravado()
+    else:
+        try:
+            indice_hash.salvar(ARQUIVO_INDICE, crc_heap)
+            arquivos.append(ARQUIVO_INDICE)
+        except ValueError as e:
+            _remover_indice_gravado()
+            return jsonify({"erro": str(e), "arquivos": arquivos}), 400
+
+    return jsonify({"mensagem": "Dados gravados em disco com sucesso!", "arquivos": arquivos}), 200
+
+
+# Rota para abrir a tabela e o índice gravados, sem recarregar nem reconstruir
+@app.route("/open", methods=["POST"])
+@_escrita
+def open_saved():
+    try:
+        tabela = Table.abrir(ARQUIVO_HEAP)
+    except (FileNotFoundError, ValueError) as e:
+        return jsonify({"erro": f"Não foi possível abrir a tabela: {str(e)}"}), 400
+    _aplicar_buffer_pool(tabela)
+
+    aviso_indice = None
+    try:
+        indice_hash = Hash.abrir(ARQUIVO_INDICE, tabela)
+    except FileNotFoundError:
+        indice_hash = None
+    except ValueError as e:
+        indice_hash = None
+        aviso_indice = str(e)
+    anterior = estado
+    _publicar(tabela=tabela, indice_hash=indice_hash, indice_chave=None, arvore_b=None)
+    _fechar_substituidos(anterior)
+
+    return jsonify({
+        "mensagem": "Dados abertos do disco com sucesso!",
+        "total_tuplas": tabela.get_total_tuplas(),
+        "total_paginas": tabela.get_total_pag(),
+        "indice_carregado": indice_hash is not None,
+        "aviso_indice": aviso_indice
+    }), 200
+
+
+# Rota para configurar o buffer pool da tabela (num_frames nulo ou 0 desativa)
+@app.route("/buffer_pool", methods=["POST"])
+@_escrita
+def configure_buffer_pool():
+    global config_buffer_pool
+    tabela = estado.tabela
+    data = request.json
+    num_frames = data.get("num_frames")
+    politica = data.get("politica", "lru")
+
+    try:
+        if num_frames:
+            BufferPool(num_frames, politica)  # valida antes de guardar a configuração
+            config_buffer_pool = (num_frames, politica)
+        else:
+            config_buffer_pool = None
+    except ValueError as e:
+        return jsonify({"erro": str(e)}), 400
+
+    if tabela is not None:
+        tabela.configurar_buffer_pool(num_frames, politica)
+
+    return jsonify({
+        "mensagem": "Buffer pool configurado com sucesso!" if num_frames else "Buffer pool desativado.",
+        "num_frames": num_frames,
+        "politica": politica
+    }), 200
+
+
+# Rota para obter os contadores do buffer pool
+@app.route("/buffer_pool", methods=["GET"])
+def get_buffer_pool():
+    tabela = estado.tabela
+    if tabela is None or tabela.buffer_pool is None:
+        return jsonify({"erro": "Buffer pool não configurado."}), 400
+
+    return jsonify(tabela.buffer_pool.obter_estatisticas()), 200
+
+
+# Rota para configurar o cache de consultas (capacidade nula ou 0 desativa)
+@app.route("/cache", methods=["POST"])
+def configure_cache():
+    global cache_consultas
+    data = request.json
+    capacidade = data.get("capacidade", 1024)
+    ttl = data.get("ttl", 300)  # Segundos; nulo mantém as entradas até o descarte LRU
+
+    try:
+        cache_consultas = CacheConsultas(capacidade, ttl) if capacidade else None
+    except ValueError as e:
+        return jsonify({"erro": str(e)}), 400
+
+    return jsonify({
+        "mensagem": "Cache configurado com sucesso!" if capacidade else "Cache desativado.",
+        "capacidade": capacidade,
+        "ttl": ttl
     }), 200
 
 
+# Rota para obter os contadores do cache de consultas
+@app.route("/cache", methods=["GET"])
+def get_cache():
+    if cache_consultas is None:
+        return jsonify({"erro": "Cache desativado."}), 400
+
+    return jsonify(dict(cache_consultas.obter_estatisticas(), geracao=estado.geracao)), 200
+
+
+# Rota para expor as métricas no formato texto do Prometheus
+@app.route("/metrics", methods=["GET"])
+def get_metrics():
+    # Buffer pool e cache já mantêm os próprios contadores: copiados para medidores na hora da coleta
+    tabela = estado.tabela
+    if tabela is not None and tabela.buffer_pool is not None:
+        estatisticas = tabela.buffer_pool.obter_estatisticas()
+        for evento in ("acertos", "faltas", "descartes"):
+            BUFFER_POOL.definir(estatisticas[evento], evento=evento)
+    if cache_consultas is not None:
+        estatisticas = cache_consultas.obter_estatisticas()
+        for evento in ("acertos", "faltas", "descartes", "expirados"):
+            CACHE_CONSULTAS.definir(estatisticas[evento], evento=evento)
+    # O contador de buckets criados só cresce; o medidor mostra os overflows que existem agora
+    OVERFLOWS_INDICE.valores.clear()
+    indice_hash = estado.indice_hash
+    if indice_hash is not None:
+        OVERFLOWS_INDICE.definir(indice_hash.total_overflows, tipo=type(indice_hash).__name__)
+
+    return Response(METRICAS.exportar(), mimetype="text/plain; version=0.0.4")
+
+
 # Rota para obter estatísticas do índice
 @app.route("/statistics", methods=["GET"])
+@_leitura
 def get_statistics():
-    global indice_hash
+    indice_hash = estado.indice_hash
     if indice_hash is None:
         return jsonify({"erro": "Índice não construído. Construa o índice primeiro."}), 400
 
@@ -73,8 +587,9 @@ def get_statistics():
 
 # Nova rota para obter dados das páginas (para visualização real)
 @app.route("/pages", methods=["GET"])
+@_leitura
 def get_pages():
-    global tabela
+    tabela = estado.tabela
     if tabela is None:
         return jsonify({"erro": "Tabela não carregada."}), 400
 
@@ -88,29 +603,37 @@ def get_pages():
 
 # Nova rota para obter dados dos buckets (para visualização real)
 @app.route("/buckets", methods=["GET"])
+@_leitura
 def get_buckets():
-    global indice_hash
+    indice_hash = estado.indice_hash
     if indice_hash is None:
         return jsonify({"erro": "Índice não construído."}), 400
 
     # Assumindo que Hash tem um método get_buckets() que retorna lista de buckets com mapeamentos
     buckets = indice_hash.obter_buckets()  # Ajuste conforme implementação real
     serialized_buckets = [
-        {"id": i, "entradas": len(bucket.entradas), "overflow": bucket.overflow} for i, bucket in enumerate(buckets)
+        {"id": i, "entradas": len(bucket.entradas), "overflow": bucket.overflow_bucket is not None} for i, bucket in enumerate(buckets)
     ]
     return jsonify(serialized_buckets), 200
 
 
 # Rota para busca com Table Scan (agora retorna registros escaneados)
 @app.route("/search_scan/<palavra>", methods=["GET"])
+@_leitura
 def search_scan(palavra):
-    global tabela
+    atual = estado
+    tabela = atual.tabela
     if tabela is None or tabela.get_total_tuplas() == 0:
         return jsonify({"erro": "Tabela não carregada. Carregue os dados primeiro."}), 400
 
     # Pega parâmetro opcional para limite de registros
     max_records = request.args.get('max_records', 100, type=int)
 
+    resposta_cache = _resposta_em_cache(atual.geracao, "scan", palavra, max_records)
+    if resposta_cache is not None:
+        return jsonify(resposta_cache), 200
+
+    faltas_antes = _faltas_buffer_pool(tabela)
     inicio = time.time()
     resultado_scan, custo_scan, scan_info = tabela.table_scan_detailed(palavra, max_records)
     fim = time.time()
@@ -127,22 +650,30 @@ def search_scan(palavra):
         "encontrado": resultado_scan is not None,
         "resultado": resultado_serializado,
         "custo": custo_scan,
+        "leituras_disco": _faltas_buffer_pool(tabela) - faltas_antes if faltas_antes is not None else custo_scan,
         "scanned_records": scan_info["records"],
         "total_scanned": scan_info["total_scanned"],
         "limited_view": scan_info["limited"]
     }
-    return jsonify(response), 200
+    return jsonify(_guardar_resposta(response, atual.geracao, "scan", palavra, max_records)), 200
 
 
 # Rota para busca com Índice Hash
 @app.route("/search_hash/<palavra>", methods=["GET"])
+@_leitura
 def search_hash(palavra):
-    global tabela, indice_hash
+    atual = estado
+    tabela, indice_hash = atual.tabela, atual.indice_hash
     if tabela is None or tabela.get_total_tuplas() == 0:
         return jsonify({"erro": "Tabela não carregada. Carregue os dados primeiro."}), 400
     if indice_hash is None:
         return jsonify({"erro": "Índice não construído. Construa o índice primeiro."}), 400
 
+    resposta_cache = _resposta_em_cache(atual.geracao, "hash", palavra)
+    if resposta_cache is not None:
+        return jsonify(resposta_cache), 200
+
+    faltas_antes = _faltas_buffer_pool(tabela)
     inicio = time.time()
     resultado_hash, custo_hash, pag_id = indice_hash.buscar(palavra, tabela)
     fim = time.time()
@@ -159,15 +690,222 @@ def search_hash(palavra):
         "encontrado": resultado_hash is not None,
         "resultado": resultado_serializado,
         "pagina_id": pag_id,
-        "custo": custo_hash
+        "custo": custo_hash,
+        "leituras_disco": _faltas_buffer_pool(tabela) - faltas_antes if faltas_antes is not None else custo_hash
+    }
+    return jsonify(_guardar_resposta(response, atual.geracao, "hash", palavra)), 200
+
+
+# Rota para busca por valor com o caminho de acesso escolhido pelo planejador (plano=... força um)
+@app.route("/search/<palavra>", methods=["GET"])
+@_leitura
+def search(palavra):
+    atual = estado
+    tabela, indice_hash = atual.tabela, atual.indice_hash
+    if tabela is None or tabela.get_total_tuplas() == 0:
+        return jsonify({"erro": "Tabela não carregada. Carregue os dados primeiro."}), 400
+
+    try:
+        plano = planejador.planejar(tabela, indice_hash, atual.geracao, request.args.get("plano"))
+    except ValueError as e:
+        return jsonify({"erro": str(e)}), 400
+
+    resposta_cache = _resposta_em_cache(atual.geracao, "search", plano["plano"], palavra)
+    if resposta_cache is not None:
+        return jsonify(dict(resposta_cache, plano=plano)), 200
+
+    faltas_antes = _faltas_buffer_pool(tabela)
+    inicio = time.time()
+    if plano["plano"] == "indice_hash":
+        resultado, custo, pag_id = indice_hash.buscar(palavra, tabela)
+    else:
+        resultado, custo = tabela.table_scan(palavra)
+        pag_id = custo - 1 if resultado else None
+    fim = time.time()
+
+    response = {
+        "tempo_busca": f"{fim - inicio:.6f} segundos",
+        "encontrado": resultado is not None,
+        "resultado": {"chave": resultado.chave, "dados": resultado.valor} if resultado else None,
+        "pagina_id": pag_id,
+        "custo": custo,
+        "leituras_disco": _faltas_buffer_pool(tabela) - faltas_antes if faltas_antes is not None else custo
+    }
+    response = _guardar_resposta(response, atual.geracao, "search", plano["plano"], palavra)
+    return jsonify(dict(response, plano=plano)), 200
+
+
+# Rota para busca pela chave primária (record id direto, uma leitura de página)
+@app.route("/search_key/<int:chave>", methods=["GET"])
+@_leitura
+def search_key(chave):
+    atual = estado
+    tabela, indice_chave = atual.tabela, atual.indice_chave
+    if tabela is None or tabela.get_total_tuplas() == 0:
+        return jsonify({"erro": "Tabela não carregada. Carregue os dados primeiro."}), 400
+
+    if indice_chave is None:
+        indice_chave = IndiceChave()
+        indice_chave.construir(tabela)
+        _publicar_indice_preguicoso(atual, indice_chave=indice_chave)
+
+    faltas_antes = _faltas_buffer_pool(tabela)
+    inicio = time.time()
+    resultado, custo, pag_id = indice_chave.buscar(chave, tabela)
+    fim = time.time()
+
+    response = {
+        "tempo_busca": f"{fim - inicio:.6f} segundos",
+        "encontrado": resultado is not None,
+        "resultado": {"chave": resultado.chave, "dados": resultado.valor} if resultado else None,
+        "pagina_id": pag_id,
+        "custo": custo,
+        "leituras_disco": _faltas_buffer_pool(tabela) - faltas_antes if faltas_antes is not None else custo
     }
     return jsonify(response), 200
 
 
+# Rota para busca em lote com Índice Hash (cada página é lida uma única vez)
+@app.route("/search_hash_batch", methods=["POST"])
+@_leitura
+def search_hash_batch():
+    atual = estado
+    tabela, indice_hash = atual.tabela, atual.indice_hash
+    if tabela is None or tabela.get_total_tuplas() == 0:
+        return jsonify({"erro": "Tabela não carregada. Carregue os dados primeiro."}), 400
+    if indice_hash is None:
+        return jsonify({"erro": "Índice não construído. Construa o índice primeiro."}), 400
+
+    palavras = request.json
+    if isinstance(palavras, dict):
+        palavras = palavras.get("palavras")
+    if not isinstance(palavras, list) or not all(isinstance(p, str) for p in palavras):
+        return jsonify({"erro": "Envie uma lista JSON de palavras."}), 400
+
+    faltas_antes = _faltas_buffer_pool(tabela)
+    inicio = time.time()
+    resultados, custo = indice_hash.buscar_lote(palavras, tabela)
+    fim = time.time()
+
+    serializados = []
+    for palavra in palavras:
+        tupla, pag_id = resultados[palavra]
+        serializados.append({
+            "palavra": palavra,
+            "encontrado": tupla is not None,
+            "resultado": {"chave": tupla.chave, "dados": tupla.valor} if tupla else None,
+            "pagina_id": pag_id
+        })
+
+    response = {
+        "tempo_busca": f"{fim - inicio:.6f} segundos",
+        "total_palavras": len(palavras),
+        "total_encontradas": sum(1 for r in serializados if r["encontrado"]),
+        "resultados": serializados,
+        "custo": custo,
+        "leituras_disco": _faltas_buffer_pool(tabela) - faltas_antes if faltas_antes is not None else custo
+    }
+    return jsonify(response), 200
+
+
+def _responder_todas_ocorrencias(ocorrencias):
+    """Pagina (offset/limite) ou transmite em NDJSON (stream=true) as ocorrências
+    geradas por buscar_todos/table_scan_todos. A paginação lê só as ocorrências
+    pedidas; o stream copia as ocorrências ainda sob a trava da rota"""
+    def serializar(tupla, pag_id):
+        return {"chave": tupla.chave, "dados": tupla.valor, "pagina_id": pag_id}
+
+    if request.args.get('stream', 'false').lower() == 'true':
+        # As Tuplas são cópias, independentes das páginas: o envio ao cliente (que pode
+        # ser lento) roda sem trava e sem depender do snapshot, que pode ser trocado e fechado
+        copiadas = list(ocorrencias)
+
+        def gerar():
+            for tupla, pag_id, _ in copiadas:
+                yield json.dumps(serializar(tupla, pag_id), ensure_ascii=False) + "\n"
+            yield json.dumps({"fim": True, "custo": copiadas[-1][2] if copiadas else 0}) + "\n"
+        return Response(stream_with_context(gerar()), mimetype="application/x-ndjson")
+
+    offset = request.args.get('offset', 0, type=int)
+    limite = request.args.get('limite', 100, type=int)
+    if offset < 0 or limite <= 0:
+        return jsonify({"erro": "offset deve ser >= 0 e limite > 0."}), 400
+
+    inicio = time.time()
+    # Lê uma ocorrência a mais só para saber se existe uma próxima página
+    pagina_resultados = list(islice(ocorrencias, offset, offset + limite + 1))
+    fim = time.time()
+
+    tem_mais = len(pagina_resultados) > limite
+    pagina_resultados = pagina_resultados[:limite]
+    return jsonify({
+        "tempo_busca": f"{fim - inicio:.6f} segundos",
+        "resultados": [serializar(tupla, pag_id) for tupla, pag_id, _ in pagina_resultados],
+        "offset": offset,
+        "limite": limite,
+        "proximo_offset": offset + limite if tem_mais else None,
+        "custo": pagina_resultados[-1][2] if pagina_resultados else None
+    }), 200
+
+
+# Rota para buscar todas as ocorrências de um valor com o Índice Hash
+@app.route("/search_hash_all/<palavra>", methods=["GET"])
+@_leitura
+def search_hash_all(palavra):
+    atual = estado
+    tabela, indice_hash = atual.tabela, atual.indice_hash
+    if tabela is None or tabela.get_total_tuplas() == 0:
+        return jsonify({"erro": "Tabela não carregada. Carregue os dados primeiro."}), 400
+    if indice_hash is None:
+        return jsonify({"erro": "Índice não construído. Construa o índice primeiro."}), 400
+
+    return _responder_todas_ocorrencias(indice_hash.buscar_todos(palavra, tabela))
+
+
+# Rota para buscar todas as ocorrências de um valor com Table Scan
+@app.route("/search_scan_all/<palavra>", methods=["GET"])
+@_leitura
+def search_scan_all(palavra):
+    tabela = estado.tabela
+    if tabela is None or tabela.get_total_tuplas() == 0:
+        return jsonify({"erro": "Tabela não carregada. Carregue os dados primeiro."}), 400
+
+    return _responder_todas_ocorrencias(tabela.table_scan_todos(palavra))
+
+
+# Rota para busca por intervalo (inicio/fim) ou prefixo com a árvore B+
+@app.route("/search_range", methods=["GET"])
+@_leitura
+def search_range():
+    atual = estado
+    tabela, arvore_b = atual.tabela, atual.arvore_b
+    if tabela is None or tabela.get_total_tuplas() == 0:
+        return jsonify({"erro": "Tabela não carregada. Carregue os dados primeiro."}), 400
+
+    prefixo = request.args.get('prefixo')
+    inicio = request.args.get('inicio')
+    fim = request.args.get('fim')
+    if prefixo is not None and (inicio is not None or fim is not None):
+        return jsonify({"erro": "Use prefixo ou inicio/fim, não os dois."}), 400
+
+    if arvore_b is None:
+        try:
+            arvore_b = ArvoreBMais(ordem=request.args.get('ordem', 64, type=int))
+        except ValueError as e:
+            return jsonify({"erro": str(e)}), 400
+        arvore_b.construir(tabela)
+        _publicar_indice_preguicoso(atual, arvore_b=arvore_b)
+
+    if prefixo is not None:
+        return _responder_todas_ocorrencias(arvore_b.buscar_prefixo(prefixo))
+    return _responder_todas_ocorrencias(arvore_b.buscar_intervalo(inicio, fim))
+
+
 # Nova rota para testar diferentes métodos de colisão
 @app.route("/test_collision_methods", methods=["POST"])
+@_leitura
 def test_collision_methods():
-    global tabela
+    tabela = estado.tabela
     if tabela is None or tabela.get_total_tuplas() == 0:
         return jsonify({"error": "Tabela não carregada. Carregue os dados primeiro."}), 400
 
@@ -213,8 +951,10 @@ def test_collision_methods():
 
 # Nova rota para comparar funções hash
 @app.route("/compare_hash_functions", methods=["POST"])
+@_leitura
 def compare_hash_functions():
-    global tabela, indice_hash
+    atual = estado
+    tabela, indice_hash = atual.tabela, atual.indice_hash
     if tabela is None or tabela.get_total_tuplas() == 0:
         return jsonify({"erro": "Tabela não carregada. Carregue os dados primeiro."}), 400
     if indice_hash is None:
@@ -246,10 +986,80 @@ def compare_hash_functions():
         return jsonify({"erro": f"Erro ao comparar funções hash: {str(e)}"}), 500
 
 
+def _analisar_performance(tabela, fr_values, palavras_teste, progresso=None):
+    """Constrói um índice por FR e método de colisão e mede as buscas de teste"""
+    analise_completa = {}
+    total_combinacoes = len(fr_values) * len(Hash.METODOS_COLISAO)
+    feitas = 0
+
+    for fr in fr_values:
+        analise_completa[f"fr_{fr}"] = {}
+
+        # Testar cada método de colisão
+        for metodo in Hash.METODOS_COLISAO:
+            if progresso is not None:
+                progresso(f"Construindo FR={fr}, {metodo}", feitas, total_combinacoes)
+
+            # Construir índice com método específico
+            hash_temp = Hash.criar(fr, metodo)
+            hash_temp.construir(tabela)
+
+            # Obter estatísticas
+            stats = hash_temp.obter_estatisticas()
+
+            # Testar busca
+            tempos_busca = []
+            custos_busca = []
+
+            for palavra in palavras_teste:
+                inicio = time.time()
+                _, custo, _ = hash_temp.buscar(palavra, tabela)
+                fim = time.time()
+
+                tempos_busca.append(fim - inicio)
+                custos_busca.append(custo)
+
+            # Calcular médias
+            tempo_medio = sum(tempos_busca) / len(tempos_busca) if tempos_busca else 0
+            custo_medio = sum(custos_busca) / len(custos_busca) if custos_busca else 0
+
+            analise_completa[f"fr_{fr}"][metodo] = {
+                "estatisticas": stats,
+                "performance_busca": {
+                    "tempo_medio": round(tempo_medio * 1000, 4),  # em milissegundos
+                    "custo_medio": round(custo_medio, 2),
+                    "palavras_testadas": len(palavras_teste)
+                }
+            }
+            feitas += 1
+
+    if progresso is not None:
+        progresso("Análise concluída", feitas, total_combinacoes)
+
+    # Encontrar configuração ótima
+    melhor_config = None
+    menor_tempo = float('inf')
+
+    for fr_key, metodos in analise_completa.items():
+        for metodo, dados in metodos.items():
+            tempo = dados["performance_busca"]["tempo_medio"]
+            if tempo < menor_tempo:
+                menor_tempo = tempo
+                melhor_config = f"{fr_key}_{metodo}"
+
+    return {
+        "mensagem": "Análise de performance completada!",
+        "analise_completa": analise_completa,
+        "melhor_configuracao": melhor_config,
+        "fr_testados": fr_values,
+        "palavras_teste": palavras_teste
+    }
+
+
 # Nova rota para análise completa de performance
 @app.route("/performance_analysis", methods=["POST"])
 def performance_analysis():
-    global tabela
+    tabela = estado.tabela
     if tabela is None or tabela.get_total_tuplas() == 0:
         return jsonify({"erro": "Tabela não carregada. Carregue os dados primeiro."}), 400
 
@@ -257,71 +1067,51 @@ def performance_analysis():
     fr_values = data.get("fr_values", [3, 5, 10])  # Diferentes valores de FR para testar
     palavras_teste = data.get("palavras_teste", ["test", "example", "word"])  # Palavras para busca
 
+    if data.get("assincrono", False):
+        def executar(tarefa):
+            # Segura a trava só para copiar as páginas; os índices são construídos na cópia
+            with trava_dados.ler():
+                copia = tabela.copiar()
+            return _analisar_performance(copia, fr_values, palavras_teste, tarefa.atualizar)
+        return _responder_tarefa("performance_analysis", executar, data)
+
     try:
-        analise_completa = {}
-
-        for fr in fr_values:
-            analise_completa[f"fr_{fr}"] = {}
-
-            # Testar cada método de colisão
-            metodos = ['overflow', 'linear_probing', 'quadratic_probing']
-            for metodo in metodos:
-                # Construir índice com método específico
-                hash_temp = Hash(fr=fr, metodo_colisao=metodo)
-                hash_temp.construir(tabela)
-
-                # Obter estatísticas
-                stats = hash_temp.obter_estatisticas()
-
-                # Testar busca
-                tempos_busca = []
-                custos_busca = []
-
-                for palavra in palavras_teste:
-                    inicio = time.time()
-                    _, custo, _ = hash_temp.buscar(palavra, tabela)
-                    fim = time.time()
-
-                    tempos_busca.append(fim - inicio)
-                    custos_busca.append(custo)
-
-                # Calcular médias
-                tempo_medio = sum(tempos_busca) / len(tempos_busca) if tempos_busca else 0
-                custo_medio = sum(custos_busca) / len(custos_busca) if custos_busca else 0
-
-                analise_completa[f"fr_{fr}"][metodo] = {
-                    "estatisticas": stats,
-                    "performance_busca": {
-                        "tempo_medio": round(tempo_medio * 1000, 4),  # em milissegundos
-                        "custo_medio": round(custo_medio, 2),
-                        "palavras_testadas": len(palavras_teste)
-                    }
-                }
+        with trava_dados.ler():
+            copia = tabela.copiar()
+        response = _analisar_performance(copia, fr_values, palavras_teste)
+        return jsonify(response), 200
+
+    except Exception as e:
+        return jsonify({"erro": f"Erro na análise de performance: {str(e)}"}), 500
 
-        # Encontrar configuração ótima
-        melhor_config = None
-        menor_tempo = float('inf')
 
-        for fr_key, metodos in analise_completa.items():
-            for metodo, dados in metodos.items():
-                tempo = dados["performance_busca"]["tempo_medio"]
-                if tempo < menor_tempo:
-                    menor_tempo = tempo
-                    melhor_config = f"{fr_key}_{metodo}"
+# Rota para consultar o andamento de uma tarefa (stream=true envia cada mudança em NDJSON)
+@app.route("/jobs/<id_tarefa>", methods=["GET"])
+def get_job(id_tarefa):
+    tarefa = gerenciador_tarefas.obter(id_tarefa)
+    if tarefa is None:
+        return jsonify({"erro": f"Tarefa '{id_tarefa}' não encontrada."}), 404
 
-        response = {
-            "mensagem": "Análise de performance completada!",
-            "analise_completa": analise_completa,
-            "melhor_configuracao": melhor_config,
-            "fr_testados": fr_values,
-            "palavras_teste": palavras_teste
-        }
+    if request.args.get('stream', 'false').lower() == 'true':
+        def gerar():
+            versao = -1
+            while True:
+                versao_atual = tarefa.aguardar_mudanca(versao)
+                if versao_atual != versao:
+                    versao = versao_atual
+                    yield json.dumps(tarefa.para_dict(), ensure_ascii=False) + "\n"
+                if tarefa.terminou():
+                    return
+        return Response(stream_with_context(gerar()), mimetype="application/x-ndjson")
 
-        return jsonify(response), 200
+    return jsonify(tarefa.para_dict()), 200
 
-    except Exception as e:
-        return jsonify({"erro": f"Erro na análise de performance: {str(e)}"}), 500
+
+# Rota para listar as tarefas recentes (sem os resultados)
+@app.route("/jobs", methods=["GET"])
+def list_jobs():
+    return jsonify([dict(t.para_dict(), resultado=None) for t in gerenciador_tarefas.listar()]), 200
 
 
 if __name__ == "__main__":
-    app.run(debug=True)
+    app.run(debug=True, threaded=True)
@@ -0,0 +1,247 @@
+"""Benchmark reprodutível: table scan x índices hash em tabelas sintéticas.
+
+Gera arquivos de palavras com 10^4 a 10^8 linhas (mesma semente, mesmo
+arquivo), varre tamanho de página, FR e tipo de índice e mede cada mistura
+de consultas:
+
+    zipf      palavras existentes com frequência Zipf (poucas muito quentes)
+    uniforme  palavras existentes sorteadas uniformemente
+    ausentes  90% de palavras que não estão na tabela
+
+Para cada combinação são reportados vazão, latências p50/p95/p99, custo médio
+em páginas, tempo de construção e pico de memória da construção, em JSON e CSV.
+
+Exemplo:
+    python benchmark.py --linhas 10000 100000 --fr 5 10 --indices estatico linear
+"""
+import argparse
+import csv
+import gc
+import itertools
+import json
+import math
+import os
+import random
+import string
+import time
+import tracemalloc
+
+from obj.hash import Hash
+from obj.hash_extensivel import HashExtensivel
+from obj.hash_linear import HashLinear
+from obj.table import Table
+
+INDICES = {
+    "estatico": lambda fr, funcao: Hash(fr, funcao),
+    "extensivel": lambda fr, funcao: HashExtensivel(fr, funcao),
+    "linear": lambda fr, funcao: HashLinear(fr, funcao),
+    "linear_probing": lambda fr, funcao: Hash.criar(fr, "linear_probing", funcao),
+    "quadratic_probing": lambda fr, funcao: Hash.criar(fr, "quadratic_probing", funcao),
+    "robin_hood": lambda fr, funcao: Hash.criar(fr, "robin_hood", funcao),
+}
+
+MISTURAS = ("zipf", "uniforme", "ausentes")
+
+TAMANHO_AMOSTRA = 100000  # Palavras guardadas para sortear as consultas
+
+
+def gerar_arquivo(caminho: str, linhas: int, semente: int):
+    """Grava `linhas` palavras aleatórias (3 a 12 letras minúsculas), em streaming"""
+    if os.path.exists(caminho):
+        return
+    gerador = random.Random(semente)
+    letras = string.ascii_lowercase
+    temporario = caminho + ".tmp"
+    with open(temporario, "w", encoding="utf-8") as arquivo:
+        bloco = []
+        for _ in range(linhas):
+            bloco.append("".join(gerador.choices(letras, k=gerador.randint(3, 12))))
+            if len(bloco) == 10000:
+                arquivo.write("\n".join(bloco) + "\n")
+                bloco = []
+        if bloco:
+            arquivo.write("\n".join(bloco) + "\n")
+    os.replace(temporario, caminho)
+
+
+def amostrar_palavras(tabela: Table, tamanho: int, semente: int):
+    """Amostragem por reservatório dos valores da tabela (memória limitada a `tamanho`)"""
+    gerador = random.Random(semente)
+    amostra = []
+    vistos = 0
+    for pagina in tabela.paginas:
+        for valor in pagina.get_valores():
+            vistos += 1
+            if len(amostra) < tamanho:
+                amostra.append(valor)
+            else:
+                posicao = gerador.randrange(vistos)
+                if posicao < tamanho:
+                    amostra[posicao] = valor
+    return amostra
+
+
+def gerar_consultas(mistura: str, amostra, quantidade: int, semente: int, expoente_zipf: float = 1.1):
+    gerador = random.Random(semente)
+    if mistura == "uniforme":
+        return [gerador.choice(amostra) for _ in range(quantidade)]
+
+    if mistura == "zipf":
+        acumulados = list(itertools.accumulate(1 / (posto ** expoente_zipf)
+                                               for posto in range(1, len(amostra) + 1)))
+        return gerador.choices(amostra, cum_weights=acumulados, k=quantidade)
+
+    if mistura == "ausentes":
+        # Dígitos nunca aparecem nas palavras geradas, então estas consultas sempre falham
+        consultas = []
+        for _ in range(quantidade):
+            if gerador.random() < 0.9:
+                consultas.append(gerador.choice(amostra) + str(gerador.randrange(10)))
+            else:
+                consultas.append(gerador.choice(amostra))
+        return consultas
+
+    raise ValueError(f"Mistura de consultas desconhecida: '{mistura}'. Opções: {', '.join(MISTURAS)}")
+
+
+def percentil(ordenados, p: float) -> float:
+    """Percentil pelo método do posto mais próximo"""
+    if not ordenados:
+        return 0
+    posicao = max(0, math.ceil(p / 100 * len(ordenados)) - 1)
+    return ordenados[min(posicao, len(ordenados) - 1)]
+
+
+def medir_consultas(buscar, consultas):
+    """Executa `buscar(palavra) -> custo` para cada consulta e resume latência e custo"""
+    latencias = []
+    custo_total = 0
+    encontradas = 0
+    inicio_total = time.perf_counter()
+    for palavra in consultas:
+        inicio = time.perf_counter_ns()
+        custo, encontrou = buscar(palavra)
+        latencias.append(time.perf_counter_ns() - inicio)
+        custo_total += custo
+        encontradas += encontrou
+    duracao = time.perf_counter() - inicio_total
+
+    latencias.sort()
+    return {
+        "consultas": len(consultas),
+        "encontradas": encontradas,
+        "vazao_consultas_s": round(len(consultas) / duracao, 2) if duracao else 0,
+        "latencia_p50_us": round(percentil(latencias, 50) / 1000, 3),
+        "latencia_p95_us": round(percentil(latencias, 95) / 1000, 3),
+        "latencia_p99_us": round(percentil(latencias, 99) / 1000, 3),
+        "custo_medio_paginas": round(custo_total / len(consultas), 3) if consultas else 0
+    }
+
+
+def construir_medindo(indice, tabela: Table, medir_memoria: bool):
+    """Constrói o índice e retorna (segundos, pico de memória em bytes ou None)"""
+    gc.collect()
+    if medir_memoria:
+        tracemalloc.start()
+    inicio = time.perf_counter()
+    indice.construir(tabela)
+    duracao = time.perf_counter() - inicio
+    pico = None
+    if medir_memoria:
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return duracao, pico
+
+
+def executar(args):
+    resultados = []
+    os.makedirs(args.diretorio, exist_ok=True)
+
+    for linhas in args.linhas:
+        arquivo = os.path.join(args.diretorio, f"palavras_{linhas}_{args.semente}.txt")
+        print(f"Gerando/usando {arquivo}...")
+        gerar_arquivo(arquivo, linhas, args.semente)
+
+        for tam_pagina in args.tam_pagina:
+            tabela = Table(arquivo)
+            inicio = time.perf_counter()
+            tabela.carregar(tam_pagina=tam_pagina)
+            tempo_carga = time.perf_counter() - inicio
+            print(f"Tabela: {tabela.get_total_tuplas()} tuplas, {tabela.get_total_pag()} páginas "
+                  f"({tempo_carga:.2f}s)")
+
+            amostra = amostrar_palavras(tabela, TAMANHO_AMOSTRA, args.semente)
+            consultas = {mistura: gerar_consultas(mistura, amostra, args.consultas, args.semente)
+                         for mistura in args.misturas}
+
+            base = {"linhas": linhas, "tam_pagina": tam_pagina, "total_paginas": tabela.get_total_pag(),
+                    "tempo_carga_s": round(tempo_carga, 4)}
+
+            if args.consultas_scan:
+                # Variáveis do laço ligadas como padrão: o del abaixo não as afeta
+                def buscar_scan(palavra, tabela=tabela):
+                    tupla, custo = tabela.table_scan(palavra)
+                    return custo, tupla is not None
+
+                for mistura, lista in consultas.items():
+                    medicao = medir_consultas(buscar_scan, lista[:args.consultas_scan])
+                    resultados.append(dict(base, indice="table_scan", fr=None, funcao=None, mistura=mistura,
+                                           tempo_construcao_s=0, pico_memoria_bytes=None, **medicao))
+                    print(f"  table_scan {mistura}: {medicao['vazao_consultas_s']} consultas/s")
+                del buscar_scan
+
+            for nome_indice, fr in itertools.product(args.indices, args.fr):
+                indice = INDICES[nome_indice](fr, args.funcao)
+                tempo_construcao, pico = construir_medindo(indice, tabela, args.memoria)
+
+                def buscar_indice(palavra, indice=indice, tabela=tabela):
+                    tupla, custo, _ = indice.buscar(palavra, tabela)
+                    return custo, tupla is not None
+
+                for mistura, lista in consultas.items():
+                    medicao = medir_consultas(buscar_indice, lista)
+                    resultados.append(dict(base, indice=nome_indice, fr=fr, funcao=args.funcao, mistura=mistura,
+                                           tempo_construcao_s=round(tempo_construcao, 4),
+                                           pico_memoria_bytes=pico, **medicao))
+                    print(f"  {nome_indice} FR={fr} {mistura}: {medicao['vazao_consultas_s']} consultas/s, "
+                          f"p99 {medicao['latencia_p99_us']}us, custo {medicao['custo_medio_paginas']}")
+                del indice, buscar_indice
+
+            del tabela
+            gc.collect()
+
+    return resultados
+
+
+def salvar(resultados, prefixo: str):
+    with open(prefixo + ".json", "w", encoding="utf-8") as arquivo:
+        json.dump(resultados, arquivo, ensure_ascii=False, indent=2)
+
+    if resultados:
+        with open(prefixo + ".csv", "w", encoding="utf-8", newline="") as arquivo:
+            escritor = csv.DictWriter(arquivo, fieldnames=list(resultados[0]))
+            escritor.writeheader()
+            escritor.writerows(resultados)
+    print(f"Resultados gravados em {prefixo}.json e {prefixo}.csv")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de table scan e índices hash")
+    parser.add_argument("--linhas", type=int, nargs="+", default=[10000, 100000],
+                        help="Tamanhos de tabela a gerar (ex.: 10000 1000000 100000000)")
+    parser.add_argument("--tam-pagina", type=int, nargs="+", default=[100])
+    parser.add_argument("--fr", type=int, nargs="+", default=[5])
+    parser.add_argument("--indices", nargs="+", default=["estatico"], choices=list(INDICES))
+    parser.add_argument("--funcao", default="djb2", help="Função hash dos índices")
+    parser.add_argument("--misturas", nargs="+", default=list(MISTURAS), choices=MISTURAS)
+    parser.add_argument("--consultas", type=int, default=10000, help="Consultas por mistura nos índices")
+    parser.add_argument("--consultas-scan", type=int, default=20,
+                        help="Consultas por mistura no table scan (0 desativa; o scan lê a tabela toda)")
+    parser.add_argument("--memoria", action="store_true",
+                        help="Mede o pico de memória da construção com tracemalloc (mais lento)")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--diretorio", default="benchmark_dados", help="Onde ficam os arquivos gerados")
+    parser.add_argument("--saida", default="benchmark_resultados", help="Prefixo dos arquivos .json e .csv")
+    args = parser.parse_args()
+
+    salvar(executar(args), args.saida)
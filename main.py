@@ -1,5 +1,6 @@
 import time
 
+from obj.ajustador_fr import AjustadorFR
 from obj.hash import Hash
 from obj.table import Table
 
@@ -19,9 +20,12 @@ if __name__ == "__main__":
         print(f"Total de Páginas: {tabela.get_total_pag()}")
         print("-" * 30)
 
-        # 3. Construir o índice hash com configuração otimizada
-        tamanho_bucket_fr = 5  # Otimizado: configuração de máxima eficiência
-        indice_hash = Hash(fr=tamanho_bucket_fr)
+        # 3. Escolher FR e número de buckets por amostragem e construir o índice hash
+        ajuste = AjustadorFR().sugerir(tabela, cadeia_alvo=1.2)
+        print(f"FR sugerido: {ajuste['fr']} com {ajuste['nb']} buckets "
+              f"(cadeia média estimada {ajuste['cadeia_media']}, "
+              f"~{ajuste['memoria_estimada_bytes'] / 2**20:.1f} MiB)")
+        indice_hash = Hash(fr=ajuste['fr'], num_buckets=ajuste['nb'])
         indice_hash.construir(tabela)
 
         # 4. Exibir estatísticas melhoradas
@@ -37,7 +41,7 @@ if __name__ == "__main__":
         if estatisticas['taxa_colisoes'] < 85:
             print("  TAXA DE COLISÕES: Boa")
         else:
-            print("  TAXA DE COLISÕES: Ainda alta - considere reduzir FR ainda mais")
+            print("  TAXA DE COLISÕES: Ainda alta - reduza cadeia_alvo no AjustadorFR")
             
         if estatisticas['taxa_overflows'] < 10:
             print("  TAXA DE OVERFLOWS: Excelente")
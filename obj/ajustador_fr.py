@@ -0,0 +1,132 @@
+import math
+import random
+import sys
+
+from obj.bucket import Bucket
+from obj.funcoes_hash import obter_funcao_hash
+from obj.hash import Hash
+from obj.table import Table
+
+# Estimativas de memória do índice estático em CPython (bytes)
+BYTES_BUCKET = sys.getsizeof(Bucket(1)) + sys.getsizeof([])  # Objeto Bucket + lista de entradas vazia
+BYTES_ENTRADA = sys.getsizeof((0, 0, 0)) + 28 + 36 + 8  # Tupla + chave + impressão 64 bits + ponteiro na lista
+BYTES_POSICAO_DIRETORIO = 8  # Ponteiro em Hash.buckets
+
+
+class AjustadorFR:
+    """Escolhe FR e número de buckets (NB) a partir de uma amostra da tabela.
+
+    Em vez de um FR fixo, sorteia páginas até juntar `tamanho_amostra` valores,
+    calcula as impressões com a mesma função hash do índice e simula o índice
+    estático em escala reduzida (mesmo FR e mesma carga NR/(NB*FR)) para cada
+    combinação candidata. Valores repetidos caem sempre no mesmo bucket, então
+    a simulação enxerga a assimetria real da distribuição das chaves.
+
+    A cadeia média é ponderada pelas entradas: para cada entrada, o número de
+    buckets da cadeia em que ela está, então buckets vazios não diluem a média
+    e uma chave muito repetida pesa tanto quanto as suas cópias. O alvo limita
+    essa média e a cadeia máxima da amostra. Entre as combinações que atendem
+    os dois limites e o orçamento de memória, vence a que gasta menos memória.
+    """
+
+    CANDIDATOS_FR = (1, 2, 3, 4, 5, 8, 10, 16, 20, 32, 50, 64, 100)
+    CARGAS = (0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+
+    def __init__(self, funcao: str = 'djb2', tamanho_amostra: int = 20000, semente: int = 0):
+        self.funcao = funcao
+        self.tamanho_amostra = tamanho_amostra
+        self.semente = semente
+
+    def amostrar(self, tabela: Table):
+        """Impressões dos valores de páginas sorteadas (lê só as páginas da amostra).
+        A leitura não passa pelo buffer pool nem pelas métricas: não é uma consulta"""
+        total_paginas = tabela.get_total_pag()
+        ids_paginas = list(range(total_paginas))
+        random.Random(self.semente).shuffle(ids_paginas)
+
+        funcao = obter_funcao_hash(self.funcao)
+        impressoes = []
+        for id_pag in ids_paginas:
+            if len(impressoes) >= self.tamanho_amostra:
+                break
+            pagina = tabela._ler_pagina(id_pag)
+            if pagina is not None:
+                impressoes.extend(funcao(visao) for visao in pagina.get_visoes())
+        return impressoes
+
+    def simular(self, impressoes, fr: int, carga: float):
+        """Simula o índice estático sobre a amostra; métricas por entrada e por bucket"""
+        nb = max(1, math.ceil(len(impressoes) / (fr * carga)))
+        indice = Hash(fr, self.funcao)
+        indice.nb = nb
+
+        contagens = [0] * nb
+        for impressao in impressoes:
+            contagens[indice.endereco(impressao)] += 1
+
+        buckets_na_cadeia = [max(1, math.ceil(c / fr)) for c in contagens]
+        entradas_x_cadeia = sum(c * b for c, b in zip(contagens, buckets_na_cadeia))
+        # A j-ésima entrada de uma cadeia (j a partir de 1) está no bucket ceil(j/FR)
+        leituras_sucesso = sum(sum(math.ceil(j / fr) for j in range(1, c + 1)) for c in contagens)
+        return {
+            "nb": nb,
+            "cadeia_media": entradas_x_cadeia / len(impressoes),
+            "cadeia_maxima": max(buckets_na_cadeia),
+            "buckets_por_busca_com_sucesso": leituras_sucesso / len(impressoes),
+            "entradas_por_busca": len(impressoes) / nb,
+            "total_buckets": sum(buckets_na_cadeia)
+        }
+
+    def estimar_memoria(self, nr: int, fr: int, nb: int, total_buckets: int) -> int:
+        """Bytes aproximados do índice estático com NR entradas, NB buckets e total_buckets com overflows"""
+        return (nb * BYTES_POSICAO_DIRETORIO
+                + total_buckets * (BYTES_BUCKET + 8 * fr)
+                + nr * BYTES_ENTRADA)
+
+    def sugerir(self, tabela: Table, cadeia_alvo: float = 1.2, memoria_maxima: int | None = None,
+                candidatos_fr=None, cargas=None, cadeia_maxima: int = 4):
+        """Retorna a combinação escolhida com as métricas estimadas para a tabela inteira"""
+        nr = tabela.get_total_tuplas()
+        if nr == 0:
+            raise ValueError("Tabela vazia: não há chaves para amostrar")
+        if cadeia_alvo < 1 or cadeia_maxima < 1:
+            raise ValueError("As cadeias alvo (média e máxima) devem ser de pelo menos 1 bucket")
+
+        impressoes = self.amostrar(tabela)
+        escala = nr / len(impressoes)
+        candidatos = []
+        for fr in candidatos_fr or self.CANDIDATOS_FR:
+            for carga in cargas or self.CARGAS:
+                simulacao = self.simular(impressoes, fr, carga)
+                nb = max(1, math.ceil(nr / (fr * carga)))
+                total_buckets = math.ceil(simulacao["total_buckets"] * escala)
+                candidatos.append({
+                    "fr": fr,
+                    "carga": carga,
+                    "nb": nb,
+                    "cadeia_media": round(simulacao["cadeia_media"], 3),
+                    "cadeia_maxima_amostra": simulacao["cadeia_maxima"],
+                    "buckets_por_busca_com_sucesso": round(simulacao["buckets_por_busca_com_sucesso"], 3),
+                    "entradas_por_busca": round(simulacao["entradas_por_busca"], 3),
+                    "memoria_estimada_bytes": self.estimar_memoria(nr, fr, nb, total_buckets)
+                })
+
+        dentro_orcamento = [c for c in candidatos
+                            if memoria_maxima is None or c["memoria_estimada_bytes"] <= memoria_maxima]
+        atendem = [c for c in dentro_orcamento
+                   if c["cadeia_media"] <= cadeia_alvo and c["cadeia_maxima_amostra"] <= cadeia_maxima]
+        if atendem:
+            escolhido = min(atendem, key=lambda c: (c["memoria_estimada_bytes"], c["cadeia_media"]))
+        elif dentro_orcamento:
+            escolhido = min(dentro_orcamento, key=lambda c: (c["cadeia_media"], c["memoria_estimada_bytes"]))
+        else:
+            escolhido = min(candidatos, key=lambda c: c["memoria_estimada_bytes"])
+
+        return dict(escolhido,
+                    atende_alvo=bool(atendem),
+                    cadeia_alvo=cadeia_alvo,
+                    cadeia_maxima=cadeia_maxima,
+                    memoria_maxima=memoria_maxima,
+                    tamanho_amostra=len(impressoes),
+                    funcao_hash=self.funcao,
+                    candidatos=candidatos)
@@ -0,0 +1,218 @@
+"""Formatos binários em disco para a tabela (heap file) e para o índice hash.
+
+Os dois arquivos têm um cabeçalho fixo seguido de blocos de tamanho fixo e são
+lidos com mmap: abrir um arquivo não lê nada além do cabeçalho, e cada acesso a
+uma página ou bucket decodifica só o bloco correspondente.
+
+Heap file: cabeçalho + um bloco por página com
+    [n: uint32][tam_dados: uint32][chaves: n * int64][fins: n * uint32][dados UTF-8]
+
+Arquivo de índice: cabeçalho + um bloco por bucket (primários 0..nb-1, depois os
+de overflow) com
+    [n: uint32][próximo overflow: int32, -1 se não há][fr * (chave int64, página int64, hash uint64)]
+
+O cabeçalho do heap file guarda o CRC32 dos blocos de página e o do índice guarda o
+CRC32 do heap file para o qual foi construído, então um índice de outra gravação
+da tabela é recusado ao abrir.
+"""
+from contextlib import contextmanager
+import mmap
+import os
+import struct
+import tempfile
+import zlib
+
+from obj.bucket import Bucket
+from obj.page import Page
+
+MAGICO_HEAP = b'IHHEAP02'
+MAGICO_INDICE = b'IHIDX002'
+
+CABECALHO_HEAP = struct.Struct('<8sIIQQI')  # mágico, capacidade, tam_bloco, páginas, tuplas, CRC32
+CABECALHO_INDICE = struct.Struct('<8sIQQQQ16sI')  # mágico, fr, nb, nr, colisões, overflows, função, CRC32 do heap
+TAMANHO_CABECALHO = 64
+
+CABECALHO_PAGINA = struct.Struct('<II')
+CABECALHO_BUCKET = struct.Struct('<Ii')
+ENTRADA = struct.Struct('<qqQ')
+
+ALINHAMENTO_BLOCO = 512
+
+
+def _abrir_mmap(caminho: str, magico: bytes):
+    with open(caminho, 'rb') as arquivo:
+        mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+    if mapa[:len(magico)] != magico:
+        mapa.close()
+        raise ValueError(f"Arquivo '{caminho}' não está no formato esperado")
+    return mapa
+
+
+@contextmanager
+def _gravar_substituindo(caminho: str):
+    """Abre um temporário no mesmo diretório e, se a escrita terminar, troca o
+    destino por ele com os.replace. Um mmap do arquivo antigo continua válido
+    (aponta para o inode antigo) em vez de ver o arquivo truncado"""
+    descritor, temporario = tempfile.mkstemp(dir=os.path.dirname(caminho) or '.',
+                                             prefix=os.path.basename(caminho) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(descritor, 'wb') as arquivo:
+            yield arquivo
+        os.replace(temporario, caminho)
+    except BaseException:
+        os.remove(temporario)
+        raise
+
+
+def _serializar_pagina(pagina: Page) -> bytes:
+    return (CABECALHO_PAGINA.pack(len(pagina), len(pagina.dados))
+            + pagina.chaves.tobytes() + pagina.fins.tobytes() + bytes(pagina.dados))
+
+
+def salvar_paginas(paginas, capacidade: int, caminho: str):
+    """Grava as páginas em um heap file com blocos de tamanho fixo; retorna o CRC32 dos blocos"""
+    blocos = [_serializar_pagina(p) for p in paginas]
+    maior = max((len(b) for b in blocos), default=CABECALHO_PAGINA.size)
+    tam_bloco = -(-maior // ALINHAMENTO_BLOCO) * ALINHAMENTO_BLOCO
+    total_tuplas = sum(len(p) for p in paginas)
+    blocos = [bloco.ljust(tam_bloco, b'\0') for bloco in blocos]
+    crc = 0
+    for bloco in blocos:
+        crc = zlib.crc32(bloco, crc)
+
+    with _gravar_substituindo(caminho) as arquivo:
+        cabecalho = CABECALHO_HEAP.pack(MAGICO_HEAP, capacidade, tam_bloco, len(blocos), total_tuplas, crc)
+        arquivo.write(cabecalho.ljust(TAMANHO_CABECALHO, b'\0'))
+        for bloco in blocos:
+            arquivo.write(bloco)
+    return crc
+
+
+class PaginasEmDisco:
+    """Sequência de páginas apoiada em um heap file mapeado em memória.
+
+    Substitui a lista Table.paginas: indexar ou iterar lê o bloco da página
+    no arquivo, então cada get_pagina corresponde a uma leitura real.
+    """
+
+    def __init__(self, caminho: str):
+        self.caminho = caminho
+        self.mapa = _abrir_mmap(caminho, MAGICO_HEAP)
+        _, self.capacidade, self.tam_bloco, self.total_paginas, self.total_tuplas, self.crc = \
+            CABECALHO_HEAP.unpack_from(self.mapa)
+        self.leituras = 0
+
+    def __len__(self):
+        return self.total_paginas
+
+    def __getitem__(self, id_pagina: int) -> Page:
+        if id_pagina < 0:
+            id_pagina += self.total_paginas
+        if not 0 <= id_pagina < self.total_paginas:
+            raise IndexError("página fora do arquivo")
+
+        inicio = TAMANHO_CABECALHO + id_pagina * self.tam_bloco
+        n, tam_dados = CABECALHO_PAGINA.unpack_from(self.mapa, inicio)
+        inicio += CABECALHO_PAGINA.size
+
+        pagina = Page(id=id_pagina, capacidade=self.capacidade)
+        pagina.chaves.frombytes(self.mapa[inicio:inicio + 8 * n])
+        inicio += 8 * n
+        pagina.fins.frombytes(self.mapa[inicio:inicio + 4 * n])
+        inicio += 4 * n
+        pagina.dados = bytearray(self.mapa[inicio:inicio + tam_dados])
+
+        self.leituras += 1
+        return pagina
+
+    def __iter__(self):
+        for id_pagina in range(self.total_paginas):
+            yield self[id_pagina]
+
+    def fechar(self):
+        self.mapa.close()
+
+
+def salvar_buckets(buckets, fr: int, nr: int, total_colisoes: int, total_overflows: int,
+                   nome_funcao: str, caminho: str, crc_heap: int = 0):
+    """Grava os buckets (e as cadeias de overflow) em blocos de tamanho fixo"""
+    blocos = list(buckets)
+    posicao = {id(b): i for i, b in enumerate(blocos)}
+    for i in range(len(buckets)):
+        bucket = blocos[i].overflow_bucket
+        while bucket is not None:
+            posicao[id(bucket)] = len(blocos)
+            blocos.append(bucket)
+            bucket = bucket.overflow_bucket
+
+    tam_bloco = CABECALHO_BUCKET.size + fr * ENTRADA.size
+    with _gravar_substituindo(caminho) as arquivo:
+        cabecalho = CABECALHO_INDICE.pack(MAGICO_INDICE, fr, len(buckets), nr, total_colisoes,
+                                          total_overflows, nome_funcao.encode('utf-8'), crc_heap)
+        arquivo.write(cabecalho.ljust(TAMANHO_CABECALHO, b'\0'))
+
+        bloco = bytearray(tam_bloco)
+        for bucket in blocos:
+            bloco[:] = bytes(tam_bloco)
+            proximo = posicao[id(bucket.overflow_bucket)] if bucket.overflow_bucket is not None else -1
+            CABECALHO_BUCKET.pack_into(bloco, 0, len(bucket.entradas), proximo)
+            for i, entrada in enumerate(bucket.entradas):
+                ENTRADA.pack_into(bloco, CABECALHO_BUCKET.size + i * ENTRADA.size, *entrada)
+            arquivo.write(bloco)
+
+
+def ler_cabecalho_indice(caminho: str):
+    """Retorna (fr, nb, nr, total_colisoes, total_overflows, nome_funcao, crc_heap)"""
+    with open(caminho, 'rb') as arquivo:
+        dados = arquivo.read(CABECALHO_INDICE.size)
+    magico, fr, nb, nr, colisoes, overflows, nome, crc_heap = CABECALHO_INDICE.unpack(dados)
+    if magico != MAGICO_INDICE:
+        raise ValueError(f"Arquivo '{caminho}' não está no formato esperado")
+    return fr, nb, nr, colisoes, overflows, nome.rstrip(b'\0').decode('utf-8'), crc_heap
+
+
+class BucketsEmDisco:
+    """Sequência de buckets (somente leitura) apoiada no arquivo de índice mapeado.
+
+    Cada acesso decodifica o bucket primário e sua cadeia de overflow.
+    """
+
+    def __init__(self, caminho: str, fr: int, nb: int):
+        self.caminho = caminho
+        self.fr = fr
+        self.nb = nb
+        self.tam_bloco = CABECALHO_BUCKET.size + fr * ENTRADA.size
+        self.mapa = _abrir_mmap(caminho, MAGICO_INDICE)
+
+    def __len__(self):
+        return self.nb
+
+    def _ler_bloco(self, numero: int):
+        inicio = TAMANHO_CABECALHO + numero * self.tam_bloco
+        n, proximo = CABECALHO_BUCKET.unpack_from(self.mapa, inicio)
+        bucket = Bucket(self.fr)
+        bucket.entradas = list(ENTRADA.iter_unpack(
+            self.mapa[inicio + CABECALHO_BUCKET.size:inicio + CABECALHO_BUCKET.size + n * ENTRADA.size]))
+        return bucket, proximo
+
+    def __getitem__(self, indice: int) -> Bucket:
+        if indice < 0:
+            indice += self.nb
+        if not 0 <= indice < self.nb:
+            raise IndexError("bucket fora do arquivo")
+
+        primario, proximo = self._ler_bloco(indice)
+        atual = primario
+        while proximo != -1:
+            overflow, proximo = self._ler_bloco(proximo)
+            overflow.nivel_overflow = atual.nivel_overflow + 1
+            atual.overflow_bucket = overflow
+            atual = overflow
+        return primario
+
+    def __iter__(self):
+        for indice in range(self.nb):
+            yield self[indice]
+
+    def fechar(self):
+        self.mapa.close()
@@ -0,0 +1,195 @@
+from bisect import bisect_left, bisect_right
+
+from obj.table import Table
+from obj.tupla import Tupla
+
+
+class No:
+    """Nó da árvore B+. Nas folhas, `chaves` são os valores indexados em ordem e
+    `entradas[i]` é a lista de (chave, id_pag) das tuplas com o valor chaves[i];
+    as folhas são encadeadas por `proxima`. Nos nós internos, `filhos[i]` cobre
+    os valores menores que chaves[i]."""
+    __slots__ = ('folha', 'chaves', 'filhos', 'entradas', 'proxima')
+
+    def __init__(self, folha: bool):
+        self.folha = folha
+        self.chaves = []
+        self.filhos = []
+        self.entradas = []
+        self.proxima = None
+
+
+class ArvoreBMais:
+    """Índice ordenado sobre Tupla.valor para buscas por intervalo, prefixo e
+    varredura ordenada.
+
+    As folhas guardam valor e chave, então o índice cobre a consulta: as tuplas
+    saem da árvore sem ler páginas da tabela. O custo reportado é o número de
+    nós lidos (cada nó equivale a uma página do índice): a descida da raiz até a
+    primeira folha mais uma leitura por folha percorrida.
+    """
+
+    def __init__(self, ordem: int = 64):
+        if ordem < 3:
+            raise ValueError("A ordem da árvore B+ deve ser pelo menos 3")
+        self.ordem = ordem
+        self.raiz = No(folha=True)
+        self.altura = 1
+        self.nr = 0
+
+    def construir(self, tabela: Table):
+        """Carga em lote: ordena as tuplas, monta as folhas e depois os níveis
+        acima delas, de baixo para cima"""
+        # Valores repetidos passam a compartilhar um só str; o dicionário vive só durante a carga
+        distintos = {}
+        pares = sorted((distintos.setdefault(valor, valor), chave, id_pag)
+                       for chave, valor, id_pag in tabela.get_info_indice())
+        del distintos
+        self.nr = len(pares)
+
+        folhas = []
+        folha = No(folha=True)
+        for valor, chave, id_pag in pares:
+            if folha.chaves and folha.chaves[-1] == valor:
+                folha.entradas[-1].append((chave, id_pag))
+                continue
+            if len(folha.chaves) >= self.ordem:
+                folhas.append(folha)
+                nova = No(folha=True)
+                folha.proxima = nova
+                folha = nova
+            folha.chaves.append(valor)
+            folha.entradas.append([(chave, id_pag)])
+        folhas.append(folha)
+
+        nivel = folhas
+        self.altura = 1
+        while len(nivel) > 1:
+            acima = []
+            for inicio in range(0, len(nivel), self.ordem):
+                no = No(folha=False)
+                no.filhos = nivel[inicio:inicio + self.ordem]
+                no.chaves = [self._menor_valor(filho) for filho in no.filhos[1:]]
+                acima.append(no)
+            nivel = acima
+            self.altura += 1
+        self.raiz = nivel[0]
+
+        print(f"Árvore B+ construída: {self.nr} registros, altura {self.altura}")
+
+    @staticmethod
+    def _menor_valor(no: No):
+        while not no.folha:
+            no = no.filhos[0]
+        return no.chaves[0]
+
+    def _descer(self, valor: str | None):
+        """Retorna (folha, caminho, nós lidos); valor None desce pela esquerda"""
+        no = self.raiz
+        caminho = []
+        while not no.folha:
+            posicao = 0 if valor is None else bisect_right(no.chaves, valor)
+            caminho.append((no, posicao))
+            no = no.filhos[posicao]
+        return no, caminho, len(caminho) + 1
+
+    def inserir(self, valor: str, chave: int, id_pag: int):
+        folha, caminho, _ = self._descer(valor)
+        posicao = bisect_left(folha.chaves, valor)
+        self.nr += 1
+        if posicao < len(folha.chaves) and folha.chaves[posicao] == valor:
+            folha.entradas[posicao].append((chave, id_pag))
+            return
+
+        folha.chaves.insert(posicao, valor)
+        folha.entradas.insert(posicao, [(chave, id_pag)])
+
+        # Divide os nós cheios subindo pelo caminho
+        no = folha
+        while len(no.chaves) > self.ordem:
+            meio = len(no.chaves) // 2
+            irmao = No(folha=no.folha)
+            if no.folha:
+                irmao.chaves, no.chaves = no.chaves[meio:], no.chaves[:meio]
+                irmao.entradas, no.entradas = no.entradas[meio:], no.entradas[:meio]
+                irmao.proxima, no.proxima = no.proxima, irmao
+                separador = irmao.chaves[0]
+            else:
+                separador = no.chaves[meio]
+                irmao.chaves, no.chaves = no.chaves[meio + 1:], no.chaves[:meio]
+                irmao.filhos, no.filhos = no.filhos[meio + 1:], no.filhos[:meio + 1]
+
+            if not caminho:
+                nova_raiz = No(folha=False)
+                nova_raiz.chaves = [separador]
+                nova_raiz.filhos = [no, irmao]
+                self.raiz = nova_raiz
+                self.altura += 1
+                return
+
+            pai, posicao = caminho.pop()
+            pai.chaves.insert(posicao, separador)
+            pai.filhos.insert(posicao + 1, irmao)
+            no = pai
+
+    def remover(self, valor: str, chave: int) -> bool:
+        """Remove a entrada; folhas que ficam vazias continuam na cadeia (sem rebalanceamento)"""
+        folha, _, _ = self._descer(valor)
+        posicao = bisect_left(folha.chaves, valor)
+        if posicao == len(folha.chaves) or folha.chaves[posicao] != valor:
+            return False
+
+        entradas = folha.entradas[posicao]
+        for i, (chave_entrada, _) in enumerate(entradas):
+            if chave_entrada == chave:
+                del entradas[i]
+                if not entradas:
+                    del folha.chaves[posicao]
+                    del folha.entradas[posicao]
+                self.nr -= 1
+                return True
+        return False
+
+    def buscar_intervalo(self, inicio: str | None = None, fim: str | None = None, incluir_fim: bool = True):
+        """Gera (tupla, id_pag, custo) em ordem de valor para inicio <= valor <= fim
+        (ou < fim com incluir_fim=False); limites None deixam o intervalo aberto"""
+        folha, _, custo = self._descer(inicio)
+        posicao = 0 if inicio is None else bisect_left(folha.chaves, inicio)
+
+        while folha is not None:
+            for i in range(posicao, len(folha.chaves)):
+                valor = folha.chaves[i]
+                if fim is not None and (valor > fim or (valor == fim and not incluir_fim)):
+                    return
+                for chave, id_pag in folha.entradas[i]:
+                    yield Tupla(chave, valor), id_pag, custo
+            folha = folha.proxima
+            posicao = 0
+            custo += 1
+
+    def buscar_prefixo(self, prefixo: str):
+        """Gera (tupla, id_pag, custo) para os valores que começam com `prefixo`"""
+        for tupla, id_pag, custo in self.buscar_intervalo(prefixo):
+            if not tupla.valor.startswith(prefixo):
+                return
+            yield tupla, id_pag, custo
+
+    def obter_estatisticas(self):
+        folhas = 0
+        nos = 0
+        nivel = [self.raiz]
+        while nivel:
+            nos += len(nivel)
+            if nivel[0].folha:
+                folhas = len(nivel)
+                break
+            nivel = [filho for no in nivel for filho in no.filhos]
+
+        return {
+            "total_registros": self.nr,
+            "ordem": self.ordem,
+            "altura": self.altura,
+            "total_nos": nos,
+            "total_folhas": folhas,
+            "tipo_indice": "arvore_b+"
+        }
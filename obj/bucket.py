@@ -1,31 +1,69 @@
+import math
 import sys
 
+from obj.metricas import BUCKETS_OVERFLOW_CRIADOS
+
 
 class Bucket:
+    __slots__ = ('capacidade', 'entradas', 'overflow_bucket', 'nivel_overflow', 'profundidade_local',
+                 'impressao_comum', 'fim_cadeia')
+
+    # id_pag das entradas removidas (lápides), descartadas na compactação
+    LAPIDE = -1
+
     def __init__(self, capacidade: int):
         self.capacidade = capacidade
         self.entradas = []
         self.overflow_bucket = None
         self.nivel_overflow = 0  # Novo: rastrear níveis de overflow
+        self.profundidade_local = 0  # Usado pelo hashing extensível
+        self.impressao_comum = None  # Hashing extensível: impressão comum a toda a cadeia (ou MISTA)
+        self.fim_cadeia = None  # Um bucket da própria cadeia perto do fim (None: a partir deste)
 
     def esta_cheio(self):
         return len(self.entradas) >= self.capacidade
 
-    def adicionar(self, chave: int, id_pag: int) -> bool:
-        """Adiciona uma entrada ao bucket ou a um bucket de overflow, de forma iterativa."""
-        bucket_atual = self
+    def adicionar(self, chave: int, id_pag: int, impressao: int = 0) -> bool:
+        """Adiciona uma entrada ao bucket ou a um bucket de overflow, de forma iterativa.
+
+        A impressão é o hash completo do valor indexado; permite descartar
+        entradas de outros valores sem ler a página correspondente. A procura
+        pelo bucket com espaço começa em fim_cadeia, então uma cadeia longa
+        (valor muito repetido) não é percorrida inteira a cada entrada.
+        """
+        bucket_atual = self.fim_cadeia or self
         houve_overflow_no_inicio = len(self.entradas) >= self.capacidade
 
         while True:
             if not bucket_atual.esta_cheio():
-                bucket_atual.entradas.append((chave, id_pag))
+                bucket_atual.entradas.append((chave, id_pag, impressao))
+                if bucket_atual is not self:
+                    self.fim_cadeia = bucket_atual
                 return houve_overflow_no_inicio
 
             if bucket_atual.overflow_bucket is None:
                 bucket_atual.overflow_bucket = Bucket(self.capacidade)
+                BUCKETS_OVERFLOW_CRIADOS.inc()
                 bucket_atual.overflow_bucket.nivel_overflow = bucket_atual.nivel_overflow + 1
 
             bucket_atual = bucket_atual.overflow_bucket
+
+    def preencher(self, entradas):
+        """Substitui o conteúdo da cadeia pelas entradas, FR por bucket, criando
+        os buckets de overflow necessários de uma vez (sem adicionar entrada a entrada)"""
+        self.entradas = entradas[:self.capacidade]
+        self.overflow_bucket = None
+        self.fim_cadeia = None
+        bucket_atual = self
+        for inicio in range(self.capacidade, len(entradas), self.capacidade):
+            bucket_atual.overflow_bucket = Bucket(self.capacidade)
+            BUCKETS_OVERFLOW_CRIADOS.inc()
+            bucket_atual.overflow_bucket.nivel_overflow = bucket_atual.nivel_overflow + 1
+            bucket_atual = bucket_atual.overflow_bucket
+            bucket_atual.entradas = entradas[inicio:inicio + self.capacidade]
+        if bucket_atual is not self:
+            self.fim_cadeia = bucket_atual
+
     def buscar_entrada(self, chave: int):
         """Busca uma entrada específica por chave - versão iterativa"""
         bucket_atual = self
@@ -33,7 +71,7 @@ class Bucket:
         # Percorre toda a cadeia de overflow buckets
         while bucket_atual is not None:
             # Buscar no bucket atual
-            for entrada_chave, id_pag in bucket_atual.entradas:
+            for entrada_chave, id_pag, _ in bucket_atual.entradas:
                 if entrada_chave == chave:
                     return id_pag
 
@@ -76,3 +114,27 @@ class Bucket:
             bucket_atual = bucket_atual.overflow_bucket
 
         return buckets
+
+    def compactar_cadeia(self):
+        """Reagrupa as entradas vivas da cadeia em buckets cheios a partir deste,
+        descartando as lápides. Retorna (lápides descartadas, overflows liberados)"""
+        cadeia = self.get_buckets_na_cadeia()
+        entradas = [e for b in cadeia for e in b.entradas]
+        vivas = [e for e in entradas if e[1] != Bucket.LAPIDE]
+
+        self.entradas = vivas[:self.capacidade]
+        self.overflow_bucket = None
+        self.fim_cadeia = None
+        bucket_atual = self
+        for inicio in range(self.capacidade, len(vivas), self.capacidade):
+            # Reaproveita os buckets da cadeia antiga em vez de alocar novos
+            proximo = cadeia[inicio // self.capacidade]
+            proximo.overflow_bucket = None
+            proximo.nivel_overflow = bucket_atual.nivel_overflow + 1
+            proximo.entradas = vivas[inicio:inicio + self.capacidade]
+            bucket_atual.overflow_bucket = proximo
+            bucket_atual = proximo
+            self.fim_cadeia = proximo
+
+        buckets_usados = max(1, math.ceil(len(vivas) / self.capacidade))
+        return len(entradas) - len(vivas), len(cadeia) - buckets_usados
@@ -0,0 +1,194 @@
+import threading
+from collections import OrderedDict
+
+
+class PoliticaLRU:
+    """Descarta a página usada há mais tempo"""
+
+    def __init__(self, num_frames: int):
+        self.ordem = OrderedDict()
+
+    def acessar(self, id_pagina: int):
+        self.ordem.move_to_end(id_pagina)
+
+    def inserir(self, id_pagina: int):
+        self.ordem[id_pagina] = None
+
+    def remover(self, id_pagina: int):
+        del self.ordem[id_pagina]
+
+    def escolher_vitima(self, fixada):
+        for id_pagina in self.ordem:
+            if not fixada(id_pagina):
+                return id_pagina
+        return None
+
+
+class PoliticaClock:
+    """Aproximação do LRU com bit de referência e ponteiro circular"""
+
+    def __init__(self, num_frames: int):
+        self.frames = []
+        self.referencia = {}
+        self.ponteiro = 0
+
+    def acessar(self, id_pagina: int):
+        self.referencia[id_pagina] = True
+
+    def inserir(self, id_pagina: int):
+        self.frames.append(id_pagina)
+        self.referencia[id_pagina] = True
+
+    def remover(self, id_pagina: int):
+        posicao = self.frames.index(id_pagina)
+        self.frames.pop(posicao)
+        del self.referencia[id_pagina]
+        if posicao < self.ponteiro:
+            self.ponteiro -= 1
+        if self.ponteiro >= len(self.frames):
+            self.ponteiro = 0
+
+    def escolher_vitima(self, fixada):
+        # Duas voltas completas bastam: na primeira os bits de referência são zerados
+        for _ in range(2 * len(self.frames)):
+            id_pagina = self.frames[self.ponteiro]
+            if not fixada(id_pagina):
+                if not self.referencia[id_pagina]:
+                    return id_pagina
+                self.referencia[id_pagina] = False
+            self.ponteiro = (self.ponteiro + 1) % len(self.frames)
+        return None
+
+
+class Politica2Q:
+    """2Q: páginas novas entram numa fila FIFO (A1in); só as que voltam a ser
+    pedidas depois de sair dela (lembradas em A1out) vão para a fila LRU (Am).
+    Assim um table scan não expulsa as páginas quentes do índice.
+    """
+
+    def __init__(self, num_frames: int):
+        self.limite_a1in = max(1, num_frames // 4)
+        self.limite_a1out = max(1, num_frames // 2)
+        self.a1in = OrderedDict()
+        self.a1out = OrderedDict()
+        self.am = OrderedDict()
+
+    def acessar(self, id_pagina: int):
+        if id_pagina in self.am:
+            self.am.move_to_end(id_pagina)
+
+    def inserir(self, id_pagina: int):
+        if id_pagina in self.a1out:
+            del self.a1out[id_pagina]
+            self.am[id_pagina] = None
+        else:
+            self.a1in[id_pagina] = None
+
+    def remover(self, id_pagina: int):
+        if id_pagina in self.a1in:
+            del self.a1in[id_pagina]
+            self.a1out[id_pagina] = None
+            if len(self.a1out) > self.limite_a1out:
+                self.a1out.popitem(last=False)
+        else:
+            del self.am[id_pagina]
+
+    def escolher_vitima(self, fixada):
+        filas = (self.a1in, self.am) if len(self.a1in) > self.limite_a1in else (self.am, self.a1in)
+        for fila in filas:
+            for id_pagina in fila:
+                if not fixada(id_pagina):
+                    return id_pagina
+        return None
+
+
+class BufferPool:
+    """Cache de páginas com número fixo de frames na frente de Table.get_pagina.
+
+    Toda leitura passa por obter(); uma falta chama `ler_pagina(id)` (a leitura
+    real) e, com os frames cheios, descarta uma página não fixada segundo a
+    política escolhida. Um lock protege frames e política, então o pool pode ser
+    compartilhado por várias threads de leitura.
+    """
+
+    POLITICAS = {
+        'lru': PoliticaLRU,
+        'clock': PoliticaClock,
+        '2q': Politica2Q,
+    }
+
+    def __init__(self, num_frames: int, politica: str = 'lru'):
+        if num_frames <= 0:
+            raise ValueError("O buffer pool precisa de pelo menos um frame")
+        if politica not in self.POLITICAS:
+            raise ValueError(f"Política de substituição desconhecida: '{politica}'. "
+                             f"Opções: {', '.join(self.POLITICAS)}")
+        self.num_frames = num_frames
+        self.nome_politica = politica
+        self.politica = self.POLITICAS[politica](num_frames)
+        self.frames = {}
+        self.fixacoes = {}
+        self.acertos = 0
+        self.faltas = 0
+        self.descartes = 0
+        self._trava = threading.Lock()
+
+    def _fixada(self, id_pagina: int) -> bool:
+        return self.fixacoes.get(id_pagina, 0) > 0
+
+    def obter(self, id_pagina: int, ler_pagina, fixar: bool = False):
+        with self._trava:
+            return self._obter(id_pagina, ler_pagina, fixar)
+
+    def _obter(self, id_pagina: int, ler_pagina, fixar: bool):
+        pagina = self.frames.get(id_pagina)
+        if pagina is not None:
+            self.acertos += 1
+            self.politica.acessar(id_pagina)
+        else:
+            self.faltas += 1
+            pagina = ler_pagina(id_pagina)
+            if pagina is None:
+                return None
+
+            if len(self.frames) >= self.num_frames:
+                vitima = self.politica.escolher_vitima(self._fixada)
+                if vitima is None:
+                    raise Exception("Todos os frames do buffer pool estão fixados")
+                self.politica.remover(vitima)
+                del self.frames[vitima]
+                self.descartes += 1
+
+            self.frames[id_pagina] = pagina
+            self.politica.inserir(id_pagina)
+
+        if fixar:
+            self.fixacoes[id_pagina] = self.fixacoes.get(id_pagina, 0) + 1
+        return pagina
+
+    def liberar(self, id_pagina: int):
+        """Desfaz uma fixação feita por obter(..., fixar=True)"""
+        with self._trava:
+            restantes = self.fixacoes.get(id_pagina, 0) - 1
+            if restantes > 0:
+                self.fixacoes[id_pagina] = restantes
+            else:
+                self.fixacoes.pop(id_pagina, None)
+
+    def zerar_contadores(self):
+        self.acertos = 0
+        self.faltas = 0
+        self.descartes = 0
+
+    def obter_estatisticas(self):
+        acessos = self.acertos + self.faltas
+        return {
+            "politica": self.nome_politica,
+            "num_frames": self.num_frames,
+            "frames_ocupados": len(self.frames),
+            "paginas_fixadas": len(self.fixacoes),
+            "acertos": self.acertos,
+            "faltas": self.faltas,
+            "descartes": self.descartes,
+            "taxa_acertos": round(self.acertos / acessos * 100, 2) if acessos else 0
+        }
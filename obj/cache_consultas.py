@@ -0,0 +1,73 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class CacheConsultas:
+    """Cache de resultados de busca com descarte LRU e validade (TTL).
+
+    Quem usa inclui na chave a geração dos dados (incrementada a cada carga,
+    construção de índice ou alteração), então um resultado de uma geração
+    antiga nunca volta a ser encontrado e sai do cache pelo LRU. As operações
+    são protegidas por um lock, para uso pelas threads do servidor.
+    """
+
+    def __init__(self, capacidade: int = 1024, ttl: float | None = 300):
+        if capacidade <= 0:
+            raise ValueError("O cache precisa de capacidade maior que zero")
+        self.capacidade = capacidade
+        self.ttl = ttl
+        self.entradas = OrderedDict()
+        self.acertos = 0
+        self.faltas = 0
+        self.descartes = 0
+        self.expirados = 0
+        self._trava = threading.Lock()
+
+    def obter(self, chave):
+        """Retorna o valor guardado ou None (falta ou entrada expirada)"""
+        with self._trava:
+            return self._obter(chave)
+
+    def _obter(self, chave):
+        entrada = self.entradas.get(chave)
+        if entrada is None:
+            self.faltas += 1
+            return None
+
+        valor, validade = entrada
+        if validade is not None and time.monotonic() > validade:
+            del self.entradas[chave]
+            self.expirados += 1
+            self.faltas += 1
+            return None
+
+        self.entradas.move_to_end(chave)
+        self.acertos += 1
+        return valor
+
+    def guardar(self, chave, valor):
+        validade = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._trava:
+            self.entradas[chave] = (valor, validade)
+            self.entradas.move_to_end(chave)
+            if len(self.entradas) > self.capacidade:
+                self.entradas.popitem(last=False)
+                self.descartes += 1
+
+    def limpar(self):
+        with self._trava:
+            self.entradas.clear()
+
+    def obter_estatisticas(self):
+        acessos = self.acertos + self.faltas
+        return {
+            "capacidade": self.capacidade,
+            "ttl": self.ttl,
+            "entradas": len(self.entradas),
+            "acertos": self.acertos,
+            "faltas": self.faltas,
+            "descartes": self.descartes,
+            "expirados": self.expirados,
+            "taxa_acertos": round(self.acertos / acessos * 100, 2) if acessos else 0
+        }
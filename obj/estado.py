@@ -0,0 +1,76 @@
+import threading
+from contextlib import contextmanager
+
+
+class Estado:
+    """Snapshot imutável do que a API serve: tabela, índices e geração dos dados.
+
+    Quem lê pega a referência uma vez (`atual = estado`) e usa só ela até o fim
+    da requisição; quem escreve monta os objetos novos ao lado e publica um
+    Estado novo com uma única atribuição, que é atômica. Uma construção de
+    índice em andamento nunca fica visível pela metade.
+    """
+    __slots__ = ('tabela', 'indice_hash', 'indice_chave', 'arvore_b', 'geracao')
+
+    def __init__(self, tabela=None, indice_hash=None, indice_chave=None, arvore_b=None, geracao: int = 0):
+        object.__setattr__(self, 'tabela', tabela)
+        object.__setattr__(self, 'indice_hash', indice_hash)
+        object.__setattr__(self, 'indice_chave', indice_chave)
+        object.__setattr__(self, 'arvore_b', arvore_b)
+        object.__setattr__(self, 'geracao', geracao)
+
+    def __setattr__(self, nome, valor):
+        raise AttributeError("Estado é imutável; use com() para criar um novo")
+
+    def com(self, nova_geracao: bool = True, **mudancas):
+        """Cópia com os campos alterados; por padrão incrementa a geração
+        (os resultados em cache da geração anterior deixam de valer)"""
+        campos = {nome: getattr(self, nome) for nome in self.__slots__}
+        campos.update(mudancas)
+        if nova_geracao:
+            campos['geracao'] = self.geracao + 1
+        return Estado(**campos)
+
+
+class TravaLeituraEscrita:
+    """Vários leitores ao mesmo tempo ou um único escritor.
+
+    Protege as alterações feitas no lugar (inserir/remover/atualizar tuplas),
+    que não passam por um snapshot novo. Um escritor esperando bloqueia novos
+    leitores, então escritas não ficam paradas atrás de um fluxo de leituras.
+    """
+
+    def __init__(self):
+        self._condicao = threading.Condition()
+        self._leitores = 0
+        self._escrevendo = False
+        self._escritores_esperando = 0
+
+    @contextmanager
+    def ler(self):
+        with self._condicao:
+            while self._escrevendo or self._escritores_esperando:
+                self._condicao.wait()
+            self._leitores += 1
+        try:
+            yield
+        finally:
+            with self._condicao:
+                self._leitores -= 1
+                if self._leitores == 0:
+                    self._condicao.notify_all()
+
+    @contextmanager
+    def escrever(self):
+        with self._condicao:
+            self._escritores_esperando += 1
+            while self._escrevendo or self._leitores:
+                self._condicao.wait()
+            self._escritores_esperando -= 1
+            self._escrevendo = True
+        try:
+            yield
+        finally:
+            with self._condicao:
+                self._escrevendo = False
+                self._condicao.notify_all()
@@ -0,0 +1,85 @@
+import math
+
+from obj.funcoes_hash import MASCARA_64
+
+# Multiplicador de Fibonacci: espalha os bits da impressão antes de derivar as
+# posições, para que elas não repitam os bits baixos usados no endereço do bucket
+_MISTURA = 0x9E3779B97F4A7C15
+
+
+class FiltroBloom:
+    """Filtro de Bloom sobre as impressões (hash de 64 bits) já calculadas pelo índice.
+
+    As k posições vêm de hashing duplo (h1 + i * h2) sobre a impressão, então
+    consultar o filtro não calcula nenhum hash novo. Um "não" é definitivo; um
+    "talvez" segue para a busca normal no bucket. Remoções não apagam bits: só
+    aumentam a taxa de falsos positivos até a próxima reconstrução.
+
+    O filtro é dimensionado para `capacidade` impressões distintas; `inseridos`
+    conta as adições que ligaram algum bit novo (valores repetidos não contam),
+    e passar da capacidade é o sinal para o índice reconstruí-lo maior.
+    """
+    __slots__ = ('taxa_falso_positivo', 'capacidade', 'num_bits', 'num_funcoes', 'bits', 'inseridos',
+                 'consultas', 'negativos', 'falsos_positivos')
+
+    def __init__(self, capacidade: int, taxa_falso_positivo: float = 0.01):
+        if not 0 < taxa_falso_positivo < 1:
+            raise ValueError("A taxa de falsos positivos deve estar entre 0 e 1")
+        self.taxa_falso_positivo = taxa_falso_positivo
+        self.capacidade = max(1, capacidade)
+        self.num_bits = max(8, math.ceil(-self.capacidade * math.log(taxa_falso_positivo) / math.log(2) ** 2))
+        self.num_funcoes = max(1, round(self.num_bits / self.capacidade * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.inseridos = 0
+        self.consultas = 0
+        self.negativos = 0
+        self.falsos_positivos = 0
+
+    def _posicoes(self, impressao: int):
+        misturado = (impressao * _MISTURA) & MASCARA_64
+        h1 = misturado >> 32
+        h2 = (misturado & 0xFFFFFFFF) | 1
+        for i in range(self.num_funcoes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def adicionar(self, impressao: int):
+        novo = False
+        for posicao in self._posicoes(impressao):
+            if not self.bits[posicao >> 3] & (1 << (posicao & 7)):
+                self.bits[posicao >> 3] |= 1 << (posicao & 7)
+                novo = True
+        if novo:
+            self.inseridos += 1
+
+    def esta_cheio(self) -> bool:
+        return self.inseridos >= self.capacidade
+
+    def taxa_falso_positivo_estimada(self) -> float:
+        """Taxa esperada com os bits ligados hoje: (fração de bits ligados)^k"""
+        ligados = int.from_bytes(self.bits, 'little').bit_count()
+        return (ligados / self.num_bits) ** self.num_funcoes
+
+    def contem(self, impressao: int) -> bool:
+        self.consultas += 1
+        for posicao in self._posicoes(impressao):
+            if not self.bits[posicao >> 3] & (1 << (posicao & 7)):
+                self.negativos += 1
+                return False
+        return True
+
+    def obter_estatisticas(self):
+        # Consultas de valores ausentes conhecidas: descartadas pelo filtro ou falsos positivos
+        ausentes = self.negativos + self.falsos_positivos
+        return {
+            "taxa_falso_positivo_alvo": self.taxa_falso_positivo,
+            "taxa_falso_positivo_estimada": round(self.taxa_falso_positivo_estimada(), 6),
+            "capacidade": self.capacidade,
+            "inseridos": self.inseridos,
+            "num_bits": self.num_bits,
+            "num_funcoes": self.num_funcoes,
+            "bytes": len(self.bits),
+            "consultas": self.consultas,
+            "negativos": self.negativos,
+            "falsos_positivos": self.falsos_positivos,
+            "taxa_falso_positivo_observada": round(self.falsos_positivos / ausentes, 6) if ausentes else 0
+        }
@@ -0,0 +1,164 @@
+"""Funções hash de 64 bits usadas pelos índices.
+
+Todas recebem os bytes da chave (UTF-8) e devolvem um inteiro sem sinal de
+64 bits; o índice aplica o módulo pelo número de buckets.
+"""
+
+MASCARA_64 = 0xFFFFFFFFFFFFFFFF
+
+
+def _rotl(x: int, r: int) -> int:
+    return ((x << r) | (x >> (64 - r))) & MASCARA_64
+
+
+def djb2(dados: bytes) -> int:
+    """DJB2 (Bernstein): h = h * 33 + c"""
+    h = 5381
+    for c in dados:
+        h = ((h << 5) + h + c) & MASCARA_64
+    return h
+
+
+FNV_OFFSET = 0xCBF29CE484222325
+FNV_PRIMO = 0x100000001B3
+
+
+def fnv1a(dados: bytes) -> int:
+    """FNV-1a 64 bits: xor do byte seguido de multiplicação pelo primo FNV"""
+    h = FNV_OFFSET
+    for c in dados:
+        h = ((h ^ c) * FNV_PRIMO) & MASCARA_64
+    return h
+
+
+XXH_P1 = 0x9E3779B185EBCA87
+XXH_P2 = 0xC2B2AE3D27D4EB4F
+XXH_P3 = 0x165667B19E3779F9
+XXH_P4 = 0x85EBCA77C2B2AE63
+XXH_P5 = 0x27D4EB2F165667C5
+
+
+def _xxh_round(acc: int, entrada: int) -> int:
+    acc = (acc + entrada * XXH_P2) & MASCARA_64
+    acc = _rotl(acc, 31)
+    return (acc * XXH_P1) & MASCARA_64
+
+
+def _xxh_merge(acc: int, val: int) -> int:
+    acc ^= _xxh_round(0, val)
+    return (acc * XXH_P1 + XXH_P4) & MASCARA_64
+
+
+def xxhash64(dados: bytes, semente: int = 0) -> int:
+    """XXH64 (xxHash de 64 bits) em Python puro"""
+    n = len(dados)
+    p = 0
+
+    if n >= 32:
+        v1 = (semente + XXH_P1 + XXH_P2) & MASCARA_64
+        v2 = (semente + XXH_P2) & MASCARA_64
+        v3 = semente
+        v4 = (semente - XXH_P1) & MASCARA_64
+        while p + 32 <= n:
+            v1 = _xxh_round(v1, int.from_bytes(dados[p:p + 8], 'little'))
+            v2 = _xxh_round(v2, int.from_bytes(dados[p + 8:p + 16], 'little'))
+            v3 = _xxh_round(v3, int.from_bytes(dados[p + 16:p + 24], 'little'))
+            v4 = _xxh_round(v4, int.from_bytes(dados[p + 24:p + 32], 'little'))
+            p += 32
+        h = (_rotl(v1, 1) + _rotl(v2, 7) + _rotl(v3, 12) + _rotl(v4, 18)) & MASCARA_64
+        h = _xxh_merge(h, v1)
+        h = _xxh_merge(h, v2)
+        h = _xxh_merge(h, v3)
+        h = _xxh_merge(h, v4)
+    else:
+        h = (semente + XXH_P5) & MASCARA_64
+
+    h = (h + n) & MASCARA_64
+
+    while p + 8 <= n:
+        k = _xxh_round(0, int.from_bytes(dados[p:p + 8], 'little'))
+        h ^= k
+        h = (_rotl(h, 27) * XXH_P1 + XXH_P4) & MASCARA_64
+        p += 8
+
+    if p + 4 <= n:
+        h ^= (int.from_bytes(dados[p:p + 4], 'little') * XXH_P1) & MASCARA_64
+        h = (_rotl(h, 23) * XXH_P2 + XXH_P3) & MASCARA_64
+        p += 4
+
+    while p < n:
+        h ^= (dados[p] * XXH_P5) & MASCARA_64
+        h = (_rotl(h, 11) * XXH_P1) & MASCARA_64
+        p += 1
+
+    # Avalanche final
+    h ^= h >> 33
+    h = (h * XXH_P2) & MASCARA_64
+    h ^= h >> 29
+    h = (h * XXH_P3) & MASCARA_64
+    h ^= h >> 32
+    return h
+
+
+# Chave fixa de 128 bits para a SipHash (k0, k1)
+SIPHASH_CHAVE = (0x0706050403020100, 0x0F0E0D0C0B0A0908)
+
+
+def siphash24(dados: bytes, chave=SIPHASH_CHAVE) -> int:
+    """SipHash-2-4 - resistente a ataques de inundação de colisões"""
+    k0, k1 = chave
+    v0 = k0 ^ 0x736F6D6570736575
+    v1 = k1 ^ 0x646F72616E646F6D
+    v2 = k0 ^ 0x6C7967656E657261
+    v3 = k1 ^ 0x7465646279746573
+
+    def sipround(v0, v1, v2, v3):
+        v0 = (v0 + v1) & MASCARA_64
+        v1 = _rotl(v1, 13) ^ v0
+        v0 = _rotl(v0, 32)
+        v2 = (v2 + v3) & MASCARA_64
+        v3 = _rotl(v3, 16) ^ v2
+        v0 = (v0 + v3) & MASCARA_64
+        v3 = _rotl(v3, 21) ^ v0
+        v2 = (v2 + v1) & MASCARA_64
+        v1 = _rotl(v1, 17) ^ v2
+        v2 = _rotl(v2, 32)
+        return v0, v1, v2, v3
+
+    n = len(dados)
+    fim = n - (n % 8)
+    for p in range(0, fim, 8):
+        m = int.from_bytes(dados[p:p + 8], 'little')
+        v3 ^= m
+        v0, v1, v2, v3 = sipround(v0, v1, v2, v3)
+        v0, v1, v2, v3 = sipround(v0, v1, v2, v3)
+        v0 ^= m
+
+    # Último bloco: bytes restantes com o tamanho no byte mais significativo
+    b = ((n & 0xFF) << 56) | int.from_bytes(dados[fim:], 'little')
+    v3 ^= b
+    v0, v1, v2, v3 = sipround(v0, v1, v2, v3)
+    v0, v1, v2, v3 = sipround(v0, v1, v2, v3)
+    v0 ^= b
+
+    v2 ^= 0xFF
+    for _ in range(4):
+        v0, v1, v2, v3 = sipround(v0, v1, v2, v3)
+    return v0 ^ v1 ^ v2 ^ v3
+
+
+FUNCOES_HASH = {
+    'djb2': djb2,
+    'fnv1a': fnv1a,
+    'xxhash': xxhash64,
+    'siphash': siphash24,
+}
+
+
+def obter_funcao_hash(nome: str):
+    """Retorna a função hash registrada com o nome informado"""
+    try:
+        return FUNCOES_HASH[nome]
+    except KeyError:
+        raise ValueError(f"Função hash desconhecida: '{nome}'. "
+                         f"Opções: {', '.join(FUNCOES_HASH)}")
@@ -1,118 +1,496 @@
 import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from obj.armazenamento import BucketsEmDisco, ler_cabecalho_indice, salvar_buckets
 from obj.bucket import Bucket
+from obj.filtro_bloom import FiltroBloom
+from obj.funcoes_hash import FUNCOES_HASH, obter_funcao_hash
+from obj.metricas import (BUSCAS, DURACAO_FASE, ENTRADAS_PERCORRIDAS, LATENCIA_BUSCA, METRICAS,
+                          SALTOS_OVERFLOW)
+from obj.hash_vetorizado import NUMPY_DISPONIVEL, agrupar_por_bucket, estatisticas_distribuicao, hashes_da_tabela
 from obj.table import Table
 
 
+def _hash_particao(nome_funcao: str, paginas, nb: int = 0):
+    """Executada em um processo filho: calcula o hash de cada tupla das páginas.
+
+    Com nb > 0 já devolve as listas parciais por bucket ({indice: [entradas]});
+    sem nb devolve a lista de entradas (chave, id_pag, impressao) na ordem da tabela.
+    """
+    funcao = obter_funcao_hash(nome_funcao)
+    entradas = []
+    for pagina in paginas:
+        id_pag = pagina.id
+        for chave, visao in zip(pagina.chaves, pagina.get_visoes()):
+            entradas.append((chave, id_pag, funcao(visao)))
+
+    if not nb:
+        return entradas
+
+    por_bucket = {}
+    for entrada in entradas:
+        por_bucket.setdefault(entrada[2] % nb, []).append(entrada)
+    return por_bucket
+
+
 class Hash:
-    def __init__(self, fr: int):
+    METODOS_COLISAO = ('overflow', 'linear_probing', 'quadratic_probing', 'robin_hood')
+    INTERVALO_PROGRESSO = 10000  # Entradas entre dois avisos de progresso nos índices dinâmicos
+
+    def __init__(self, fr: int, funcao: str = 'djb2', num_buckets: int | None = None):
         self.fr = fr
+        self.num_buckets = num_buckets  # Fixa NB em construir (ex.: sugerido pelo AjustadorFR); nulo usa NR/FR
+        self.nome_funcao = funcao
+        self._funcao = obter_funcao_hash(funcao)
         self.nr = 0
         self.nb = 0
         self.buckets = []
         self.total_colisoes = 0
         self.total_overflows = 0
+        self.total_lapides = 0
+        self.taxa_filtro = None
+        self.filtro = None
+        self.progresso = None  # Callback opcional progresso(fase, feitos, total) chamado em construir
+        self._fase_atual = None
+        self._inicio_fase = 0.0
+
+    @staticmethod
+    def criar(fr: int, metodo_colisao: str = 'overflow', funcao: str = 'djb2'):
+        """Cria o índice para o método de colisão: buckets de overflow ou endereçamento aberto"""
+        if metodo_colisao in ('overflow', 'overflow_buckets'):
+            return Hash(fr, funcao)
+
+        from obj.hash_aberto import HashAberto
+        return HashAberto(fr, funcao, metodo_colisao=metodo_colisao)
+
+    @staticmethod
+    def testar_metodos_colisao(tabela: Table, fr: int, funcao: str = 'djb2'):
+        """Constrói um índice por método de colisão e retorna as estatísticas de cada um"""
+        resultados = {}
+        for metodo in Hash.METODOS_COLISAO:
+            indice = Hash.criar(fr, metodo, funcao)
+            indice.construir(tabela)
+            resultados[metodo] = indice.obter_estatisticas()
+        return resultados
+
+    def _relatar_progresso(self, fase: str, feitos: int = 0, total: int = 0):
+        """Repassa o andamento ao callback e mede a duração de cada fase de construir"""
+        if fase != self._fase_atual:
+            agora = time.perf_counter()
+            if self._fase_atual is not None:
+                duracao = agora - self._inicio_fase
+                DURACAO_FASE.observar(duracao, tipo=type(self).__name__, fase=self._fase_atual)
+                METRICAS.perfilar("fase", tipo=type(self).__name__, fase=self._fase_atual, duracao=duracao)
+            self._fase_atual = None if fase == "Índice construído" else fase
+            self._inicio_fase = agora
+        if self.progresso is not None:
+            self.progresso(fase, feitos, total)
+
+    def usar_filtro_bloom(self, taxa_falso_positivo: float | None = 0.01):
+        """Ativa (ou desativa, com None) o filtro de Bloom montado em construir"""
+        if taxa_falso_positivo is not None and not 0 < taxa_falso_positivo < 1:
+            raise ValueError("A taxa de falsos positivos deve estar entre 0 e 1")
+        self.taxa_filtro = taxa_falso_positivo
+
+    def _impressoes_indexadas(self):
+        for bucket in self.obter_buckets():
+            bucket_atual = bucket
+            while bucket_atual:
+                for _, id_pag, impressao in bucket_atual.entradas:
+                    if id_pag != Bucket.LAPIDE:
+                        yield impressao
+                bucket_atual = bucket_atual.overflow_bucket
+
+    def _montar_filtro(self, capacidade: int | None = None):
+        """(Re)constrói o filtro a partir das entradas vivas, mantendo os contadores"""
+        if self.taxa_filtro is None:
+            self.filtro = None
+            return
 
-    def funcao_hash(self, valor_str: str) -> int:
-        """Função hash DJB2 - distribuição otimizada"""
-        return 0
-        hash_valor = 5381
-        for c in valor_str:
-            hash_valor = ((hash_valor << 5) + hash_valor) + ord(c)
-        return hash_valor % self.nb
+        anterior = self.filtro
+        self.filtro = FiltroBloom(self.nr if capacidade is None else capacidade, self.taxa_filtro)
+        for impressao in self._impressoes_indexadas():
+            self.filtro.adicionar(impressao)
+        if anterior is not None:
+            self.filtro.consultas = anterior.consultas
+            self.filtro.negativos = anterior.negativos
+            self.filtro.falsos_positivos = anterior.falsos_positivos
+
+    def _adicionar_ao_filtro(self, impressao: int):
+        """Adiciona a impressão ao filtro; se ele já recebeu tantas impressões quanto
+        foi dimensionado, reconstrói com o dobro da capacidade antes, para que a taxa
+        de falsos positivos não passe do alvo conforme o índice cresce"""
+        if self.filtro is None:
+            return
+        if self.filtro.esta_cheio():
+            self._montar_filtro(2 * max(self.nr, self.filtro.capacidade))
+        self.filtro.adicionar(impressao)
 
-    def construir(self, tabela: Table):
-        dados_tabela = tabela.get_info_indice()
-        self.nr = len(dados_tabela)
+    def _descartado_pelo_filtro(self, impressao: int) -> bool:
+        """True quando o filtro garante que o valor não está no índice"""
+        return self.filtro is not None and not self.filtro.contem(impressao)
+
+    def _registrar_falso_positivo(self):
+        if self.filtro is not None:
+            self.filtro.falsos_positivos += 1
+
+    def hash_completo(self, valor_str: str) -> int:
+        """Hash de 64 bits do valor; guardado nas entradas como impressão digital"""
+        return self._funcao(valor_str.encode('utf-8'))
+
+    def endereco(self, impressao: int) -> int:
+        """Converte o hash completo no endereço do bucket"""
+        return impressao % self.nb
+
+    def funcao_hash(self, valor_str: str) -> int:
+        """Mapeia o valor para o endereço do bucket usando a função configurada"""
+        return self.endereco(self.hash_completo(valor_str))
+
+    def _executar_particoes(self, tabela: Table, processos: int, nb: int = 0):
+        """Divide as páginas da tabela em `processos` partições contíguas e
+        calcula os hashes de cada uma em um processo separado"""
+        total_paginas = tabela.get_total_pag()
+        tamanho = math.ceil(total_paginas / processos)
+        particoes = [[tabela.paginas[i] for i in range(inicio, min(inicio + tamanho, total_paginas))]
+                     for inicio in range(0, total_paginas, tamanho)]
+
+        with ProcessPoolExecutor(max_workers=processos) as executor:
+            futuros = [executor.submit(_hash_particao, self.nome_funcao, particao, nb)
+                       for particao in particoes]
+            return [futuro.result() for futuro in futuros]
+
+    def calcular_entradas(self, tabela: Table, processos: int = 1):
+        """Lista (chave, id_pag, impressao) de todas as tuplas, na ordem da tabela"""
+        if processos > 1 and tabela.get_total_pag() > 1:
+            return [e for parcial in self._executar_particoes(tabela, processos) for e in parcial]
+        if NUMPY_DISPONIVEL:
+            chaves, ids_pagina, impressoes = hashes_da_tabela(self.nome_funcao, tabela)
+            return list(zip(chaves.tolist(), ids_pagina.tolist(), impressoes.tolist()))
+        return [(chave_id, id_pag, self._funcao(visao))
+                for chave_id, visao, id_pag in tabela.get_info_binaria()]
+
+    def construir(self, tabela: Table, processos: int = 1):
+        """Constrói o índice; com processos > 1 os hashes são calculados em paralelo,
+        uma partição de páginas por processo, e as listas parciais são unidas em ordem"""
+        self.nr = tabela.get_total_tuplas()
 
         if self.nr == 0 or self.fr <= 0:
             print("Não é possível construir o índice: sem dados ou FR inválido.")
             return
 
-        self.nb = math.ceil(self.nr / self.fr)
+        self.nb = self.num_buckets or math.ceil(self.nr / self.fr)
         self.buckets = [Bucket(self.fr) for _ in range(self.nb)]
 
         # Resetar contadores
         self.total_colisoes = 0
         self.total_overflows = 0
+        self.total_lapides = 0
 
-        print(f"Construindo índice com {self.nr} registros, {self.nb} buckets, FR={self.fr}")
-        print("ATENÇÃO: Função hash retorna sempre 0 - usando inserção em lotes para otimizar!")
+        print(f"Construindo índice com {self.nr} registros, {self.nb} buckets, FR={self.fr}, "
+              f"função {self.nome_funcao}")
 
         # OTIMIZAÇÃO 1: Agrupar dados por bucket antes de inserir
         dados_por_bucket = {}
-        print("Agrupando dados por bucket...")
 
-        for chave_id, valor_str, id_pag in dados_tabela:
-            indice = self.funcao_hash(valor_str)
-            if indice not in dados_por_bucket:
-                dados_por_bucket[indice] = []
-            dados_por_bucket[indice].append((chave_id, id_pag))
+        if processos > 1 and tabela.get_total_pag() > 1:
+            print(f"Agrupando dados por bucket em {processos} processos...")
+            self._relatar_progresso("Agrupando dados por bucket")
+            for parcial in self._executar_particoes(tabela, processos, self.nb):
+                for indice, entradas in parcial.items():
+                    if indice not in dados_por_bucket:
+                        dados_por_bucket[indice] = entradas
+                    else:
+                        dados_por_bucket[indice].extend(entradas)
+        elif NUMPY_DISPONIVEL:
+            # Hash de todos os valores de uma vez e agrupamento por ordenação de contagem
+            print("Agrupando dados por bucket (NumPy)...")
+            self._relatar_progresso("Agrupando dados por bucket")
+            chaves, ids_pagina, impressoes = hashes_da_tabela(self.nome_funcao, tabela)
+            ordem, contagens = agrupar_por_bucket(impressoes, self.nb)
+            entradas = list(zip(chaves[ordem].tolist(), ids_pagina[ordem].tolist(),
+                                impressoes[ordem].tolist()))
+            inicio = 0
+            for indice, quantidade in enumerate(contagens.tolist()):
+                if quantidade:
+                    dados_por_bucket[indice] = entradas[inicio:inicio + quantidade]
+                    inicio += quantidade
+        else:
+            print("Agrupando dados por bucket...")
+            self._relatar_progresso("Agrupando dados por bucket")
+            for chave_id, visao, id_pag in tabela.get_info_binaria():
+                impressao = self._funcao(visao)
+                indice = self.endereco(impressao)
+                if indice not in dados_por_bucket:
+                    dados_por_bucket[indice] = []
+                dados_por_bucket[indice].append((chave_id, id_pag, impressao))
 
         # OTIMIZAÇÃO 2: Inserir em lotes por bucket
-        for indice, lista_entradas in dados_por_bucket.items():
+        print(f"Inserindo entradas em {len(dados_por_bucket)} buckets...")
+        for posicao, (indice, lista_entradas) in enumerate(dados_por_bucket.items()):
             bucket_alvo = self.buckets[indice]
             total_entradas_bucket = len(lista_entradas)
 
-            print(f"Inserindo {total_entradas_bucket} entradas no bucket {indice}...")
+            if posicao % self.INTERVALO_PROGRESSO == 0:
+                self._relatar_progresso("Inserindo entradas nos buckets", posicao, len(dados_por_bucket))
 
             # Contar colisões (todas exceto a primeira são colisões)
             if total_entradas_bucket > 1:
                 self.total_colisoes += total_entradas_bucket - 1
 
-            # OTIMIZAÇÃO 3: Inserção sequencial eficiente
-            bucket_atual = bucket_alvo
-            entradas_processadas = 0
+            # OTIMIZAÇÃO 3: Preencher a cadeia em fatias de FR entradas
+            bucket_alvo.preencher(lista_entradas)
+            self.total_overflows += (total_entradas_bucket - 1) // self.fr
 
-            for chave_id, id_pag in lista_entradas:
-                # Se bucket atual está cheio, criar próximo overflow
-                while bucket_atual.esta_cheio():
-                    if bucket_atual.overflow_bucket is None:
-                        bucket_atual.overflow_bucket = Bucket(self.fr)
-                        bucket_atual.overflow_bucket.nivel_overflow = bucket_atual.nivel_overflow + 1
+        self._montar_filtro()
+        self._relatar_progresso("Índice construído", self.nr, self.nr)
+        print(f"Índice construído: {self.total_colisoes} colisões, {self.total_overflows} overflows")
 
-                    bucket_atual = bucket_atual.overflow_bucket
-                    self.total_overflows += 1
+    def buscar(self, valor_busca: str, tabela: Table):
+        inicio = time.perf_counter()
+        tupla, custo, id_pag, entradas, saltos = self._buscar(valor_busca, tabela)
+        self._registrar_busca(time.perf_counter() - inicio, tupla is not None, custo, entradas, saltos)
+        return tupla, custo, id_pag
+
+    def _registrar_busca(self, duracao: float, encontrou: bool, custo: int, entradas: int, saltos: int):
+        tipo = type(self).__name__
+        BUSCAS.inc(tipo=tipo, resultado="encontrado" if encontrou else "ausente")
+        LATENCIA_BUSCA.observar(duracao, tipo=tipo)
+        ENTRADAS_PERCORRIDAS.observar(entradas, tipo=tipo)
+        if saltos:
+            SALTOS_OVERFLOW.inc(saltos, tipo=tipo)
+        if METRICAS.gancho is not None:
+            METRICAS.perfilar("busca", tipo=tipo, duracao=duracao, encontrou=encontrou, custo=custo,
+                              entradas=entradas, saltos=saltos)
+
+    def _buscar(self, valor_busca: str, tabela: Table):
+        """Busca de fato; retorna (tupla, custo, id_pag, entradas examinadas, saltos de overflow)"""
+        if not self.buckets:
+            return None, 0, None, 0, 0
 
-                # Adicionar entrada ao bucket atual
-                bucket_atual.entradas.append((chave_id, id_pag))
-                entradas_processadas += 1
+        impressao_busca = self.hash_completo(valor_busca)
+        if self._descartado_pelo_filtro(impressao_busca):
+            return None, 0, None, 0, 0
 
-                # Log de progresso para buckets com muitos dados
-                if total_entradas_bucket > 1000 and entradas_processadas % 1000 == 0:
-                    print(f"  Processadas {entradas_processadas}/{total_entradas_bucket} entradas...")
+        indice = self.endereco(impressao_busca)
+        paginas_visitadas = set()
+        custo = 0
+        entradas = 0
+        saltos = 0
 
-        print(f"Índice construído: {self.total_colisoes} colisões, {self.total_overflows} overflows")
+        # Percorre a cadeia do bucket descartando entradas cuja impressão não
+        # bate com a do valor buscado; só as restantes custam leitura de página
+        bucket_atual = self.buckets[indice]
+        while bucket_atual:
+            for chave, id_pag, impressao in bucket_atual.entradas:
+                entradas += 1
+                if impressao != impressao_busca or id_pag == Bucket.LAPIDE or id_pag in paginas_visitadas:
+                    continue
+                paginas_visitadas.add(id_pag)
+
+                pagina = tabela.get_pagina(id_pag)
+                if pagina is None:
+                    continue
+                custo += 1
+                tupla = pagina.buscar_valor(valor_busca)
+                if tupla is not None:
+                    return tupla, custo, id_pag, entradas, saltos
+            bucket_atual = bucket_atual.overflow_bucket
+            saltos += bucket_atual is not None
 
-        # Debug info para bucket 0 (onde provavelmente todos os dados estão)
-        bucket_0 = self.buckets[0]
-        total_entradas_bucket_0 = bucket_0.get_total_entradas()
-        max_nivel = bucket_0.get_max_nivel_overflow()
-        print(f"Bucket 0: {total_entradas_bucket_0} entradas totais, nível máximo overflow: {max_nivel}")
+        self._registrar_falso_positivo()
+        return None, custo, None, entradas, saltos
 
-    def buscar(self, valor_busca: str, tabela: Table):
-        if not self.buckets:
-            return None, 0, None
+    def _paginas_do_valor(self, impressao_busca: int):
+        """Gera as páginas (sem repetir) das entradas da cadeia com a impressão dada"""
+        paginas_visitadas = set()
+        bucket_atual = self.buckets[self.endereco(impressao_busca)]
+        while bucket_atual:
+            for _, id_pag, impressao in bucket_atual.entradas:
+                if impressao == impressao_busca and id_pag != Bucket.LAPIDE and id_pag not in paginas_visitadas:
+                    paginas_visitadas.add(id_pag)
+                    yield id_pag
+            bucket_atual = bucket_atual.overflow_bucket
 
-        indice = self.funcao_hash(valor_busca)
-        paginas_a_visitar = set()
+    def buscar_todos(self, valor_busca: str, tabela: Table):
+        """Gera (tupla, id_pag, custo) para cada ocorrência do valor.
+
+        Percorre só a cadeia do bucket do valor e lê cada página candidata uma
+        vez; `custo` é o número de páginas lidas até aquela ocorrência. Por ser
+        um gerador, quem consome pode parar no meio sem ler o resto da cadeia.
+        """
+        if self.nr == 0:
+            return
+
+        impressao_busca = self.hash_completo(valor_busca)
+        if self._descartado_pelo_filtro(impressao_busca):
+            return
+
+        custo = 0
+        encontrou = False
+        for id_pag in self._paginas_do_valor(impressao_busca):
+            # A página fica fixada enquanto o gerador está parado no meio dela
+            pagina = tabela.fixar_pagina(id_pag)
+            if pagina is None:
+                continue
+            custo += 1
+            try:
+                for tupla in pagina.buscar_todos(valor_busca):
+                    encontrou = True
+                    yield tupla, id_pag, custo
+            finally:
+                tabela.liberar_pagina(id_pag)
+        if not encontrou:
+            self._registrar_falso_positivo()
+
+    def _preparar_alteracao(self):
+        if isinstance(self.buckets, BucketsEmDisco):
+            raise Exception("Índice aberto do disco é somente leitura")
+        if self.nb == 0:
+            raise Exception("Índice não construído")
+
+    def inserir(self, chave: int, valor_str: str, id_pag: int):
+        """Insere uma entrada no bucket do valor (ou na sua cadeia de overflow)"""
+        self._preparar_alteracao()
+        impressao = self.hash_completo(valor_str)
+        bucket = self.buckets[self.endereco(impressao)]
+        self._adicionar_ao_filtro(impressao)
+
+        # Antes de alongar uma cadeia cheia, recupera o espaço das lápides dela
+        if bucket.get_total_entradas() >= bucket.capacidade * len(bucket.get_buckets_na_cadeia()):
+            self._compactar_cadeia(bucket)
+
+        tamanho_cadeia = len(bucket.get_buckets_na_cadeia())
+        if bucket.get_total_entradas() > 0:
+            self.total_colisoes += 1
+        bucket.adicionar(chave, id_pag, impressao)
+        if len(bucket.get_buckets_na_cadeia()) > tamanho_cadeia:
+            self.total_overflows += 1
+        self.nr += 1
+
+    def remover(self, chave: int, valor_str: str) -> bool:
+        """Marca a entrada como lápide. A própria cadeia é compactada assim que
+        as lápides dela ocupariam um bucket inteiro, e o índice todo quando
+        passam da metade dos registros"""
+        self._preparar_alteracao()
+        impressao = self.hash_completo(valor_str)
+        bucket = self.buckets[self.endereco(impressao)]
+        bucket_atual = bucket
 
-        # Busca no bucket original e seus overflows
-        bucket_atual = self.buckets[indice]
         while bucket_atual:
-            for _, id_pag in bucket_atual.entradas:
-                paginas_a_visitar.add(id_pag)
+            for i, (chave_entrada, id_pag, impressao_entrada) in enumerate(bucket_atual.entradas):
+                if chave_entrada == chave and impressao_entrada == impressao and id_pag != Bucket.LAPIDE:
+                    bucket_atual.entradas[i] = (chave, Bucket.LAPIDE, impressao)
+                    self.nr -= 1
+                    self.total_lapides += 1
+                    if self.total_lapides > max(self.fr, self.nr // 2):
+                        self.compactar()
+                    elif bucket.overflow_bucket is not None and self._cadeia_esparsa(bucket):
+                        self._compactar_cadeia(bucket)
+                    return True
             bucket_atual = bucket_atual.overflow_bucket
+        return False
+
+    def atualizar(self, chave: int, valor_antigo: str, valor_novo: str, id_pag: int) -> bool:
+        """Troca o valor indexado de uma tupla: remove a entrada antiga e insere a nova"""
+        if not self.remover(chave, valor_antigo):
+            return False
+        self.inserir(chave, valor_novo, id_pag)
+        return True
+
+    def compactar(self, apenas_esparsas: bool = False):
+        """Descarta as lápides e reagrupa cada cadeia em buckets cheios,
+        liberando os buckets de overflow que ficaram sobrando.
+
+        Com apenas_esparsas=True só as cadeias com buckets a liberar são
+        reescritas: é a passada incremental, barata o bastante para rodar
+        com o índice em uso. Retorna quantos buckets de overflow foram liberados.
+        """
+        self._preparar_alteracao()
+        liberados = 0
+        for bucket in self.obter_buckets():
+            if apenas_esparsas and not self._cadeia_esparsa(bucket):
+                continue
+            liberados += self._compactar_cadeia(bucket)
+
+        if not apenas_esparsas:
+            self.total_lapides = 0
+            self.total_overflows = self._contar_overflows()
+            self._montar_filtro()
+        return liberados
+
+    def _cadeia_esparsa(self, bucket: Bucket) -> bool:
+        """A cadeia usa mais buckets do que as entradas vivas precisam"""
+        cadeia = bucket.get_buckets_na_cadeia()
+        if len(cadeia) == 1:
+            return False
+        vivas = sum(1 for b in cadeia for e in b.entradas if e[1] != Bucket.LAPIDE)
+        return len(cadeia) > max(1, math.ceil(vivas / self.fr))
+
+    def _compactar_cadeia(self, bucket: Bucket) -> int:
+        overflows_antes = self._overflows_da_cadeia(bucket)
+        lapides, liberados = bucket.compactar_cadeia()
+        self.total_lapides -= lapides
+        self.total_overflows += self._overflows_da_cadeia(bucket) - overflows_antes
+        return liberados
+
+    def _overflows_da_cadeia(self, bucket: Bucket) -> int:
+        """Número de buckets de overflow da cadeia, como contado em construir"""
+        return len(bucket.get_buckets_na_cadeia()) - 1
+
+    def _contar_overflows(self):
+        return sum(self._overflows_da_cadeia(b) for b in self.obter_buckets())
+
+    def _paginas_candidatas(self, valores):
+        """Agrupa os valores por bucket e percorre cada cadeia uma única vez,
+        retornando {id_pag: {valores cuja impressão aparece na página}}"""
+        por_bucket = {}
+        for valor in valores:
+            impressao = self.hash_completo(valor)
+            por_bucket.setdefault(self.endereco(impressao), {}).setdefault(impressao, []).append(valor)
+
+        paginas = {}
+        for indice, por_impressao in por_bucket.items():
+            bucket_atual = self.buckets[indice]
+            while bucket_atual:
+                for chave, id_pag, impressao in bucket_atual.entradas:
+                    candidatos = por_impressao.get(impressao)
+                    if candidatos and id_pag != Bucket.LAPIDE:
+                        paginas.setdefault(id_pag, set()).update(candidatos)
+                bucket_atual = bucket_atual.overflow_bucket
+        return paginas
+
+    def buscar_lote(self, valores, tabela: Table):
+        """Busca vários valores lendo cada página candidata no máximo uma vez.
+
+        Retorna ({valor: (tupla, id_pag)}, custo); valores não encontrados
+        ficam com (None, None).
+        """
+        resultados = {valor: (None, None) for valor in valores}
+        if self.nr == 0 or not resultados:
+            return resultados, 0
+
+        pendentes = {valor for valor in resultados
+                     if not self._descartado_pelo_filtro(self.hash_completo(valor))}
+        custo = 0
+        for id_pag, candidatos in sorted(self._paginas_candidatas(pendentes).items()):
+            candidatos &= pendentes
+            if not candidatos:
+                continue
 
-        # Buscar nas páginas coletadas
-        custo = len(paginas_a_visitar)
-        for id_pag in paginas_a_visitar:
             pagina = tabela.get_pagina(id_pag)
-            if pagina:
-                for tupla in pagina.get_tuplas():
-                    if tupla.valor == valor_busca:
-                        return tupla, custo, id_pag
-
-        return None, custo, None
+            if pagina is None:
+                continue
+            custo += 1
+            for valor in candidatos:
+                tupla = pagina.buscar_valor(valor)
+                if tupla is not None:
+                    resultados[valor] = (tupla, id_pag)
+                    pendentes.discard(valor)
+
+        for _ in pendentes:
+            self._registrar_falso_positivo()
+        return resultados, custo
 
     def analisar_distribuicao(self):
         """Analisa a distribuição dos buckets"""
@@ -123,15 +501,26 @@ class Hash:
             'buckets_com_overflow': 0,
             'max_entradas_bucket': 0,
             'min_entradas_bucket': float('inf'),
-            'media_entradas': 0
+            'media_entradas': 0,
+            'max_buckets_cadeia': 0,
+            'buckets_por_busca': 0
         }
 
         total_entradas = 0
+        # Buckets da cadeia ponderados pelas entradas: as buscas seguem a distribuição dos dados
+        entradas_na_cadeia = 0
+        buckets_ponderados = 0
 
-        for bucket in self.buckets:
+        for bucket in self.obter_buckets():
             num_entradas = len(bucket.entradas)
             total_entradas += num_entradas
 
+            cadeia = bucket.get_buckets_na_cadeia()
+            entradas_cadeia = sum(len(b.entradas) for b in cadeia)
+            entradas_na_cadeia += entradas_cadeia
+            buckets_ponderados += entradas_cadeia * len(cadeia)
+            distribuicao['max_buckets_cadeia'] = max(distribuicao['max_buckets_cadeia'], len(cadeia))
+
             if num_entradas == 0:
                 distribuicao['buckets_vazios'] += 1
             elif num_entradas < self.fr:
@@ -148,6 +537,8 @@ class Hash:
 
         if total_entradas > 0:
             distribuicao['media_entradas'] = total_entradas / self.nb
+        if entradas_na_cadeia > 0:
+            distribuicao['buckets_por_busca'] = round(buckets_ponderados / entradas_na_cadeia, 3)
 
         if distribuicao['min_entradas_bucket'] == float('inf'):
             distribuicao['min_entradas_bucket'] = 0
@@ -180,39 +571,50 @@ class Hash:
             "total_overflows": self.total_overflows,
             "taxa_overflows": round(taxa_overflow, 2),
             "fator_carga": round(fator_carga, 2),
+            "total_lapides": self.total_lapides,
+            "funcao_hash": self.nome_funcao,
+            "tipo_indice": "estatico",
+            "filtro_bloom": self.filtro.obter_estatisticas() if self.filtro is not None else None,
             "distribuicao": distribuicao
         }
 
     def comparar_funcoes_hash(self, tabela: Table):
-        """Analisa a distribuição da função hash atual"""
-        dados_tabela = tabela.get_info_indice()
-
-        if not dados_tabela:
+        """Compara a distribuição de todas as funções hash disponíveis"""
+        if NUMPY_DISPONIVEL:
+            if tabela.get_total_tuplas() == 0:
+                return None
+            if self.nb == 0:
+                self.nr = tabela.get_total_tuplas()
+                self.nb = math.ceil(self.nr / self.fr)
+            return {nome: estatisticas_distribuicao(hashes_da_tabela(nome, tabela)[2], self.nb)
+                    for nome in FUNCOES_HASH}
+
+        if tabela.get_total_tuplas() == 0:
             return None
 
         # Garantir que nb está definido para a função hash
         if self.nb == 0:
-            self.nr = len(dados_tabela)
+            self.nr = tabela.get_total_tuplas()
             self.nb = math.ceil(self.nr / self.fr)
 
-        # Analisar apenas a função hash atual (DJB2)
-        distribuicao = {}
-        for _, valor_str, _ in dados_tabela:
-            indice = self.funcao_hash(valor_str)
-            distribuicao[indice] = distribuicao.get(indice, 0) + 1
+        # Uma passada pelas páginas por função, lendo os bytes no lugar em vez de copiar a tabela
+        resultado = {}
+        for nome, funcao in FUNCOES_HASH.items():
+            distribuicao = {}
+            for _, dados, _ in tabela.get_info_binaria():
+                indice = funcao(dados) % self.nb
+                distribuicao[indice] = distribuicao.get(indice, 0) + 1
 
-        # Calcular estatísticas de distribuição
-        valores = list(distribuicao.values())
-        colisoes_teoricas = sum(max(0, v - 1) for v in valores)
+            # Calcular estatísticas de distribuição
+            valores = list(distribuicao.values())
+            colisoes_teoricas = sum(max(0, v - 1) for v in valores)
 
-        resultado = {
-            'djb2': {
+            resultado[nome] = {
                 'colisoes_teoricas': colisoes_teoricas,
                 'buckets_utilizados': len(distribuicao),
                 'max_por_bucket': max(valores) if valores else 0,
                 'desvio_padrao': self._calcular_desvio_padrao(valores) if valores else 0
             }
-        }
 
         return resultado
 
@@ -225,6 +627,33 @@ class Hash:
         variancia = sum((x - media) ** 2 for x in valores) / len(valores)
         return math.sqrt(variancia)
 
+    def salvar(self, caminho: str, crc_heap: int = 0):
+        """Grava os buckets e as cadeias de overflow em um arquivo binário.
+        `crc_heap` é o CRC32 retornado por Table.salvar, que amarra o índice ao heap file"""
+        if type(self) is not Hash:
+            raise ValueError("Apenas o índice estático pode ser salvo em disco")
+        salvar_buckets(self.buckets, self.fr, self.nr, self.total_colisoes, self.total_overflows,
+                       self.nome_funcao, caminho, crc_heap)
+
+    @classmethod
+    def abrir(cls, caminho: str, tabela: Table | None = None):
+        """Abre um índice salvo com mmap; os buckets são lidos sob demanda (somente leitura).
+        Com `tabela` (aberta por Table.abrir), recusa um índice gravado para outro heap file"""
+        fr, nb, nr, total_colisoes, total_overflows, nome_funcao, crc_heap = ler_cabecalho_indice(caminho)
+        if tabela is not None and crc_heap != tabela.paginas.crc:
+            raise ValueError(f"O índice '{caminho}' não corresponde ao heap file '{tabela.arquivo}'")
+        indice = Hash(fr, nome_funcao)
+        indice.nb = nb
+        indice.nr = nr
+        indice.total_colisoes = total_colisoes
+        indice.total_overflows = total_overflows
+        indice.buckets = BucketsEmDisco(caminho, fr, nb)
+        return indice
+
+    def fechar(self):
+        if isinstance(self.buckets, BucketsEmDisco):
+            self.buckets.fechar()
+
     def obter_buckets(self):
         """Retorna lista de buckets para visualização"""
         return self.buckets
@@ -0,0 +1,436 @@
+import math
+from array import array
+
+from obj.bucket import Bucket
+from obj.hash import Hash
+from obj.table import Table
+
+
+class HashAberto(Hash):
+    """Índice com endereçamento aberto sobre vetores planos (array).
+
+    Cada slot guarda chave, página e impressão em três arrays tipados, sem
+    objetos Bucket nem cadeias de overflow. Para as estatísticas, cada bloco
+    de FR slots consecutivos conta como um bucket: a entrada que sai do slot
+    de origem é uma colisão, e a que sai do bloco de origem é um overflow.
+    """
+
+    SONDAGENS = {
+        'linear_probing': 'linear',
+        'quadratic_probing': 'quadratica',
+        'robin_hood': 'robin_hood',
+    }
+
+    VAZIO = -1
+    LAPIDE = -2  # Slot removido: mantém a impressão para não quebrar as sequências de sondagem
+
+    def __init__(self, fr: int, funcao: str = 'djb2', metodo_colisao: str = 'linear_probing',
+                 limite_carga: float = 0.7):
+        super().__init__(fr, funcao)
+        if metodo_colisao not in self.SONDAGENS:
+            raise ValueError(f"Método de colisão desconhecido: '{metodo_colisao}'. "
+                             f"Opções: {', '.join(self.SONDAGENS)}")
+        self.metodo_colisao = metodo_colisao
+        self.sondagem = self.SONDAGENS[metodo_colisao]
+        self.limite_carga = limite_carga
+        self.capacidade = 0
+        self.mascara = 0
+        self.chaves = array('q')
+        self.paginas = array('q')
+        self.impressoes = array('Q')
+        self.total_sondagens = 0
+        self.contadores_desatualizados = False
+
+    def endereco(self, impressao: int) -> int:
+        """Slot de origem: capacidade é potência de 2, então basta a máscara"""
+        return impressao & self.mascara
+
+    def construir(self, tabela: Table, processos: int = 1):
+        self.nr = tabela.get_total_tuplas()
+
+        if self.nr == 0 or self.fr <= 0:
+            print("Não é possível construir o índice: sem dados ou FR inválido.")
+            return
+
+        self._alocar(self._capacidade_para(self.nr))
+        self.total_sondagens = 0
+        self.total_lapides = 0
+
+        print(f"Construindo índice aberto ({self.metodo_colisao}) com {self.nr} registros, "
+              f"{self.capacidade} slots, FR={self.fr}, função {self.nome_funcao}")
+
+        self._relatar_progresso("Calculando hashes")
+        entradas = self.calcular_entradas(tabela, processos)
+        self._inserir_em_lote(entradas)
+
+        self._contar_colisoes()
+        self._montar_filtro()
+        self._relatar_progresso("Índice construído", self.nr, self.nr)
+        print(f"Índice construído: {self.total_colisoes} colisões, {self.total_overflows} overflows")
+
+    def _capacidade_para(self, registros: int) -> int:
+        minimo = max(self.fr, math.ceil(registros / self.limite_carga))
+        return 1 << (minimo - 1).bit_length()
+
+    def _alocar(self, capacidade: int):
+        self.capacidade = capacidade
+        self.mascara = capacidade - 1
+        self.nb = math.ceil(capacidade / self.fr)
+        self.chaves = array('q', [0]) * capacidade
+        self.paginas = array('q', [self.VAZIO]) * capacidade
+        self.impressoes = array('Q', [0]) * capacidade
+
+    def _inserir_slot(self, chave: int, id_pag: int, impressao: int):
+        if self.sondagem == 'robin_hood':
+            self._inserir_robin_hood(chave, id_pag, impressao)
+        else:
+            self._inserir_sondagem(chave, id_pag, impressao)
+
+    def _inserir_em_lote(self, entradas):
+        """Insere as entradas numa tabela recém-alocada (construir, redimensionar).
+
+        Uma a uma, a k-ésima cópia de um valor repetido sonda os k - 1 slots das
+        anteriores, O(k²) no total, e na sondagem linear toda entrada cuja origem
+        cai dentro do agrupamento formado por elas o percorre até o fim. Em lote
+        não há remoções, então a linear e a Robin Hood posicionam as entradas
+        ordenadas pela origem numa varredura, e a quadrática guarda, por origem,
+        a tentativa seguinte à da última entrada com essa origem.
+        """
+        self._relatar_progresso("Inserindo entradas", 0, len(entradas))
+        if self.sondagem != 'quadratica':
+            self._posicionar_em_ordem(entradas)
+            return
+
+        continuar = {}
+        for posicao, (chave, id_pag, impressao) in enumerate(entradas, 1):
+            self._inserir_sondagem(chave, id_pag, impressao, continuar)
+            if posicao % self.INTERVALO_PROGRESSO == 0:
+                self._relatar_progresso("Inserindo entradas", posicao, len(entradas))
+
+    def _posicionar_em_ordem(self, entradas):
+        """Cada entrada, em ordem de origem, fica no primeiro slot a partir da
+        origem e depois da anterior. Dentro de cada agrupamento as entradas ficam
+        ordenadas pela distância à origem, que é o layout do Robin Hood (e também
+        um layout válido da sondagem linear).
+
+        A ordenação é feita uma vez; se o último agrupamento passaria do fim da
+        tabela, o planejamento gira a ordem para começar nele (depois do último
+        slot vazio) até nenhum agrupamento dar a volta.
+        """
+        mascara = self.mascara
+        ordenadas = sorted(entradas, key=lambda e: e[2] & mascara)
+        origens = [e[2] & mascara for e in ordenadas]
+
+        # Planejamento sem escrever: girar a ordem não exige reordenar
+        corte, inicio = 0, 0
+        while True:
+            relativas = [(origem - inicio) & mascara for origem in origens[corte:] + origens[:corte]]
+            posicoes = []
+            anterior = -1
+            vazio = None  # (posição, origem relativa) da primeira entrada depois do último vazio
+            for origem in relativas:
+                if origem > anterior + 1:
+                    vazio = (len(posicoes), origem)
+                    anterior = origem
+                else:
+                    anterior += 1
+                posicoes.append(anterior)
+            if anterior < self.capacidade or vazio is None:
+                break
+            corte = (corte + vazio[0]) % len(origens)
+            inicio = (inicio + vazio[1]) & mascara
+
+        chaves, paginas, impressoes = self.chaves, self.paginas, self.impressoes
+        for posicao, entrada in zip(posicoes, ordenadas[corte:] + ordenadas[:corte]):
+            slot = (posicao + inicio) & mascara
+            chaves[slot], paginas[slot], impressoes[slot] = entrada
+        self.total_sondagens = sum(posicoes) - sum(relativas) + len(posicoes)
+
+    def _proximo(self, origem: int, tentativa: int) -> int:
+        if self.sondagem == 'quadratica':
+            # Números triangulares percorrem todos os slots de uma tabela 2^k
+            return (origem + tentativa * (tentativa + 1) // 2) & self.mascara
+        return (origem + tentativa) & self.mascara
+
+    def _inserir_sondagem(self, chave: int, id_pag: int, impressao: int, continuar=None):
+        """`continuar` (só em lote) guarda, por origem, a tentativa seguinte à última usada"""
+        origem = impressao & self.mascara
+        tentativa = continuar.get(origem, 0) if continuar is not None else 0
+        slot = self._proximo(origem, tentativa)
+        while self.paginas[slot] >= 0:
+            tentativa += 1
+            slot = self._proximo(origem, tentativa)
+        self.total_sondagens += tentativa + 1
+        if continuar is not None:
+            continuar[origem] = tentativa + 1
+
+        self.chaves[slot] = chave
+        self.paginas[slot] = id_pag
+        self.impressoes[slot] = impressao
+
+    def _inserir_robin_hood(self, chave: int, id_pag: int, impressao: int):
+        """Sondagem linear em que a entrada mais distante da origem toma o slot"""
+        mascara = self.mascara
+        slot = impressao & mascara
+        distancia = 0
+        while self.paginas[slot] >= 0:
+            distancia_ocupante = (slot - self.impressoes[slot]) & mascara
+            if distancia_ocupante < distancia:
+                chave, self.chaves[slot] = self.chaves[slot], chave
+                id_pag, self.paginas[slot] = self.paginas[slot], id_pag
+                impressao, self.impressoes[slot] = self.impressoes[slot], impressao
+                distancia = distancia_ocupante
+            slot = (slot + 1) & mascara
+            distancia += 1
+            self.total_sondagens += 1
+        self.total_sondagens += 1
+
+        self.chaves[slot] = chave
+        self.paginas[slot] = id_pag
+        self.impressoes[slot] = impressao
+
+    def _contar_colisoes(self):
+        """Recalcula colisões e overflows a partir dos slots (O(capacidade));
+        após inserções e remoções só roda quando as estatísticas são pedidas"""
+        self.contadores_desatualizados = False
+        self.total_colisoes = 0
+        self.total_overflows = 0
+        for slot in range(self.capacidade):
+            if self.paginas[slot] < 0:
+                continue
+            origem = self.impressoes[slot] & self.mascara
+            if origem != slot:
+                self.total_colisoes += 1
+                if origem // self.fr != slot // self.fr:
+                    self.total_overflows += 1
+
+    def _buscar(self, valor_busca: str, tabela: Table):
+        """Sem cadeias: as entradas examinadas são os slots sondados e não há saltos de overflow"""
+        if self.capacidade == 0:
+            return None, 0, None, 0, 0
+
+        impressao_busca = self.hash_completo(valor_busca)
+        if self._descartado_pelo_filtro(impressao_busca):
+            return None, 0, None, 0, 0
+
+        origem = impressao_busca & self.mascara
+        paginas_visitadas = set()
+        custo = 0
+        sondados = 0
+
+        for tentativa in range(self.capacidade):
+            slot = self._proximo(origem, tentativa)
+            id_pag = self.paginas[slot]
+            sondados += 1
+            if id_pag == self.VAZIO:
+                break
+
+            # No Robin Hood, um ocupante mais perto da origem encerra a busca
+            if self.sondagem == 'robin_hood' and \
+                    (slot - self.impressoes[slot]) & self.mascara < tentativa:
+                break
+
+            if self.impressoes[slot] != impressao_busca or id_pag == self.LAPIDE or id_pag in paginas_visitadas:
+                continue
+            paginas_visitadas.add(id_pag)
+
+            pagina = tabela.get_pagina(id_pag)
+            if pagina is None:
+                continue
+            custo += 1
+            tupla = pagina.buscar_valor(valor_busca)
+            if tupla is not None:
+                return tupla, custo, id_pag, sondados, 0
+
+        self._registrar_falso_positivo()
+        return None, custo, None, sondados, 0
+
+    def _impressoes_indexadas(self):
+        for slot in range(self.capacidade):
+            if self.paginas[slot] >= 0:
+                yield self.impressoes[slot]
+
+    def _paginas_do_valor(self, impressao_busca: int):
+        origem = impressao_busca & self.mascara
+        paginas_visitadas = set()
+        for tentativa in range(self.capacidade):
+            slot = self._proximo(origem, tentativa)
+            id_pag = self.paginas[slot]
+            if id_pag == self.VAZIO:
+                break
+            if self.sondagem == 'robin_hood' and \
+                    (slot - self.impressoes[slot]) & self.mascara < tentativa:
+                break
+            if self.impressoes[slot] == impressao_busca and id_pag >= 0 and id_pag not in paginas_visitadas:
+                paginas_visitadas.add(id_pag)
+                yield id_pag
+
+    def _paginas_candidatas(self, valores):
+        paginas = {}
+        for valor in valores:
+            impressao = self.hash_completo(valor)
+            origem = impressao & self.mascara
+            for tentativa in range(self.capacidade):
+                slot = self._proximo(origem, tentativa)
+                id_pag = self.paginas[slot]
+                if id_pag == self.VAZIO:
+                    break
+                if self.sondagem == 'robin_hood' and \
+                        (slot - self.impressoes[slot]) & self.mascara < tentativa:
+                    break
+                if self.impressoes[slot] == impressao and id_pag != self.LAPIDE:
+                    paginas.setdefault(id_pag, set()).add(valor)
+        return paginas
+
+    def _slot_da_entrada(self, chave: int, impressao: int) -> int:
+        origem = impressao & self.mascara
+        for tentativa in range(self.capacidade):
+            slot = self._proximo(origem, tentativa)
+            if self.paginas[slot] == self.VAZIO:
+                break
+            if self.chaves[slot] == chave and self.impressoes[slot] == impressao and self.paginas[slot] >= 0:
+                return slot
+        return -1
+
+    def inserir(self, chave: int, valor_str: str, id_pag: int):
+        """Insere no primeiro slot livre (ou lápide) da sequência de sondagem,
+        dobrando a capacidade quando o limite de carga seria ultrapassado"""
+        if self.capacidade == 0:
+            raise Exception("Índice não construído")
+        if self.nr + self.total_lapides + 1 > self.capacidade * self.limite_carga:
+            self._redimensionar(self._capacidade_para(self.nr + 1))
+        impressao = self.hash_completo(valor_str)
+        self._adicionar_ao_filtro(impressao)
+        self._inserir_slot(chave, id_pag, impressao)
+        self.nr += 1
+        self.contadores_desatualizados = True
+
+    def remover(self, chave: int, valor_str: str) -> bool:
+        """Marca o slot como lápide; com muitas lápides a tabela é reorganizada.
+        No Robin Hood o slot é liberado deslocando as entradas seguintes"""
+        if self.capacidade == 0:
+            raise Exception("Índice não construído")
+        slot = self._slot_da_entrada(chave, self.hash_completo(valor_str))
+        if slot < 0:
+            return False
+
+        self.nr -= 1
+        if self.sondagem == 'robin_hood':
+            self._remover_deslocando(slot)
+            self.contadores_desatualizados = True
+            return True
+
+        self.paginas[slot] = self.LAPIDE
+        self.total_lapides += 1
+        if self.total_lapides > self.capacidade // 4:
+            self.compactar()
+        else:
+            self.contadores_desatualizados = True
+        return True
+
+    def _remover_deslocando(self, slot: int):
+        """Remoção com deslocamento para trás (Robin Hood): as entradas seguintes
+        que estão fora da origem recuam um slot. Sem lápides, a regra de parada
+        das buscas ((slot - origem) < tentativa) continua valendo"""
+        mascara = self.mascara
+        while True:
+            proximo = (slot + 1) & mascara
+            if self.paginas[proximo] == self.VAZIO or (proximo - self.impressoes[proximo]) & mascara == 0:
+                break
+            self.chaves[slot] = self.chaves[proximo]
+            self.paginas[slot] = self.paginas[proximo]
+            self.impressoes[slot] = self.impressoes[proximo]
+            slot = proximo
+        self.paginas[slot] = self.VAZIO
+
+    def compactar(self, apenas_esparsas: bool = False):
+        """Reinsere as entradas vivas na mesma capacidade, descartando as lápides.
+
+        Sem cadeias de overflow não há passada parcial: apenas_esparsas só
+        evita o trabalho quando não há lápides. Retorna 0 (nenhum bucket liberado).
+        """
+        if apenas_esparsas and self.total_lapides == 0:
+            return 0
+        self._redimensionar(self.capacidade)
+        self._montar_filtro()
+        return 0
+
+    def _redimensionar(self, capacidade: int):
+        vivas = [(self.chaves[slot], self.paginas[slot], self.impressoes[slot])
+                 for slot in range(self.capacidade) if self.paginas[slot] >= 0]
+        self._alocar(capacidade)
+        self.total_lapides = 0
+        self.total_sondagens = 0
+        self._inserir_em_lote(vivas)
+        self.contadores_desatualizados = True
+
+    def analisar_distribuicao(self):
+        """Analisa a ocupação dos blocos de FR slots"""
+        distribuicao = {
+            'buckets_vazios': 0,
+            'buckets_parciais': 0,
+            'buckets_cheios': 0,
+            'buckets_com_overflow': 0,
+            'max_entradas_bucket': 0,
+            'min_entradas_bucket': 0,
+            'media_entradas': 0,
+            'max_buckets_cadeia': 0,
+            'buckets_por_busca': 0
+        }
+        if self.capacidade == 0:
+            return distribuicao
+
+        ocupacao = [0] * self.nb
+        blocos_com_overflow = set()
+        blocos_percorridos = 0
+        for slot in range(self.capacidade):
+            if self.paginas[slot] < 0:
+                continue
+            bloco = slot // self.fr
+            ocupacao[bloco] += 1
+            bloco_origem = (self.impressoes[slot] & self.mascara) // self.fr
+            if bloco_origem != bloco:
+                blocos_com_overflow.add(bloco_origem)
+            # Blocos do de origem até o da entrada (exato nas sondagens lineares, aproximado na quadrática)
+            distancia = (bloco - bloco_origem) % self.nb + 1
+            blocos_percorridos += distancia
+            distribuicao['max_buckets_cadeia'] = max(distribuicao['max_buckets_cadeia'], distancia)
+
+        for num_entradas in ocupacao:
+            if num_entradas == 0:
+                distribuicao['buckets_vazios'] += 1
+            elif num_entradas < self.fr:
+                distribuicao['buckets_parciais'] += 1
+            else:
+                distribuicao['buckets_cheios'] += 1
+
+        ocupados = [n for n in ocupacao if n > 0]
+        distribuicao['buckets_com_overflow'] = len(blocos_com_overflow)
+        distribuicao['max_entradas_bucket'] = max(ocupacao)
+        distribuicao['min_entradas_bucket'] = min(ocupados) if ocupados else 0
+        distribuicao['media_entradas'] = self.nr / self.nb
+        if self.nr:
+            distribuicao['buckets_por_busca'] = round(blocos_percorridos / self.nr, 3)
+        return distribuicao
+
+    def obter_estatisticas(self):
+        if self.contadores_desatualizados:
+            self._contar_colisoes()
+        estatisticas = super().obter_estatisticas()
+        estatisticas.update({
+            "tipo_indice": "aberto",
+            "metodo_colisao": self.metodo_colisao,
+            "capacidade_slots": self.capacidade,
+            "sondagens_media": round(self.total_sondagens / self.nr, 2) if self.nr else 0,
+            "memoria_bytes": sum(a.itemsize * len(a) for a in (self.chaves, self.paginas, self.impressoes))
+        })
+        return estatisticas
+
+    def obter_buckets(self):
+        """Monta buckets apenas para visualização, um por bloco de FR slots"""
+        buckets = [Bucket(self.fr) for _ in range(self.nb)]
+        for slot in range(self.capacidade):
+            if self.paginas[slot] >= 0:
+                buckets[slot // self.fr].entradas.append(
+                    (self.chaves[slot], self.paginas[slot], self.impressoes[slot]))
+        return buckets
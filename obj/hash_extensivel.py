@@ -0,0 +1,162 @@
+from obj.bucket import Bucket
+from obj.hash import Hash
+from obj.table import Table
+
+
+class HashExtensivel(Hash):
+    """Hashing extensível: diretório com profundidade global e buckets com
+    profundidade local, divididos sob demanda em vez de encadear overflows.
+
+    O diretório é guardado em self.buckets (várias posições podem apontar para
+    o mesmo bucket), então a busca herdada de Hash funciona sem alterações.
+    """
+
+    # Limite do diretório (2^24 posições); acima disso o bucket volta a usar overflow
+    PROFUNDIDADE_MAXIMA = 24
+
+    # Bucket.impressao_comum de uma cadeia com impressões diferentes (impressões são >= 0)
+    MISTA = -1
+
+    def __init__(self, fr: int, funcao: str = 'djb2'):
+        super().__init__(fr, funcao)
+        self._reiniciar()
+
+    def _reiniciar(self):
+        self.nr = 0
+        self.profundidade_global = 0
+        self.buckets = [Bucket(self.fr)]
+        self.buckets_distintos = list(self.buckets)
+        self.nb = 1
+        self.total_colisoes = 0
+        self.total_overflows = 0
+        self.total_lapides = 0
+        self.total_divisoes = 0
+        self.total_duplicacoes = 0
+
+    def endereco(self, impressao: int) -> int:
+        """Usa os bits menos significativos do hash, conforme a profundidade global"""
+        return impressao & ((1 << self.profundidade_global) - 1)
+
+    def construir(self, tabela: Table, processos: int = 1):
+        if tabela.get_total_tuplas() == 0 or self.fr <= 0:
+            print("Não é possível construir o índice: sem dados ou FR inválido.")
+            return
+
+        self._reiniciar()
+        print(f"Construindo índice extensível com {tabela.get_total_tuplas()} registros, FR={self.fr}, "
+              f"função {self.nome_funcao}")
+
+        self._relatar_progresso("Calculando hashes")
+        entradas = self.calcular_entradas(tabela, processos)
+        self._relatar_progresso("Inserindo entradas", 0, len(entradas))
+        for posicao, entrada in enumerate(entradas, 1):
+            self._inserir_entrada(entrada)
+            if posicao % self.INTERVALO_PROGRESSO == 0:
+                self._relatar_progresso("Inserindo entradas", posicao, len(entradas))
+
+        self._montar_filtro()
+        self._relatar_progresso("Índice construído", self.nr, self.nr)
+        print(f"Índice construído: profundidade global {self.profundidade_global}, "
+              f"{self.nb} buckets, {self.total_divisoes} divisões, {self.total_overflows} overflows")
+
+    def inserir(self, chave: int, valor_str: str, id_pag: int):
+        """Insere uma entrada sem reconstruir o índice"""
+        impressao = self.hash_completo(valor_str)
+        self._adicionar_ao_filtro(impressao)
+        self._inserir_entrada((chave, id_pag, impressao))
+
+    def _inserir_entrada(self, entrada):
+        impressao = entrada[2]
+        self.nr += 1
+
+        while True:
+            bucket = self.buckets[self.endereco(impressao)]
+
+            if not bucket.esta_cheio():
+                if bucket.entradas:
+                    self.total_colisoes += 1
+                bucket.entradas.append(entrada)
+                self._anotar_impressao(bucket, impressao)
+                return
+
+            # Dividir não separa entradas com o mesmo hash (valores repetidos),
+            # nem é possível além da profundidade máxima: encadeia overflow
+            if bucket.impressao_comum == impressao or bucket.profundidade_local >= self.PROFUNDIDADE_MAXIMA:
+                self.total_colisoes += 1
+                if bucket.adicionar(*entrada):
+                    self.total_overflows += 1
+                self._anotar_impressao(bucket, impressao)
+                return
+
+            if bucket.profundidade_local == self.profundidade_global:
+                self._duplicar_diretorio()
+            self._dividir(bucket, impressao)
+
+    def _anotar_impressao(self, bucket: Bucket, impressao: int):
+        """Mantém impressao_comum sem percorrer a cadeia. Remoções e compactações
+        não a atualizam: ela pode ficar MISTA numa cadeia que voltou a ter uma
+        impressão só, o que apenas provoca uma divisão que a recalcula"""
+        if bucket.impressao_comum is None:
+            bucket.impressao_comum = impressao
+        elif bucket.impressao_comum != impressao:
+            bucket.impressao_comum = self.MISTA
+
+    def _duplicar_diretorio(self):
+        self.buckets = self.buckets + self.buckets
+        self.profundidade_global += 1
+        self.total_duplicacoes += 1
+
+    def _dividir(self, bucket: Bucket, impressao: int):
+        """Divide o bucket em dois pelo bit de posição profundidade_local"""
+        profundidade = bucket.profundidade_local
+        bit = 1 << profundidade
+
+        # total_overflows reflete as entradas que estão em overflow agora
+        self.total_overflows -= self._overflows_da_cadeia(bucket)
+        entradas = [e for b in bucket.get_buckets_na_cadeia() for e in b.entradas]
+        vivas = [e for e in entradas if e[1] != Bucket.LAPIDE]
+        self.total_lapides -= len(entradas) - len(vivas)
+        entradas = vivas
+        novo = Bucket(self.fr)
+        bucket.impressao_comum = None
+        bucket.profundidade_local = novo.profundidade_local = profundidade + 1
+
+        ficam, vao = [], []
+        for entrada in entradas:
+            if entrada[2] & bit:
+                vao.append(entrada)
+                self._anotar_impressao(novo, entrada[2])
+            else:
+                ficam.append(entrada)
+                self._anotar_impressao(bucket, entrada[2])
+        bucket.preencher(ficam)
+        novo.preencher(vao)
+        self.total_overflows += self._overflows_da_cadeia(bucket) + self._overflows_da_cadeia(novo)
+
+        # Só as posições do diretório com o mesmo sufixo do bucket dividido mudam
+        inicio = impressao & (bit - 1)
+        for i in range(inicio | bit, len(self.buckets), bit << 1):
+            self.buckets[i] = novo
+
+        self.buckets_distintos.append(novo)
+        self.nb += 1
+        self.total_divisoes += 1
+
+    def _overflows_da_cadeia(self, bucket: Bucket) -> int:
+        """Entradas que estão hoje nos buckets de overflow da cadeia"""
+        return sum(len(o.entradas) for o in bucket.get_buckets_na_cadeia()[1:])
+
+    def obter_estatisticas(self):
+        estatisticas = super().obter_estatisticas()
+        estatisticas.update({
+            "tipo_indice": "extensivel",
+            "profundidade_global": self.profundidade_global,
+            "tamanho_diretorio": len(self.buckets),
+            "total_divisoes": self.total_divisoes,
+            "total_duplicacoes": self.total_duplicacoes
+        })
+        return estatisticas
+
+    def obter_buckets(self):
+        """Retorna cada bucket uma única vez, sem as repetições do diretório"""
+        return self.buckets_distintos
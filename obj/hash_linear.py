@@ -0,0 +1,124 @@
+from obj.bucket import Bucket
+from obj.hash import Hash
+from obj.table import Table
+
+
+class HashLinear(Hash):
+    """Hashing linear: cresce um bucket por vez, na posição do ponteiro de divisão,
+    sempre que o fator de carga passa do limite. O custo de crescimento fica
+    distribuído entre as inserções, sem reconstrução do índice.
+    """
+
+    def __init__(self, fr: int, funcao: str = 'djb2', limite_carga: float = 0.8, nb_inicial: int = 1):
+        super().__init__(fr, funcao)
+        self.limite_carga = limite_carga
+        self.nb_inicial = max(1, nb_inicial)
+        self._reiniciar()
+
+    def _reiniciar(self):
+        self.nr = 0
+        self.nivel = 0
+        self.ponteiro_divisao = 0
+        self.buckets = [Bucket(self.fr) for _ in range(self.nb_inicial)]
+        self.nb = self.nb_inicial
+        self.total_colisoes = 0
+        self.total_overflows = 0
+        self.total_lapides = 0
+        self.total_divisoes = 0
+
+    def endereco(self, impressao: int) -> int:
+        """h mod N*2^nivel; buckets já divididos nesta rodada usam o nível seguinte"""
+        tamanho_rodada = self.nb_inicial << self.nivel
+        indice = impressao % tamanho_rodada
+        if indice < self.ponteiro_divisao:
+            indice = impressao % (tamanho_rodada << 1)
+        return indice
+
+    def construir(self, tabela: Table, processos: int = 1):
+        if tabela.get_total_tuplas() == 0 or self.fr <= 0:
+            print("Não é possível construir o índice: sem dados ou FR inválido.")
+            return
+
+        self._reiniciar()
+        print(f"Construindo índice linear com {tabela.get_total_tuplas()} registros, FR={self.fr}, "
+              f"limite de carga {self.limite_carga}, função {self.nome_funcao}")
+
+        self._relatar_progresso("Calculando hashes")
+        entradas = self.calcular_entradas(tabela, processos)
+        self._relatar_progresso("Inserindo entradas", 0, len(entradas))
+        for posicao, entrada in enumerate(entradas, 1):
+            self._inserir_entrada(entrada)
+            if posicao % self.INTERVALO_PROGRESSO == 0:
+                self._relatar_progresso("Inserindo entradas", posicao, len(entradas))
+
+        self._montar_filtro()
+        self._relatar_progresso("Índice construído", self.nr, self.nr)
+        print(f"Índice construído: nível {self.nivel}, {self.nb} buckets, "
+              f"{self.total_divisoes} divisões, {self.total_overflows} overflows")
+
+    def inserir(self, chave: int, valor_str: str, id_pag: int):
+        """Insere uma entrada sem reconstruir o índice"""
+        impressao = self.hash_completo(valor_str)
+        self._adicionar_ao_filtro(impressao)
+        self._inserir_entrada((chave, id_pag, impressao))
+
+    def _inserir_entrada(self, entrada):
+        bucket = self.buckets[self.endereco(entrada[2])]
+        if bucket.entradas:
+            self.total_colisoes += 1
+        if bucket.adicionar(*entrada):
+            self.total_overflows += 1
+        self.nr += 1
+
+        while self.nr / (self.nb * self.fr) > self.limite_carga:
+            self._dividir()
+
+    def _dividir(self):
+        """Divide o bucket apontado pelo ponteiro e avança o ponteiro"""
+        tamanho_rodada = self.nb_inicial << self.nivel
+        bucket = self.buckets[self.ponteiro_divisao]
+
+        cadeia = bucket.get_buckets_na_cadeia()
+        entradas = [e for b in cadeia for e in b.entradas]
+        vivas = [e for e in entradas if e[1] != Bucket.LAPIDE]
+        self.total_lapides -= len(entradas) - len(vivas)
+        entradas = vivas
+        novo = Bucket(self.fr)
+        self.buckets.append(novo)
+        self.nb += 1
+
+        # O novo bucket fica na posição ponteiro + N*2^nivel
+        ficam, vao = [], []
+        for entrada in entradas:
+            if entrada[2] % (tamanho_rodada << 1) != self.ponteiro_divisao:
+                vao.append(entrada)
+            else:
+                ficam.append(entrada)
+        bucket.preencher(ficam)
+        novo.preencher(vao)
+
+        # total_overflows reflete as entradas que estão em overflow agora
+        self.total_overflows -= sum(len(b.entradas) for b in cadeia[1:])
+        for b in (bucket, novo):
+            self.total_overflows += sum(len(o.entradas) for o in b.get_buckets_na_cadeia()[1:])
+
+        self.ponteiro_divisao += 1
+        if self.ponteiro_divisao == tamanho_rodada:
+            self.nivel += 1
+            self.ponteiro_divisao = 0
+        self.total_divisoes += 1
+
+    def _overflows_da_cadeia(self, bucket: Bucket) -> int:
+        """Entradas que estão hoje nos buckets de overflow da cadeia"""
+        return sum(len(o.entradas) for o in bucket.get_buckets_na_cadeia()[1:])
+
+    def obter_estatisticas(self):
+        estatisticas = super().obter_estatisticas()
+        estatisticas.update({
+            "tipo_indice": "linear",
+            "nivel": self.nivel,
+            "ponteiro_divisao": self.ponteiro_divisao,
+            "limite_carga": self.limite_carga,
+            "total_divisoes": self.total_divisoes
+        })
+        return estatisticas
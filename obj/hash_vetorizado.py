@@ -0,0 +1,244 @@
+"""Cálculo vetorizado (NumPy) das funções hash de obj/funcoes_hash.py.
+
+Os valores são codificados em um único buffer de bytes e agrupados por
+comprimento; dentro de cada grupo todas as chaves têm a mesma forma, então
+cada passo da função hash vira uma operação sobre um vetor uint64. Os
+resultados são idênticos aos das funções em Python puro.
+
+O NumPy é opcional: sem ele, NUMPY_DISPONIVEL é False e os índices usam o
+caminho em Python puro.
+"""
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from obj import funcoes_hash
+
+NUMPY_DISPONIVEL = np is not None
+
+TUPLAS_POR_BLOCO = 1 << 16  # Tuplas copiadas por vez de Table.get_colunas_binarias
+
+
+def _u64(valor: int):
+    return np.uint64(valor & funcoes_hash.MASCARA_64)
+
+
+def _rotl(x, r: int):
+    return (x << np.uint64(r)) | (x >> np.uint64(64 - r))
+
+
+def _ler_u64(matriz, p: int):
+    return np.ascontiguousarray(matriz[:, p:p + 8]).view('<u8').ravel().astype(np.uint64)
+
+
+def _ler_u32(matriz, p: int):
+    return np.ascontiguousarray(matriz[:, p:p + 4]).view('<u4').ravel().astype(np.uint64)
+
+
+def _djb2(matriz):
+    h = np.full(len(matriz), 5381, dtype=np.uint64)
+    trinta_e_tres = np.uint64(33)
+    for j in range(matriz.shape[1]):
+        h = h * trinta_e_tres + matriz[:, j]
+    return h
+
+
+def _fnv1a(matriz):
+    h = np.full(len(matriz), funcoes_hash.FNV_OFFSET, dtype=np.uint64)
+    primo = _u64(funcoes_hash.FNV_PRIMO)
+    for j in range(matriz.shape[1]):
+        h = (h ^ matriz[:, j]) * primo
+    return h
+
+
+def _xxh_round(acc, entrada):
+    acc = acc + entrada * _u64(funcoes_hash.XXH_P2)
+    return _rotl(acc, 31) * _u64(funcoes_hash.XXH_P1)
+
+
+def _xxhash64(matriz):
+    P1, P2, P3, P4, P5 = (_u64(p) for p in (funcoes_hash.XXH_P1, funcoes_hash.XXH_P2, funcoes_hash.XXH_P3,
+                                            funcoes_hash.XXH_P4, funcoes_hash.XXH_P5))
+    quantidade, n = matriz.shape
+    p = 0
+
+    if n >= 32:
+        v1 = np.full(quantidade, P1 + P2, dtype=np.uint64)
+        v2 = np.full(quantidade, P2, dtype=np.uint64)
+        v3 = np.zeros(quantidade, dtype=np.uint64)
+        v4 = np.full(quantidade, _u64(-funcoes_hash.XXH_P1), dtype=np.uint64)
+        while p + 32 <= n:
+            v1 = _xxh_round(v1, _ler_u64(matriz, p))
+            v2 = _xxh_round(v2, _ler_u64(matriz, p + 8))
+            v3 = _xxh_round(v3, _ler_u64(matriz, p + 16))
+            v4 = _xxh_round(v4, _ler_u64(matriz, p + 24))
+            p += 32
+        h = _rotl(v1, 1) + _rotl(v2, 7) + _rotl(v3, 12) + _rotl(v4, 18)
+        for v in (v1, v2, v3, v4):
+            h = (h ^ _xxh_round(np.zeros(quantidade, dtype=np.uint64), v)) * P1 + P4
+    else:
+        h = np.full(quantidade, P5, dtype=np.uint64)
+
+    h = h + np.uint64(n)
+
+    while p + 8 <= n:
+        h = h ^ _xxh_round(np.zeros(quantidade, dtype=np.uint64), _ler_u64(matriz, p))
+        h = _rotl(h, 27) * P1 + P4
+        p += 8
+
+    if p + 4 <= n:
+        h = h ^ (_ler_u32(matriz, p) * P1)
+        h = _rotl(h, 23) * P2 + P3
+        p += 4
+
+    while p < n:
+        h = h ^ (matriz[:, p].astype(np.uint64) * P5)
+        h = _rotl(h, 11) * P1
+        p += 1
+
+    h = h ^ (h >> np.uint64(33))
+    h = h * P2
+    h = h ^ (h >> np.uint64(29))
+    h = h * P3
+    return h ^ (h >> np.uint64(32))
+
+
+def _sipround(v0, v1, v2, v3):
+    v0 = v0 + v1
+    v1 = _rotl(v1, 13) ^ v0
+    v0 = _rotl(v0, 32)
+    v2 = v2 + v3
+    v3 = _rotl(v3, 16) ^ v2
+    v0 = v0 + v3
+    v3 = _rotl(v3, 21) ^ v0
+    v2 = v2 + v1
+    v1 = _rotl(v1, 17) ^ v2
+    v2 = _rotl(v2, 32)
+    return v0, v1, v2, v3
+
+
+def _siphash24(matriz):
+    k0, k1 = funcoes_hash.SIPHASH_CHAVE
+    quantidade, n = matriz.shape
+    v0 = np.full(quantidade, k0 ^ 0x736F6D6570736575, dtype=np.uint64)
+    v1 = np.full(quantidade, k1 ^ 0x646F72616E646F6D, dtype=np.uint64)
+    v2 = np.full(quantidade, k0 ^ 0x6C7967656E657261, dtype=np.uint64)
+    v3 = np.full(quantidade, k1 ^ 0x7465646279746573, dtype=np.uint64)
+
+    fim = n - (n % 8)
+    for p in range(0, fim, 8):
+        m = _ler_u64(matriz, p)
+        v3 = v3 ^ m
+        v0, v1, v2, v3 = _sipround(v0, v1, v2, v3)
+        v0, v1, v2, v3 = _sipround(v0, v1, v2, v3)
+        v0 = v0 ^ m
+
+    b = np.full(quantidade, (n & 0xFF) << 56, dtype=np.uint64)
+    for i in range(fim, n):
+        b = b | (matriz[:, i].astype(np.uint64) << np.uint64(8 * (i - fim)))
+    v3 = v3 ^ b
+    v0, v1, v2, v3 = _sipround(v0, v1, v2, v3)
+    v0, v1, v2, v3 = _sipround(v0, v1, v2, v3)
+    v0 = v0 ^ b
+
+    v2 = v2 ^ np.uint64(0xFF)
+    for _ in range(4):
+        v0, v1, v2, v3 = _sipround(v0, v1, v2, v3)
+    return v0 ^ v1 ^ v2 ^ v3
+
+
+FUNCOES_VETORIZADAS = {
+    'djb2': _djb2,
+    'fnv1a': _fnv1a,
+    'xxhash': _xxhash64,
+    'siphash': _siphash24,
+}
+
+
+def hashes_de_buffer(nome_funcao: str, buffer, inicios, comprimentos):
+    """Hash de cada valor guardado em buffer[inicio:inicio + comprimento]"""
+    funcao = FUNCOES_VETORIZADAS[nome_funcao]
+    buffer = np.frombuffer(buffer, dtype=np.uint8)
+
+    resultado = np.empty(len(inicios), dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        for comprimento in np.unique(comprimentos):
+            posicoes = np.flatnonzero(comprimentos == comprimento)
+            matriz = buffer[inicios[posicoes][:, None] + np.arange(comprimento)]
+            resultado[posicoes] = funcao(matriz.reshape(len(posicoes), int(comprimento)))
+    return resultado
+
+
+def hashes_em_lote(nome_funcao: str, valores):
+    """Retorna um np.ndarray uint64 com o hash de cada valor, na ordem recebida"""
+    codificados = [valor.encode('utf-8') for valor in valores]
+    comprimentos = np.fromiter((len(c) for c in codificados), dtype=np.int64, count=len(codificados))
+    inicios = np.zeros(len(codificados), dtype=np.int64)
+    np.cumsum(comprimentos[:-1], out=inicios[1:])
+    return hashes_de_buffer(nome_funcao, b''.join(codificados), inicios, comprimentos)
+
+
+def hashes_da_tabela(nome_funcao: str, tabela):
+    """Hash de todas as tuplas direto dos buffers das páginas, sem decodificar os valores.
+
+    As páginas são lidas em blocos de TUPLAS_POR_BLOCO tuplas, então só um bloco
+    dos dados é copiado por vez, em vez da tabela inteira.
+    Retorna (chaves, ids_pagina, impressoes) como arrays NumPy na ordem da tabela.
+    """
+    total = tabela.get_total_tuplas()
+    chaves = np.empty(total, dtype=np.int64)
+    ids_pagina = np.empty(total, dtype=np.int64)
+    impressoes = np.empty(total, dtype=np.uint64)
+
+    posicao = 0
+    primeira_pagina = 0
+    for chaves_bloco, dados, fins, contagens in tabela.get_colunas_binarias(TUPLAS_POR_BLOCO):
+        fim = posicao + len(chaves_bloco)
+        chaves[posicao:fim] = np.frombuffer(chaves_bloco, dtype=np.int64)
+        ids_pagina[posicao:fim] = np.repeat(
+            np.arange(primeira_pagina, primeira_pagina + len(contagens), dtype=np.int64), contagens)
+        impressoes[posicao:fim] = _hashes_do_bloco(nome_funcao, dados, fins, contagens)
+        posicao = fim
+        primeira_pagina += len(contagens)
+    return chaves, ids_pagina, impressoes
+
+
+def _hashes_do_bloco(nome_funcao: str, dados, fins, contagens):
+    contagens = np.asarray(contagens, dtype=np.int64)
+    fins = np.frombuffer(fins, dtype=np.uint32).astype(np.int64)
+
+    # Offsets relativos à página -> absolutos no buffer concatenado
+    tamanhos_pagina = np.zeros(len(contagens), dtype=np.int64)
+    ultimos = np.cumsum(contagens) - 1
+    com_tuplas = contagens > 0
+    tamanhos_pagina[com_tuplas] = fins[ultimos[com_tuplas]]
+    base = np.repeat(np.cumsum(tamanhos_pagina) - tamanhos_pagina, contagens)
+    fins_absolutos = fins + base
+    inicios = np.concatenate(([0], fins_absolutos[:-1])) if len(fins_absolutos) else fins_absolutos
+
+    return hashes_de_buffer(nome_funcao, dados, inicios, fins_absolutos - inicios)
+
+
+def agrupar_por_bucket(impressoes, nb: int):
+    """Ordenação por contagem dos índices de bucket.
+
+    Retorna (ordem, contagens): `ordem` lista as posições agrupadas por bucket,
+    mantendo a ordem original dentro de cada bucket, e `contagens` vem do bincount.
+    """
+    indices = impressoes % np.uint64(nb)
+    ordem = np.argsort(indices, kind='stable')
+    contagens = np.bincount(indices.astype(np.int64), minlength=nb)
+    return ordem, contagens
+
+
+def estatisticas_distribuicao(impressoes, nb: int):
+    """Mesmas métricas de Hash.comparar_funcoes_hash, calculadas com bincount"""
+    contagens = np.bincount((impressoes % np.uint64(nb)).astype(np.int64), minlength=nb)
+    usados = contagens[contagens > 0]
+    return {
+        'colisoes_teoricas': int(np.maximum(usados - 1, 0).sum()),
+        'buckets_utilizados': int(len(usados)),
+        'max_por_bucket': int(usados.max()) if len(usados) else 0,
+        'desvio_padrao': float(usados.std()) if len(usados) else 0
+    }
@@ -0,0 +1,87 @@
+from array import array
+
+from obj.page import Page
+from obj.table import Table
+
+
+class IndiceChave:
+    """Índice primário denso sobre Tupla.chave.
+
+    As chaves são sequenciais (Table.carregar numera a partir de 1), então o
+    record id (página, slot) de cada chave fica em dois arrays indexados por
+    `chave - base`: a busca é O(1) e custa uma única leitura de página. O slot
+    é só uma dica; se a página foi compactada por uma remoção, a chave é
+    procurada dentro da mesma página, sem leituras extras.
+    """
+
+    AUSENTE = -1
+
+    def __init__(self):
+        self.base = 1
+        self.paginas = array('q')
+        self.slots = array('I')
+        self.nr = 0
+
+    def construir(self, tabela: Table):
+        self.paginas = array('q')
+        self.slots = array('I')
+        self.nr = 0
+        self.base = min((min(pagina.chaves) for pagina in tabela.paginas if len(pagina)), default=1)
+
+        for pagina in tabela.paginas:
+            for slot, chave in enumerate(pagina.chaves):
+                self.inserir(chave, pagina.id, slot)
+
+    def inserir(self, chave: int, id_pag: int, slot: int = 0):
+        posicao = chave - self.base
+        if posicao < 0:
+            raise ValueError(f"Chave {chave} menor que a base do índice ({self.base})")
+        if posicao >= len(self.paginas):
+            faltando = posicao + 1 - len(self.paginas)
+            self.paginas.extend([self.AUSENTE] * faltando)
+            self.slots.extend([0] * faltando)
+
+        if self.paginas[posicao] == self.AUSENTE:
+            self.nr += 1
+        self.paginas[posicao] = id_pag
+        self.slots[posicao] = slot
+
+    def remover(self, chave: int) -> bool:
+        posicao = chave - self.base
+        if not 0 <= posicao < len(self.paginas) or self.paginas[posicao] == self.AUSENTE:
+            return False
+        self.paginas[posicao] = self.AUSENTE
+        self.nr -= 1
+        return True
+
+    def localizar(self, chave: int):
+        """Record id (id_pag, slot) da chave, sem ler a tabela; None se não existe"""
+        posicao = chave - self.base
+        if not 0 <= posicao < len(self.paginas) or self.paginas[posicao] == self.AUSENTE:
+            return None
+        return self.paginas[posicao], self.slots[posicao]
+
+    def buscar(self, chave: int, tabela: Table):
+        """Retorna (tupla, custo, id_pag), no mesmo formato de Hash.buscar"""
+        record_id = self.localizar(chave)
+        if record_id is None:
+            return None, 0, None
+
+        id_pag, slot = record_id
+        pagina: Page = tabela.get_pagina(id_pag)
+        if pagina is None:
+            return None, 0, None
+
+        tupla = pagina.tupla_no_slot(slot)
+        if tupla is None or tupla.chave != chave:
+            tupla = pagina.buscar_chave(chave)
+        return tupla, 1, (id_pag if tupla is not None else None)
+
+    def obter_estatisticas(self):
+        return {
+            "total_registros": self.nr,
+            "base": self.base,
+            "tamanho_vetor": len(self.paginas),
+            "ocupacao": round(self.nr / len(self.paginas) * 100, 2) if len(self.paginas) else 0,
+            "bytes": self.paginas.itemsize * len(self.paginas) + self.slots.itemsize * len(self.slots)
+        }
@@ -0,0 +1,150 @@
+"""Contadores e histogramas de baixo custo para os caminhos quentes.
+
+As métricas ficam em um registro global (METRICAS) e são exportadas no
+formato texto do Prometheus por /metrics. Cada atualização é um incremento
+em dicionário, sem locks: sob várias threads um incremento raro pode se
+perder, o que é aceitável para observabilidade.
+
+`METRICAS.gancho`, se definido, recebe (evento, dados) a cada busca e a
+cada fase de construção, para perfilamento detalhado sem mudar o código.
+"""
+import math
+
+LIMITES_LATENCIA = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.1, 1)
+LIMITES_CADEIA = (0, 1, 2, 4, 8, 16, 32, 64, 128, 256)
+LIMITES_FASE = (0.001, 0.01, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+
+
+def _chave(rotulos: dict):
+    return tuple(sorted(rotulos.items())) if rotulos else ()
+
+
+def _formatar_rotulos(chave, extra=()):
+    pares = list(chave) + list(extra)
+    if not pares:
+        return ""
+    return "{" + ",".join(f'{nome}="{valor}"' for nome, valor in pares) + "}"
+
+
+def _formatar_valor(valor) -> str:
+    if valor == math.inf:
+        return "+Inf"
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+class Contador:
+    tipo = "counter"
+
+    def __init__(self, nome: str, ajuda: str):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.valores = {}
+
+    def inc(self, valor=1, **rotulos):
+        chave = _chave(rotulos)
+        self.valores[chave] = self.valores.get(chave, 0) + valor
+
+    def amostras(self):
+        for chave, valor in list(self.valores.items()):
+            yield self.nome, chave, valor
+
+
+class Medidor(Contador):
+    """Valor instantâneo (gauge), atualizado por quem exporta"""
+    tipo = "gauge"
+
+    def definir(self, valor, **rotulos):
+        self.valores[_chave(rotulos)] = valor
+
+
+class Histograma:
+    tipo = "histogram"
+
+    def __init__(self, nome: str, ajuda: str, limites):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.limites = tuple(limites)
+        self.contagens = {}
+        self.somas = {}
+
+    def observar(self, valor, **rotulos):
+        chave = _chave(rotulos)
+        contagens = self.contagens.get(chave)
+        if contagens is None:
+            contagens = self.contagens[chave] = [0] * (len(self.limites) + 1)
+            self.somas[chave] = 0
+        # Poucos limites: a busca linear é mais barata que bisect para valores pequenos
+        posicao = 0
+        for limite in self.limites:
+            if valor <= limite:
+                break
+            posicao += 1
+        contagens[posicao] += 1
+        self.somas[chave] += valor
+
+    def amostras(self):
+        for chave, contagens in list(self.contagens.items()):
+            acumulado = 0
+            for limite, quantidade in zip(self.limites + (math.inf,), contagens):
+                acumulado += quantidade
+                yield f"{self.nome}_bucket", chave + (("le", _formatar_valor(limite)),), acumulado
+            yield f"{self.nome}_sum", chave, self.somas[chave]
+            yield f"{self.nome}_count", chave, acumulado
+
+
+class RegistroMetricas:
+    def __init__(self):
+        self.metricas = {}
+        self.gancho = None
+
+    def _registrar(self, metrica):
+        return self.metricas.setdefault(metrica.nome, metrica)
+
+    def contador(self, nome: str, ajuda: str) -> Contador:
+        return self._registrar(Contador(nome, ajuda))
+
+    def medidor(self, nome: str, ajuda: str) -> Medidor:
+        return self._registrar(Medidor(nome, ajuda))
+
+    def histograma(self, nome: str, ajuda: str, limites) -> Histograma:
+        return self._registrar(Histograma(nome, ajuda, limites))
+
+    def perfilar(self, evento: str, **dados):
+        if self.gancho is not None:
+            self.gancho(evento, dados)
+
+    def exportar(self) -> str:
+        """Texto no formato de exposição do Prometheus"""
+        linhas = []
+        for metrica in self.metricas.values():
+            linhas.append(f"# HELP {metrica.nome} {metrica.ajuda}")
+            linhas.append(f"# TYPE {metrica.nome} {metrica.tipo}")
+            for nome, chave, valor in metrica.amostras():
+                linhas.append(f"{nome}{_formatar_rotulos(chave)} {_formatar_valor(valor)}")
+        return "\n".join(linhas) + "\n"
+
+
+METRICAS = RegistroMetricas()
+
+PAGINAS_LIDAS = METRICAS.contador(
+    "indice_paginas_lidas_total", "Páginas pedidas a Table.get_pagina")
+BUSCAS = METRICAS.contador(
+    "indice_buscas_total", "Buscas por valor no índice, por tipo de índice e resultado")
+LATENCIA_BUSCA = METRICAS.histograma(
+    "indice_busca_latencia_segundos", "Latência de Hash.buscar", LIMITES_LATENCIA)
+ENTRADAS_PERCORRIDAS = METRICAS.histograma(
+    "indice_busca_entradas_percorridas", "Entradas (ou slots sondados) examinadas por busca", LIMITES_CADEIA)
+SALTOS_OVERFLOW = METRICAS.contador(
+    "indice_busca_saltos_overflow_total", "Buckets de overflow visitados durante buscas")
+BUCKETS_OVERFLOW_CRIADOS = METRICAS.contador(
+    "indice_buckets_overflow_criados_total", "Buckets de overflow criados (Bucket.adicionar e Bucket.preencher)")
+OVERFLOWS_INDICE = METRICAS.medidor(
+    "indice_overflows", "total_overflows do índice atual: buckets de overflow no estático, "
+                        "entradas fora do bucket primário nos dinâmicos, entradas fora do slot de origem "
+                        "no endereçamento aberto (da última contagem)")
+DURACAO_FASE = METRICAS.histograma(
+    "indice_construcao_fase_segundos", "Duração de cada fase de construir", LIMITES_FASE)
+BUFFER_POOL = METRICAS.medidor(
+    "buffer_pool_acessos", "Contadores do buffer pool da tabela atual, por evento (acertos, faltas, descartes)")
+CACHE_CONSULTAS = METRICAS.medidor(
+    "cache_consultas_acessos", "Contadores do cache de consultas, por evento (acertos, faltas, descartes, expirados)")
@@ -1,23 +1,135 @@
+from array import array
+
 from obj.tupla import Tupla
 
 
 class Page:
+    """Página em formato colunar: as chaves ficam em um array('q') e os valores
+    em um único buffer UTF-8 com os offsets de fim de cada valor. As Tuplas são
+    montadas apenas quando a página é lida.
+    """
+    __slots__ = ('id', 'capacidade', 'chaves', 'dados', 'fins')
+
     def __init__(self, id: int, capacidade: int):
         self.id = id
         self.capacidade = capacidade
-        self.tuplas = []
+        self.chaves = array('q')
+        self.dados = bytearray()
+        self.fins = array('I')
+
+    def __len__(self):
+        return len(self.chaves)
 
     def adicionar_tupla(self, tupla: Tupla):
-        if len(self.tuplas) < self.capacidade:
-            self.tuplas.append(tupla)
+        if len(self.chaves) < self.capacidade:
+            self.chaves.append(tupla.chave)
+            self.dados += tupla.valor.encode('utf-8')
+            self.fins.append(len(self.dados))
         else:
             raise Exception("Capacidade da página excedida")
 
+    def _slot(self, chave: int) -> int:
+        for slot, chave_slot in enumerate(self.chaves):
+            if chave_slot == chave:
+                return slot
+        return -1
+
+    def _limites(self, slot: int):
+        return (self.fins[slot - 1] if slot > 0 else 0), self.fins[slot]
+
+    def remover_tupla(self, chave: int) -> Tupla | None:
+        """Remove a tupla e compacta a página; o espaço volta a ficar livre"""
+        slot = self._slot(chave)
+        if slot < 0:
+            return None
+        inicio, fim = self._limites(slot)
+        tupla = Tupla(chave, self.dados[inicio:fim].decode('utf-8'))
+
+        del self.dados[inicio:fim]
+        del self.chaves[slot]
+        del self.fins[slot]
+        for i in range(slot, len(self.fins)):
+            self.fins[i] -= fim - inicio
+        return tupla
+
+    def atualizar_tupla(self, chave: int, valor: str) -> Tupla | None:
+        """Troca o valor da tupla no mesmo slot; retorna a tupla antiga"""
+        slot = self._slot(chave)
+        if slot < 0:
+            return None
+        inicio, fim = self._limites(slot)
+        antiga = Tupla(chave, self.dados[inicio:fim].decode('utf-8'))
+
+        novo = valor.encode('utf-8')
+        self.dados[inicio:fim] = novo
+        for i in range(slot, len(self.fins)):
+            self.fins[i] += len(novo) - (fim - inicio)
+        return antiga
+
+    def copiar(self) -> 'Page':
+        copia = Page(id=self.id, capacidade=self.capacidade)
+        copia.chaves = array('q', self.chaves)
+        copia.dados = bytearray(self.dados)
+        copia.fins = array('I', self.fins)
+        return copia
+
     def esta_cheia(self):
-        return len(self.tuplas) >= self.capacidade
+        return len(self.chaves) >= self.capacidade
+
+    def get_valores(self):
+        """Decodifica os valores da página, na ordem dos slots"""
+        dados = self.dados
+        inicio = 0
+        for fim in self.fins:
+            yield dados[inicio:fim].decode('utf-8')
+            inicio = fim
+
+    def get_visoes(self):
+        """Gera um memoryview de cada valor sobre o buffer da página, sem copiar
+        nem decodificar. As visões travam o tamanho do buffer enquanto existirem:
+        use e descarte antes de alterar a página"""
+        visao = memoryview(self.dados)
+        inicio = 0
+        for fim in self.fins:
+            yield visao[inicio:fim]
+            inicio = fim
 
     def get_tuplas(self):
-        return self.tuplas
+        return [Tupla(chave, valor) for chave, valor in zip(self.chaves, self.get_valores())]
+
+    @property
+    def tuplas(self):
+        return self.get_tuplas()
+
+    def tupla_no_slot(self, slot: int) -> Tupla | None:
+        if not 0 <= slot < len(self.chaves):
+            return None
+        inicio, fim = self._limites(slot)
+        return Tupla(self.chaves[slot], self.dados[inicio:fim].decode('utf-8'))
+
+    def buscar_chave(self, chave: int) -> Tupla | None:
+        return self.tupla_no_slot(self._slot(chave))
+
+    def buscar_valor(self, valor: str) -> Tupla | None:
+        """Procura o valor comparando bytes, sem montar as demais Tuplas"""
+        alvo = valor.encode('utf-8')
+        dados = self.dados
+        inicio = 0
+        for slot, fim in enumerate(self.fins):
+            if fim - inicio == len(alvo) and dados[inicio:fim] == alvo:
+                return Tupla(self.chaves[slot], valor)
+            inicio = fim
+        return None
+
+    def buscar_todos(self, valor: str):
+        """Gera todas as tuplas da página com o valor (valores duplicados)"""
+        alvo = valor.encode('utf-8')
+        dados = self.dados
+        inicio = 0
+        for slot, fim in enumerate(self.fins):
+            if fim - inicio == len(alvo) and dados[inicio:fim] == alvo:
+                yield Tupla(self.chaves[slot], valor)
+            inicio = fim
 
     def __repr__(self):
-        return f"Pagina(id={self.id}, capacidade={self.capacidade}, tuplas={len(self.tuplas)})"
+        return f"Pagina(id={self.id}, capacidade={self.capacidade}, tuplas={len(self.chaves)})"
@@ -0,0 +1,76 @@
+from obj.table import Table
+
+
+class Planejador:
+    """Planejador por custo para buscas por valor: table scan ou índice hash.
+
+    O custo é estimado em leituras de bloco, sem executar a busca:
+
+    - table scan: para na primeira ocorrência, então lê em média (P + 1) / 2
+      das P páginas da tabela (todas, se o valor não existir);
+    - índice hash: cada bucket da cadeia percorrida conta como um bloco, como
+      no índice gravado em disco, mais a página de dados da tupla. A cadeia
+      vem de obter_estatisticas (buckets_por_busca, ponderado pelas entradas,
+      que cresce com carga alta e com chaves concentradas em poucos buckets).
+
+    As estatísticas do índice custam O(NB), então a estimativa fica guardada
+    para o par (índice, geração) e só é refeita depois de uma alteração.
+    """
+
+    PLANOS = ("table_scan", "indice_hash")
+
+    def __init__(self):
+        self._estimativa = None  # (índice, geração, custo, estatísticas resumidas)
+
+    def custo_scan(self, tabela: Table) -> float:
+        return (tabela.get_total_pag() + 1) / 2
+
+    def custo_indice(self, indice_hash, geracao: int):
+        """Retorna (custo estimado, estatísticas usadas) do índice"""
+        estimativa = self._estimativa
+        if estimativa is not None and estimativa[0] is indice_hash and estimativa[1] == geracao:
+            return estimativa[2], estimativa[3]
+
+        estatisticas = indice_hash.obter_estatisticas()
+        distribuicao = estatisticas.get("distribuicao") or {}
+        buckets_por_busca = distribuicao.get("buckets_por_busca") or 1
+        usadas = {
+            "buckets_por_busca": buckets_por_busca,
+            "max_buckets_cadeia": distribuicao.get("max_buckets_cadeia", 0),
+            "fator_carga": estatisticas.get("fator_carga", 0),
+            "tipo_indice": estatisticas.get("tipo_indice")
+        }
+        custo = buckets_por_busca + 1  # Cadeia + a página de dados
+        self._estimativa = (indice_hash, geracao, custo, usadas)
+        return custo, usadas
+
+    def planejar(self, tabela: Table, indice_hash=None, geracao: int = 0, forcar: str | None = None):
+        """Escolhe o plano mais barato (ou o forçado) e descreve as alternativas"""
+        if forcar is not None and forcar not in self.PLANOS:
+            raise ValueError(f"Plano desconhecido: '{forcar}'. Opções: {', '.join(self.PLANOS)}")
+        if forcar == "indice_hash" and indice_hash is None:
+            raise ValueError("Plano indice_hash indisponível: índice não construído")
+
+        custos = {"table_scan": round(self.custo_scan(tabela), 3)}
+        estatisticas = None
+        if indice_hash is not None:
+            custo, estatisticas = self.custo_indice(indice_hash, geracao)
+            custos["indice_hash"] = round(custo, 3)
+
+        if forcar is not None:
+            escolhido, motivo = forcar, "plano forçado pelo cliente"
+        elif indice_hash is None:
+            escolhido, motivo = "table_scan", "índice não construído"
+        elif custos["indice_hash"] < custos["table_scan"]:
+            escolhido, motivo = "indice_hash", "menor custo estimado"
+        else:
+            escolhido, motivo = "table_scan", "a cadeia média do índice custa tanto quanto o scan ou mais"
+
+        return {
+            "plano": escolhido,
+            "motivo": motivo,
+            "custo_estimado": custos[escolhido],
+            "custos_estimados": custos,
+            "total_paginas": tabela.get_total_pag(),
+            "estatisticas_indice": estatisticas
+        }
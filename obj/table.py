@@ -1,3 +1,8 @@
+from array import array
+
+from obj.armazenamento import PaginasEmDisco, salvar_paginas
+from obj.buffer_pool import BufferPool
+from obj.metricas import PAGINAS_LIDAS
 from obj.page import Page
 from obj.tupla import Tupla
 
@@ -6,61 +11,215 @@ class Table:
     def __init__(self, arquivo: str):
         self.arquivo = arquivo
         self.paginas = []
+        self.buffer_pool = None
+        self.paginas_com_espaco = None  # Mapa de espaço livre, montado na primeira alteração
+        self.proxima_chave = None
+
+    def configurar_buffer_pool(self, num_frames: int | None, politica: str = 'lru'):
+        """Coloca (ou remove, com num_frames=None) um buffer pool na frente de get_pagina"""
+        self.buffer_pool = BufferPool(num_frames, politica) if num_frames else None
+
+    def salvar(self, caminho: str):
+        """Grava as páginas carregadas em um heap file binário; retorna o CRC32 gravado"""
+        capacidade = self.paginas[0].capacidade if len(self.paginas) else 0
+        return salvar_paginas(self.paginas, capacidade, caminho)
+
+    @classmethod
+    def abrir(cls, caminho: str):
+        """Abre um heap file salvo com mmap; as páginas são lidas sob demanda"""
+        tabela = cls(caminho)
+        tabela.paginas = PaginasEmDisco(caminho)
+        return tabela
+
+    def fechar(self):
+        if isinstance(self.paginas, PaginasEmDisco):
+            self.paginas.fechar()
 
-    def carregar(self, tam_pagina: int):
+    def copiar(self):
+        """Cópia privada das páginas em memória, sem buffer pool. Serve para
+        trabalhos longos que não devem segurar a trava da tabela original"""
+        copia = Table(self.arquivo)
+        copia.paginas = [pagina.copiar() for pagina in self.paginas]
+        return copia
+
+    def carregar(self, tam_pagina: int, limite_linhas: int | None = None, progresso=None,
+                 intervalo_progresso: int = 100000):
+        """Carrega o arquivo em streaming, página a página.
+
+        O arquivo é lido por linhas (em blocos, pelo buffer do próprio arquivo),
+        então o pico de memória da leitura não depende do tamanho do arquivo.
+        `limite_linhas` interrompe a carga após esse número de tuplas e
+        `progresso(tuplas, bytes_lidos)` é chamado a cada `intervalo_progresso` tuplas.
+        """
         try:
-            with open(self.arquivo, 'r', encoding='utf-8') as file:
-                id_pag = 0
-                linhas = file.readlines()
-
-                if not linhas:
-                    return
-
-                pagina_atual = Page(id=id_pag, capacidade=tam_pagina)
-                self.paginas.append(pagina_atual)
-                chave_id = 1
-                for linha in linhas:
-                    valor = linha.strip()
-                    if not valor:
-                        continue
-
-                    tupla = Tupla(chave=chave_id, valor=valor)
-                    chave_id += 1
-
-                    if pagina_atual.esta_cheia():
-                        id_pag += 1
-                        pagina_atual = Page(id=id_pag, capacidade=tam_pagina)
-                        self.paginas.append(pagina_atual)
-
-                    pagina_atual.adicionar_tupla(tupla)
+            for pagina in self.ler_paginas(tam_pagina, limite_linhas, progresso, intervalo_progresso):
+                self.paginas.append(pagina)
         except FileNotFoundError:
             print(f"ERRO: O arquivo '{self.arquivo}' não foi encontrado.")
             exit()
 
+    def ler_paginas(self, tam_pagina: int, limite_linhas: int | None = None, progresso=None,
+                    intervalo_progresso: int = 100000):
+        """Gera as páginas do arquivo uma a uma, sem manter o arquivo em memória"""
+        id_pag = len(self.paginas)
+        chave_id = self.get_total_tuplas() + 1
+        total_tuplas = 0
+        bytes_lidos = 0
+
+        with open(self.arquivo, 'rb') as file:
+            pagina_atual = Page(id=id_pag, capacidade=tam_pagina)
+            for linha in file:
+                bytes_lidos += len(linha)
+                valor = linha.decode('utf-8').strip()
+                if not valor:
+                    continue
+
+                if limite_linhas is not None and total_tuplas >= limite_linhas:
+                    break
+
+                if pagina_atual.esta_cheia():
+                    yield pagina_atual
+                    id_pag += 1
+                    pagina_atual = Page(id=id_pag, capacidade=tam_pagina)
+
+                pagina_atual.adicionar_tupla(Tupla(chave=chave_id, valor=valor))
+                chave_id += 1
+                total_tuplas += 1
+
+                if progresso is not None and total_tuplas % intervalo_progresso == 0:
+                    progresso(total_tuplas, bytes_lidos)
+
+            if len(pagina_atual):
+                yield pagina_atual
+
+        if progresso is not None:
+            progresso(total_tuplas, bytes_lidos)
+
+    def _preparar_alteracao(self):
+        if isinstance(self.paginas, PaginasEmDisco):
+            raise Exception("Tabela aberta do disco é somente leitura")
+        if self.paginas_com_espaco is None:
+            self.paginas_com_espaco = {p.id for p in self.paginas if not p.esta_cheia()}
+            self.proxima_chave = max((max(p.chaves) for p in self.paginas if len(p)), default=0) + 1
+
+    def inserir(self, valor: str, tam_pagina: int | None = None):
+        """Insere uma tupla na primeira página com espaço livre (ou numa página nova).
+
+        Retorna (tupla, id_pag); escreve uma única página.
+        """
+        self._preparar_alteracao()
+
+        if self.paginas_com_espaco:
+            id_pag = min(self.paginas_com_espaco)
+            pagina = self.paginas[id_pag]
+        else:
+            capacidade = tam_pagina or (self.paginas[0].capacidade if self.paginas else 100)
+            pagina = Page(id=len(self.paginas), capacidade=capacidade)
+            self.paginas.append(pagina)
+            self.paginas_com_espaco.add(pagina.id)
+
+        tupla = Tupla(chave=self.proxima_chave, valor=valor)
+        self.proxima_chave += 1
+        pagina.adicionar_tupla(tupla)
+        if pagina.esta_cheia():
+            self.paginas_com_espaco.discard(pagina.id)
+        return tupla, pagina.id
+
+    def remover(self, id_pagina: int, chave: int) -> Tupla | None:
+        """Remove a tupla da página; o slot liberado entra no mapa de espaço livre"""
+        self._preparar_alteracao()
+        pagina = self._ler_pagina(id_pagina)
+        if pagina is None:
+            return None
+
+        tupla = pagina.remover_tupla(chave)
+        if tupla is not None:
+            self.paginas_com_espaco.add(id_pagina)
+        return tupla
+
+    def atualizar(self, id_pagina: int, chave: int, valor: str) -> Tupla | None:
+        """Troca o valor da tupla no mesmo slot; retorna a tupla antiga"""
+        self._preparar_alteracao()
+        pagina = self._ler_pagina(id_pagina)
+        if pagina is None:
+            return None
+        return pagina.atualizar_tupla(chave, valor)
+
     def get_info_indice(self):
-        info = []
+        """Gera (chave, valor, id_pag) página a página, sem montar a lista da
+        tabela inteira"""
+        for pagina in self.paginas:
+            id_pag = pagina.id
+            for chave, valor in zip(pagina.chaves, pagina.get_valores()):
+                yield chave, valor, id_pag
+
+    def get_info_binaria(self):
+        """Como get_info_indice, mas com o valor como memoryview dos bytes UTF-8
+        da página: sem decodificar nem copiar, para quem só precisa do hash"""
         for pagina in self.paginas:
-            for tupla in pagina.tuplas:
-                info.append((tupla.chave, tupla.valor, pagina.id))
-        return info
+            id_pag = pagina.id
+            for chave, visao in zip(pagina.chaves, pagina.get_visoes()):
+                yield chave, visao, id_pag
+
+    def get_colunas_binarias(self, tuplas_por_bloco: int | None = None):
+        """Valores já codificados, sem decodificar as páginas, em blocos de páginas.
+
+        Gera (chaves, dados, fins, contagens) para cada bloco de páginas com até
+        `tuplas_por_bloco` tuplas (None: a tabela inteira em um bloco): as chaves
+        em um array('q'), os buffers UTF-8 concatenados, os offsets de fim de
+        cada valor (relativos ao início do buffer da sua página) e o número de
+        tuplas de cada página. Só o bloco atual é copiado.
+        """
+        chaves = array('q')
+        fins = array('I')
+        partes = []
+        contagens = []
+        for pagina in self.paginas:
+            chaves.extend(pagina.chaves)
+            fins.extend(pagina.fins)
+            partes.append(pagina.dados)
+            contagens.append(len(pagina))
+            if tuplas_por_bloco is not None and len(chaves) >= tuplas_por_bloco:
+                yield chaves, b''.join(partes), fins, contagens
+                chaves = array('q')
+                fins = array('I')
+                partes = []
+                contagens = []
+        if contagens or tuplas_por_bloco is None:
+            yield chaves, b''.join(partes), fins, contagens
 
     def table_scan(self, valor_busca: str):
         custo = 0
-        for pagina in self.paginas:
+        for id_pagina in range(len(self.paginas)):
+            pagina = self.get_pagina(id_pagina)
             custo += 1
-            for tupla in pagina.get_tuplas():
-                if tupla.valor == valor_busca:
-                    return tupla, custo
+            tupla = pagina.buscar_valor(valor_busca)
+            if tupla is not None:
+                return tupla, custo
 
         return None, custo
 
+    def table_scan_todos(self, valor_busca: str):
+        """Gera (tupla, id_pag, custo) para cada ocorrência do valor, lendo a tabela inteira"""
+        custo = 0
+        for id_pagina in range(len(self.paginas)):
+            # A página fica fixada enquanto o gerador está parado no meio dela
+            pagina = self.fixar_pagina(id_pagina)
+            custo += 1
+            try:
+                for tupla in pagina.buscar_todos(valor_busca):
+                    yield tupla, id_pagina, custo
+            finally:
+                self.liberar_pagina(id_pagina)
+
     def table_scan_detailed(self, valor_busca: str, max_records_to_show=100):
         custo = 0
         scanned_records = []
         total_records_scanned = 0
         found = False
 
-        for pagina in self.paginas:
+        for id_pagina in range(len(self.paginas)):
+            pagina = self.get_pagina(id_pagina)
             custo += 1
             for tupla in pagina.get_tuplas():
                 total_records_scanned += 1
@@ -101,9 +260,29 @@ class Table:
         return len(self.paginas)
 
     def get_total_tuplas(self) -> int:
-        return sum(len(p.tuplas) for p in self.paginas)
+        if isinstance(self.paginas, PaginasEmDisco):
+            return self.paginas.total_tuplas
+        return sum(len(p) for p in self.paginas)
 
-    def get_pagina(self, id_pagina: int) -> Page | None:
+    def _ler_pagina(self, id_pagina: int) -> Page | None:
         if 0 <= id_pagina < len(self.paginas):
             return self.paginas[id_pagina]
         return None
+
+    def get_pagina(self, id_pagina: int) -> Page | None:
+        PAGINAS_LIDAS.inc()
+        if self.buffer_pool is not None:
+            return self.buffer_pool.obter(id_pagina, self._ler_pagina)
+        return self._ler_pagina(id_pagina)
+
+    def fixar_pagina(self, id_pagina: int) -> Page | None:
+        """Lê a página e a mantém no buffer pool até liberar_pagina. Usada pelos
+        geradores (table_scan_todos, buscar_todos) que seguram a página entre yields"""
+        PAGINAS_LIDAS.inc()
+        if self.buffer_pool is not None:
+            return self.buffer_pool.obter(id_pagina, self._ler_pagina, fixar=True)
+        return self._ler_pagina(id_pagina)
+
+    def liberar_pagina(self, id_pagina: int):
+        if self.buffer_pool is not None:
+            self.buffer_pool.liberar(id_pagina)
@@ -0,0 +1,111 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Tarefa:
+    """Uma execução em segundo plano (construção de índice, análise) e seu andamento.
+
+    `atualizar` é passado como callback de progresso para Hash.construir; cada
+    mudança incrementa `versao` e acorda quem está em `aguardar_mudanca`.
+    """
+
+    PENDENTE = 'pendente'
+    EXECUTANDO = 'executando'
+    CONCLUIDA = 'concluida'
+    ERRO = 'erro'
+
+    def __init__(self, tipo: str, parametros: dict | None = None):
+        self.id = uuid.uuid4().hex
+        self.tipo = tipo
+        self.parametros = parametros or {}
+        self.estado = self.PENDENTE
+        self.fase = None
+        self.feitos = 0
+        self.total = 0
+        self.resultado = None
+        self.erro = None
+        self.criada_em = time.time()
+        self.iniciada_em = None
+        self.concluida_em = None
+        self.versao = 0
+        self._condicao = threading.Condition()
+
+    def _mudar(self, **campos):
+        with self._condicao:
+            for nome, valor in campos.items():
+                setattr(self, nome, valor)
+            self.versao += 1
+            self._condicao.notify_all()
+
+    def atualizar(self, fase: str, feitos: int = 0, total: int = 0):
+        self._mudar(fase=fase, feitos=feitos, total=total)
+
+    def terminou(self) -> bool:
+        return self.estado in (self.CONCLUIDA, self.ERRO)
+
+    def aguardar_mudanca(self, versao: int, timeout: float = 15) -> int:
+        """Bloqueia até a versão passar de `versao` (ou o timeout); retorna a versão atual"""
+        with self._condicao:
+            self._condicao.wait_for(lambda: self.versao != versao or self.terminou(), timeout)
+            return self.versao
+
+    def para_dict(self):
+        fim = self.concluida_em or time.time()
+        return {
+            "id": self.id,
+            "tipo": self.tipo,
+            "parametros": self.parametros,
+            "estado": self.estado,
+            "fase": self.fase,
+            "feitos": self.feitos,
+            "total": self.total,
+            "percentual": round(self.feitos / self.total * 100, 2) if self.total else None,
+            "tempo_decorrido": round(fim - self.iniciada_em, 3) if self.iniciada_em else 0,
+            "resultado": self.resultado,
+            "erro": self.erro
+        }
+
+
+class GerenciadorTarefas:
+    """Executa tarefas em threads de fundo e guarda as últimas `max_historico`"""
+
+    def __init__(self, max_trabalhadores: int = 1, max_historico: int = 100):
+        self.executor = ThreadPoolExecutor(max_workers=max_trabalhadores, thread_name_prefix="tarefa")
+        self.max_historico = max_historico
+        self.tarefas = OrderedDict()
+        self._trava = threading.Lock()
+
+    def submeter(self, tipo: str, funcao, parametros: dict | None = None) -> Tarefa:
+        """Agenda `funcao(tarefa)`; o valor retornado vira tarefa.resultado"""
+        tarefa = Tarefa(tipo, parametros)
+        with self._trava:
+            self.tarefas[tarefa.id] = tarefa
+            while len(self.tarefas) > self.max_historico:
+                antiga = next(iter(self.tarefas.values()))
+                if not antiga.terminou():
+                    break
+                self.tarefas.popitem(last=False)
+
+        self.executor.submit(self._executar, tarefa, funcao)
+        return tarefa
+
+    @staticmethod
+    def _executar(tarefa: Tarefa, funcao):
+        tarefa._mudar(estado=Tarefa.EXECUTANDO, iniciada_em=time.time())
+        try:
+            resultado = funcao(tarefa)
+        except Exception as e:
+            tarefa._mudar(estado=Tarefa.ERRO, erro=str(e), concluida_em=time.time())
+        else:
+            tarefa._mudar(estado=Tarefa.CONCLUIDA, resultado=resultado, concluida_em=time.time())
+
+    def obter(self, id_tarefa: str) -> Tarefa | None:
+        with self._trava:
+            return self.tarefas.get(id_tarefa)
+
+    def listar(self):
+        with self._trava:
+            return list(self.tarefas.values())
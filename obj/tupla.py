@@ -1,4 +1,7 @@
 class Tupla:
+    # Sem __dict__ por instância: cada linha da tabela vira uma Tupla
+    __slots__ = ('chave', 'valor')
+
     def __init__(self, chave, valor):
         self.chave = chave
         self.valor = valor
@@ -0,0 +1,103 @@
+"""Inserções e remoções em todos os índices, conferidas contra o table scan.
+
+Cada índice passa por um churn aleatório (remoções, reinserções, valores
+repetidos e compactações) e, no fim, precisa encontrar exatamente as mesmas
+tuplas que table_scan_todos encontra na tabela.
+"""
+import random
+
+import pytest
+
+from obj.hash import Hash
+from obj.hash_aberto import HashAberto
+from obj.hash_extensivel import HashExtensivel
+from obj.hash_linear import HashLinear
+from obj.table import Table
+
+INDICES = {
+    "estatico": lambda fr: Hash(fr),
+    "extensivel": lambda fr: HashExtensivel(fr),
+    "linear": lambda fr: HashLinear(fr),
+    "linear_probing": lambda fr: Hash.criar(fr, "linear_probing"),
+    "quadratic_probing": lambda fr: Hash.criar(fr, "quadratic_probing"),
+    "robin_hood": lambda fr: Hash.criar(fr, "robin_hood"),
+}
+
+REPETIDOS = ("casa", "bola", "dado")
+
+
+@pytest.fixture
+def tabela(tmp_path):
+    gerador = random.Random(7)
+    palavras = [gerador.choice(REPETIDOS) if gerador.random() < 0.4 else f"palavra{i}" for i in range(1500)]
+    arquivo = tmp_path / "palavras.txt"
+    arquivo.write_text("\n".join(palavras), encoding="utf-8")
+    tabela = Table(str(arquivo))
+    tabela.carregar(tam_pagina=16)
+    return tabela
+
+
+def _conferir_com_scan(indice, tabela: Table, valores):
+    for valor in valores:
+        esperadas = sorted(tupla.chave for tupla, _, _ in tabela.table_scan_todos(valor))
+        encontradas = sorted(tupla.chave for tupla, _, _ in indice.buscar_todos(valor, tabela))
+        assert encontradas == esperadas, valor
+        assert (indice.buscar(valor, tabela)[0] is None) == (not esperadas), valor
+
+
+@pytest.mark.parametrize("fr", [2, 8])
+@pytest.mark.parametrize("nome_indice", INDICES)
+def test_churn_igual_ao_scan(tabela, nome_indice, fr):
+    indice = INDICES[nome_indice](fr)
+    indice.construir(tabela)
+
+    gerador = random.Random(fr)
+    vivas = [(tupla.chave, tupla.valor, pagina.id) for pagina in tabela.paginas for tupla in pagina.get_tuplas()]
+    valores = {valor for _, valor, _ in vivas}
+    removidas = []
+    for operacao in range(1, 2001):
+        if removidas and gerador.random() < 0.45:
+            valor = removidas.pop(gerador.randrange(len(removidas)))
+            if gerador.random() < 0.3:
+                valor = gerador.choice(REPETIDOS + (f"novo{operacao % 40}",))
+            tupla, id_pag = tabela.inserir(valor)
+            indice.inserir(tupla.chave, valor, id_pag)
+            vivas.append((tupla.chave, valor, id_pag))
+            valores.add(valor)
+        else:
+            posicao = gerador.randrange(len(vivas))
+            vivas[posicao], vivas[-1] = vivas[-1], vivas[posicao]
+            chave, valor, id_pag = vivas.pop()
+            tabela.remover(id_pag, chave)
+            assert indice.remover(chave, valor)
+            removidas.append(valor)
+
+        if operacao % 500 == 0:
+            indice.compactar(apenas_esparsas=operacao % 1000 != 0)
+
+    assert indice.nr == len(vivas)
+    _conferir_com_scan(indice, tabela, sorted(valores) + ["ausente"])
+
+
+def test_robin_hood_remocao_desloca_sem_lapides(tabela):
+    indice = HashAberto(4, metodo_colisao="robin_hood")
+    indice.construir(tabela)
+
+    gerador = random.Random(3)
+    tuplas = [(tupla.chave, tupla.valor, pagina.id) for pagina in tabela.paginas for tupla in pagina.get_tuplas()]
+    gerador.shuffle(tuplas)
+    for chave, valor, id_pag in tuplas[:len(tuplas) // 2]:
+        tabela.remover(id_pag, chave)
+        assert indice.remover(chave, valor)
+        assert not indice.remover(chave, valor)
+
+    assert indice.total_lapides == 0
+    assert HashAberto.LAPIDE not in indice.paginas
+    # Sem lápides, cada entrada é alcançável da origem sem passar por slot vazio
+    for slot in range(indice.capacidade):
+        if indice.paginas[slot] >= 0:
+            origem = indice.impressoes[slot] & indice.mascara
+            distancia = (slot - origem) & indice.mascara
+            assert all(indice.paginas[(origem + i) & indice.mascara] >= 0 for i in range(distancia))
+
+    _conferir_com_scan(indice, tabela, sorted({valor for _, valor, _ in tuplas}))